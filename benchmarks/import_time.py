@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Import time benchmark for Rack IAM.
+
+Measures the cold start cost of importing Rack IAM in a fresh interpreter,
+which is what short lived processes such as Lambda handlers and CLI hooks
+pay on every invocation. The cost of starting an interpreter which imports
+nothing is subtracted from each measurement.
+
+Run with:
+
+    python benchmarks/import_time.py [runs]
+"""
+import os
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+STATEMENTS = [
+    'import rack_iam',
+    'from rack_iam import Role',
+    'import rack_iam.transform.cfdict',
+    'from rack_iam.transform.cfdict import transform_role',
+    'from rack_iam.transform.cfdict import transform_template',
+]
+
+
+def cold_start(statement, runs):
+    """Get the best time of running a statement in a fresh interpreter.
+
+    Args:
+        statement (str): The python statement to run
+        runs (int): The number of interpreters to start
+
+    Returns:
+        float: The fastest run, in seconds
+
+    """
+    command = [sys.executable, '-c', statement]
+    return min(timeit.repeat(
+        lambda: subprocess.check_call(command, cwd=ROOT),
+        number=1, repeat=runs))
+
+
+def main():
+    """Print the cold start import cost of common Rack IAM imports."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    baseline = cold_start('pass', runs)
+    print('interpreter startup: {:.1f} ms'.format(baseline * 1000))
+    for statement in STATEMENTS:
+        print('{:<56}{:>8.1f} ms'.format(
+            statement, (cold_start(statement, runs) - baseline) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Memory benchmark for the core Rack IAM objects.
+
+Reports the bytes used by each core object, comparing the slotted classes
+against equivalent classes which keep a per-instance __dict__ (the layout used
+before __slots__ was introduced). The __dict__ layout only holds the public
+attributes listed in _fields, which are those the classes had then, while the
+slotted objects also carry the tracking state added since, such as versions
+and parent links. Attribute values are shared between both layouts.
+
+Run with:
+
+    python benchmarks/memory.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from rack_iam import (  # noqa: E402
+    Statement, PolicyDocument, InlinePolicy, Policy, ManagedPolicy, Role,
+    InstanceProfile, User, Group
+)
+
+FACTORIES = [
+    (Statement, lambda cls: cls('Allow', ['s3:GetObject'], '*')),
+    (PolicyDocument, lambda cls: cls()),
+    (InlinePolicy, lambda cls: cls('Policy')),
+    (Policy, lambda cls: cls('Policy')),
+    (ManagedPolicy, lambda cls: cls('Policy', 'Description')),
+    (Role, lambda cls: cls('Role')),
+    (InstanceProfile, lambda cls: cls('Profile', 'Role')),
+    (User, lambda cls: cls('User')),
+    (Group, lambda cls: cls('Group')),
+]
+
+
+def object_size(obj):
+    """Get the bytes used by an object and its attribute dictionary.
+
+    Args:
+        obj (object): The object to measure
+
+    Returns:
+        int: The size in bytes
+
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def dict_layout(obj):
+    """Create a non-slotted equivalent of a slotted object.
+
+    The equivalent is an instance of a plain class, of the same name but with
+    no slotted base, holding the public attributes of obj, those listed in
+    its _fields, in its __dict__.
+
+    Args:
+        obj (object): The slotted object
+
+    Returns:
+        object: The equivalent object
+
+    """
+    cls = type(obj)
+    plain = _PLAIN_CLASSES.get(cls)
+    if plain is None:
+        plain = _PLAIN_CLASSES[cls] = type(cls.__name__, (object,), {})
+    equivalent = plain()
+    for name in cls._fields:
+        setattr(equivalent, name, getattr(obj, name))
+    return equivalent
+
+
+_PLAIN_CLASSES = {}
+
+
+def main():
+    """Print a table of bytes per object before and after __slots__."""
+    print('{:<16}{:>10}{:>10}{:>10}'.format(
+        'class', '__dict__', 'slots', 'saved'))
+    for cls, factory in FACTORIES:
+        obj = factory(cls)
+        before = object_size(dict_layout(obj))
+        after = object_size(obj)
+        print('{:<16}{:>10}{:>10}{:>9.0f}%'.format(
+            cls.__name__, before, after, 100.0 * (before - after) / before))
+
+
+if __name__ == '__main__':
+    main()
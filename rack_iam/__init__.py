@@ -15,17 +15,47 @@
 """The core RackIAM module.
 
 This file acts as a pull in for the various core objects, making for shorter
-imports.
+imports. The objects are loaded lazily, the first time they are used, which
+keeps the import of the package itself cheap.
 """
-from core.policy import Policy, PolicyDocument, InlinePolicy, ManagedPolicy
-from core.group import Group
-from core.user import User
-from core.role import Role, InstanceProfile
-from core.statement import Statement
-from core.helpers import generate_aws_account_arn, generate_arn
+from .core.helpers import lazy_attributes
+
+_ATTRIBUTES = {
+    'Policy': 'rack_iam.core.policy',
+    'PolicyDocument': 'rack_iam.core.policy',
+    'InlinePolicy': 'rack_iam.core.policy',
+    'ManagedPolicy': 'rack_iam.core.policy',
+    'Group': 'rack_iam.core.group',
+    'User': 'rack_iam.core.user',
+    'Role': 'rack_iam.core.role',
+    'InstanceProfile': 'rack_iam.core.role',
+    'Statement': 'rack_iam.core.statement',
+    'generate_aws_account_arn': 'rack_iam.core.helpers',
+    'generate_arn': 'rack_iam.core.helpers',
+    'Arn': 'rack_iam.core.arn',
+    'MembershipIndex': 'rack_iam.core.membership',
+    'PathIndex': 'rack_iam.core.paths',
+    'IamModel': 'rack_iam.core.model',
+    'build_users': 'rack_iam.core.factory',
+    'build_roles': 'rack_iam.core.factory',
+    'build_groups': 'rack_iam.core.factory',
+    'generate_arns': 'rack_iam.core.arn',
+    'generate_account_arns': 'rack_iam.core.arn',
+    'StatementPool': 'rack_iam.core.pool',
+    'StatementTable': 'rack_iam.core.table',
+    'FrozenObjectError': 'rack_iam.core.base',
+    'Validator': 'rack_iam.validation',
+    'ValidationIssue': 'rack_iam.validation',
+    'validate_model': 'rack_iam.validation',
+}
 
 __all__ = [
     'Policy', 'PolicyDocument', 'InlinePolicy', 'generate_aws_account_arn',
     'generate_arn', 'Role', 'Statement', 'ManagedPolicy', 'User', 'Group',
-    'InstanceProfile'
+    'InstanceProfile', 'StatementPool', 'FrozenObjectError',
+    'StatementTable', 'Validator', 'ValidationIssue', 'validate_model',
+    'Arn', 'generate_arns', 'generate_account_arns', 'MembershipIndex',
+    'PathIndex', 'IamModel', 'build_users', 'build_roles', 'build_groups'
 ]
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM ARN module.
+
+Holds the Arn value type, along with cached ARN formatting and parsing. ARNs
+are formatted and parsed far more often than there are distinct ARNs, so the
+results are kept in bounded caches and repeated calls are dictionary lookups.
+"""
+
+# The most entries kept by each of the ARN caches
+ARN_CACHE_SIZE = 65536
+
+
+class ArnCache(object):
+    """A bounded cache for formatted and parsed ARNs.
+
+    Once full the cache is emptied and starts again, which keeps lookups
+    down to a single dictionary access.
+    """
+
+    def __init__(self, maxsize=ARN_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int): The most entries to keep
+        """
+        self.maxsize = maxsize
+        self._entries = {}
+
+    def __len__(self):
+        """Get the number of cached entries.
+
+        Returns:
+            int: The number of cached entries
+
+        """
+        return len(self._entries)
+
+    def get(self, key):
+        """Get a cached value.
+
+        Args:
+            key (object): The key of the value
+
+        Returns:
+            object: The cached value, or None if there isn't one
+
+        """
+        return self._entries.get(key)
+
+    def put(self, key, value):
+        """Cache a value.
+
+        Args:
+            key (object): The key of the value
+            value (object): The value to cache
+
+        Returns:
+            object: The value, for convenience
+
+        """
+        if len(self._entries) >= self.maxsize:
+            self._entries.clear()
+        self._entries[key] = value
+        return value
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+
+
+_format_cache = ArnCache()
+_parse_cache = ArnCache()
+
+
+def clear_arn_caches():
+    """Empty the ARN format and parse caches."""
+    _format_cache.clear()
+    _parse_cache.clear()
+
+
+def format_arn(partition, service, region, account_id, resource):
+    """Format an ARN string, reusing the string for repeated ARNs.
+
+    Args:
+        partition (str): The partition, such as aws
+        service (str): The service namespace, such as iam
+        region (str): The region, empty for global resources
+        account_id (str): The account ID, empty for AWS owned resources
+        resource (str): The resource, such as role/MyRole
+
+    Returns:
+        str: The ARN
+
+    """
+    key = (partition, service, region, account_id, resource)
+    try:
+        value = _format_cache.get(key)
+    except TypeError:
+        # Troposphere helpers in a part of the ARN can't be hashed
+        return "arn:{}:{}:{}:{}:{}".format(*key)
+    if value is None:
+        value = _format_cache.put(key, "arn:{}:{}:{}:{}:{}".format(*key))
+    return value
+
+
+def iam_arn(resource_type, name, region='', account_id=''):
+    """Get the ARN of an IAM resource, as used by the get_arn methods.
+
+    Args:
+        resource_type (str): The type of resource, such as role or group
+        name (str): The name of the resource
+        region (str): The region
+        account_id (str): The account ID
+
+    Returns:
+        str: The ARN
+
+    """
+    key = (resource_type, name, region, account_id)
+    try:
+        value = _format_cache.get(key)
+    except TypeError:
+        return "arn:aws:iam:{}:{}:{}/{}".format(
+            region, account_id, resource_type, name)
+    if value is None:
+        value = _format_cache.put(key, format_arn(
+            'aws', 'iam', region, account_id,
+            "{}/{}".format(resource_type, name)))
+    return value
+
+
+def generate_arns(service, resources, account_ids=('',), partition='aws',
+                  region=''):
+    """Generate the ARNs of many resources in many accounts.
+
+    Args:
+        service (str): The service namespace, such as iam
+        resources ([]str): The resources, such as role/MyRole
+        account_ids ([]str): The account IDs
+        partition (str): The partition
+        region (str): The region
+
+    Returns:
+        []str: The ARN of every resource in every account, grouped by account
+
+    """
+    resources = list(resources)
+    arns = []
+    for account_id in account_ids:
+        prefix = "arn:{}:{}:{}:{}:".format(
+            partition, service, region, account_id)
+        arns.extend([prefix + resource for resource in resources])
+    return arns
+
+
+def generate_account_arns(account_ids, resource='root'):
+    """Generate the IAM ARN of a resource in each of many accounts.
+
+    Args:
+        account_ids ([]str): The account IDs
+        resource (str): Defaults to root, the account principal
+
+    Returns:
+        []str: The ARNs, in the order of account_ids
+
+    """
+    return generate_arns('iam', (resource,), account_ids)
+
+
+class Arn(object):
+    """An immutable, parsed, Amazon Resource Name.
+
+    Arns hash and compare equal to their string form, so either can be used
+    to look the other up in a set or dictionary.
+    """
+
+    __slots__ = ('partition', 'service', 'region', 'account_id', 'resource',
+                 '_string')
+
+    def __init__(self, partition='aws', service='', region='', account_id='',
+                 resource=''):
+        """Create an ARN from its parts.
+
+        Args:
+            partition (str): The partition, such as aws
+            service (str): The service namespace, such as iam
+            region (str): The region, empty for global resources
+            account_id (str): The account ID, empty for AWS owned resources
+            resource (str): The resource, such as role/MyRole
+        """
+        set_slot = object.__setattr__
+        set_slot(self, 'partition', partition)
+        set_slot(self, 'service', service)
+        set_slot(self, 'region', region)
+        set_slot(self, 'account_id', account_id)
+        set_slot(self, 'resource', resource)
+        set_slot(self, '_string', None)
+
+    @classmethod
+    def parse(cls, value):
+        """Parse an ARN string.
+
+        Args:
+            value (str): The ARN, such as arn:aws:iam::123456789012:root
+
+        Returns:
+            Arn: The parsed ARN
+
+        Raises:
+            ValueError: If the value isn't an ARN
+
+        """
+        arn = _parse_cache.get(value)
+        if arn is not None:
+            return arn
+        parts = value.split(':', 5)
+        if len(parts) != 6 or parts[0] != 'arn':
+            raise ValueError("Not an ARN: {!r}".format(value))
+        arn = cls(parts[1], parts[2], parts[3], parts[4], parts[5])
+        object.__setattr__(arn, '_string', value)
+        return _parse_cache.put(value, arn)
+
+    @property
+    def resource_type(self):
+        """str: The resource type, such as role, or '' if there isn't one."""
+        resource = self.resource
+        for index, char in enumerate(resource):
+            if char in '/:':
+                return resource[:index]
+        return ''
+
+    @property
+    def resource_name(self):
+        """str: The resource without its type, such as the role name."""
+        resource = self.resource
+        for index, char in enumerate(resource):
+            if char in '/:':
+                return resource[index + 1:]
+        return resource
+
+    def __setattr__(self, name, value):
+        """Refuse to modify the ARN.
+
+        Raises:
+            AttributeError: Always
+
+        """
+        raise AttributeError("Arn objects are immutable")
+
+    def __str__(self):
+        """Get the ARN string.
+
+        Returns:
+            str: The ARN
+
+        """
+        if self._string is None:
+            object.__setattr__(self, '_string', format_arn(
+                self.partition, self.service, self.region, self.account_id,
+                self.resource))
+        return self._string
+
+    def __repr__(self):
+        """Get a representation of the ARN.
+
+        Returns:
+            str: The representation
+
+        """
+        return "Arn({!r})".format(str(self))
+
+    def __hash__(self):
+        """Get the hash of the ARN, which is that of its string.
+
+        Returns:
+            int: The hash
+
+        """
+        return hash(str(self))
+
+    def __eq__(self, other):
+        """Compare the ARN with another ARN, or an ARN string.
+
+        Args:
+            other (object): The object to compare against
+
+        Returns:
+            bool: Whether the ARNs are equal
+
+        """
+        if isinstance(other, Arn):
+            return str(self) == str(other)
+        return str(self) == other
+
+    def __ne__(self, other):
+        """Compare the ARN with another for inequality.
+
+        Args:
+            other (object): The object to compare against
+
+        Returns:
+            bool: Whether the ARNs differ
+
+        """
+        return not self == other
+
+    def __reduce__(self):
+        """Pickle the ARN by its parts.
+
+        Returns:
+            tuple: The pickle reduction
+
+        """
+        return (Arn, (self.partition, self.service, self.region,
+                      self.account_id, self.resource))
@@ -0,0 +1,564 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM base object module.
+
+Holds the base class shared by all core objects. It stamps a new version on
+every modification, which transforms use to tell when cached output is stale,
+and implements freezing. Objects remember the objects they were added to, and
+a modification stamps the new version on those parents as well. The version
+of an object therefore changes whenever anything in its subtree changes.
+
+A frozen object and all of its children are immutable, which makes them safe
+to share between threads, and gives them a cached structural hash and
+equality so they can be deduplicated in sets or used as dictionary keys.
+
+Frozen objects also act as blueprints. `derive` creates a new object sharing
+all of the blueprint's frozen children, and a child is only copied once the
+derived object modifies it, so many near identical variants cost memory only
+for their differences.
+"""
+import weakref
+
+from .helpers import next_version
+
+
+class FrozenObjectError(AttributeError):
+    """Raised when attempting to modify a frozen object."""
+
+
+class FrozenDict(dict):
+    """An immutable, hashable dictionary used for frozen principals etc."""
+
+    __slots__ = ('_hash',)
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the dictionary, accepting the same arguments as dict."""
+        super(FrozenDict, self).__init__(*args, **kwargs)
+        self._hash = None
+
+    def _immutable(self, *args, **kwargs):
+        """Refuse to modify the dictionary.
+
+        Raises:
+            FrozenObjectError: Always
+
+        """
+        raise FrozenObjectError("Cannot modify a frozen dictionary")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = \
+        update = _immutable
+
+    def __hash__(self):
+        """Get the hash of the dictionary contents.
+
+        Returns:
+            int: The cached hash
+
+        """
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __reduce__(self):
+        """Pickle the dictionary by its contents.
+
+        Returns:
+            tuple: The pickle reduction
+
+        """
+        return (FrozenDict, (dict(self),))
+
+
+def freeze_value(value):
+    """Make an immutable equivalent of a value.
+
+    Core objects are frozen in place, lists and tuples become tuples, sets
+    become frozensets and dictionaries become FrozenDicts. Tuples and
+    frozensets holding only frozen values, and anything else, such as strings
+    or troposphere helpers, are returned as is.
+
+    Args:
+        value (object): The value to freeze
+
+    Returns:
+        object: The frozen value
+
+    """
+    if isinstance(value, IamObject):
+        return value.freeze()
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict(
+            (name, freeze_value(item)) for name, item in value.items())
+    if isinstance(value, (list, tuple)):
+        frozen = tuple(freeze_value(item) for item in value)
+    elif isinstance(value, (set, frozenset)):
+        frozen = frozenset(freeze_value(item) for item in value)
+    else:
+        return value
+    # Keep a tuple or frozenset which is already frozen, as it may be shared
+    if type(value) is type(frozen) and all(
+            new is old for new, old in zip(frozen, value)):
+        return value
+    return frozen
+
+
+def thaw_value(value):
+    """Make a shallow, mutable copy of a frozen container.
+
+    Only the container itself is copied, the items it holds are shared.
+
+    Args:
+        value (object): The value to thaw
+
+    Returns:
+        object: A list, set or dict copy, or value itself if it wasn't a
+            frozen container
+
+    """
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, frozenset):
+        return set(value)
+    if isinstance(value, FrozenDict):
+        return dict(value)
+    return value
+
+
+# Slots which are specific to a process, or rebuilt on demand, and so are not
+# pickled
+_UNPICKLED_SLOTS = frozenset(['_hash', '_parents', '_building', '_members',
+                              '_membership', '__weakref__'])
+
+
+def _slot_names(cls):
+    """Get the names of all slots declared by a class and its bases.
+
+    Args:
+        cls (type): The class to inspect
+
+    Returns:
+        []str: The slot names
+
+    """
+    names = []
+    for klass in cls.__mro__:
+        names.extend(klass.__dict__.get('__slots__', ()))
+    return names
+
+
+class _IamObjectType(type):
+    """The metaclass of IamObject, marking objects while they are built."""
+
+    def __call__(cls, *args, **kwargs):
+        """Create and initialize an object.
+
+        While __init__ runs nothing can hold the object or its version, so
+        assignments made by it aren't stamped or propagated.
+
+        Returns:
+            IamObject: The new object
+
+        """
+        obj = cls.__new__(cls, *args, **kwargs)
+        if isinstance(obj, cls):
+            object.__setattr__(obj, '_building', True)
+            try:
+                obj.__init__(*args, **kwargs)
+            finally:
+                object.__setattr__(obj, '_building', False)
+        return obj
+
+
+# Created by calling the metaclass, as the syntax for a metaclass differs
+# between Python 2 and 3
+_IamObjectBase = _IamObjectType('_IamObjectBase', (object,),
+                                {'__slots__': ()})
+
+
+class IamObject(_IamObjectBase):
+    """The base class for all core Rack IAM objects.
+
+    Subclasses list the attributes making up their content in `_fields`.
+    Public attribute assignment stamps a new version, while methods modifying
+    a container in place call `_touch` to do the same. `_touch` is also where
+    a container shared with a blueprint gets copied before it is modified.
+    Methods adding a child object to a container call `_adopt` so that the
+    child's modifications are propagated to the parent.
+    """
+
+    __slots__ = ('_version', '_frozen', '_hash', '_parents', '_building',
+                 '_logical_ids', '__weakref__')
+
+    _fields = ()
+
+    def __new__(cls, *args, **kwargs):
+        """Create the object with its tracking state initialized.
+
+        Returns:
+            IamObject: The new, unfrozen, object
+
+        """
+        obj = super(IamObject, cls).__new__(cls)
+        object.__setattr__(obj, '_version', next_version())
+        object.__setattr__(obj, '_frozen', False)
+        object.__setattr__(obj, '_hash', None)
+        object.__setattr__(obj, '_parents', None)
+        object.__setattr__(obj, '_building', False)
+        return obj
+
+    def __setattr__(self, name, value):
+        """Set an attribute, stamping a new version for public attributes.
+
+        Args:
+            name (str): The attribute name
+            value (object): The value to assign
+
+        Raises:
+            FrozenObjectError: If a public attribute of a frozen object is set
+
+        """
+        if name[0] == '_':
+            object.__setattr__(self, name, value)
+            return
+        if self._frozen:
+            raise FrozenObjectError(
+                "Cannot modify frozen {}".format(type(self).__name__))
+        object.__setattr__(self, name, value)
+        if isinstance(value, _ADOPTABLE):
+            self._adopt(value)
+        if not self._building:
+            self._stamp()
+
+    def _stamp(self):
+        """Stamp a new version on the object and all of its ancestors."""
+        if self._building:
+            return
+        version = next_version()
+        object.__setattr__(self, '_version', version)
+        if self._parents:
+            self._propagate(version)
+
+    def _propagate(self, version):
+        """Stamp a version on the parents of the object.
+
+        Args:
+            version (int): The version to stamp
+        """
+        parents = self._parents
+        if not parents:
+            return
+        alive = []
+        for ref in parents:
+            parent = ref()
+            if parent is None:
+                continue
+            alive.append(ref)
+            if parent._version < version:
+                object.__setattr__(parent, '_version', version)
+                parent._propagate(version)
+        if len(alive) != len(parents):
+            object.__setattr__(self, '_parents', alive)
+
+    def _adopt(self, value):
+        """Register the object as the parent of a child, or of many.
+
+        Frozen children are skipped, as they can never change, and a child is
+        only linked to the same parent once. A child which is later removed
+        keeps its link, which at worst causes an unneeded re-render of the
+        parent.
+
+        Args:
+            value (object): A core object, or a container of them
+        """
+        if isinstance(value, IamObject):
+            children = (value,)
+        elif isinstance(value, _ADOPTABLE):
+            children = value
+        else:
+            return
+        for child in children:
+            if not isinstance(child, IamObject) or child._frozen:
+                continue
+            parents = getattr(child, '_parents', None)
+            if parents:
+                # Drop the links to parents which are gone while looking for
+                # this one, so a child moved between many parents doesn't
+                # accumulate them
+                alive = [ref for ref in parents if ref() is not None]
+                if any(ref() is self for ref in alive):
+                    if len(alive) != len(parents):
+                        object.__setattr__(child, '_parents', alive)
+                    continue
+                parents = alive
+            else:
+                parents = []
+            parents.append(weakref.ref(self))
+            object.__setattr__(child, '_parents', parents)
+
+    def get_version(self):
+        """Get the version of the object and everything within it.
+
+        The version changes whenever the object, or one of its children, is
+        modified through attribute assignment or the object's methods.
+
+        Returns:
+            int: The latest version stamp within the object
+
+        """
+        return self._version
+
+    def _check_frozen(self):
+        """Ensure the object can be modified.
+
+        Raises:
+            FrozenObjectError: If the object is frozen
+
+        """
+        if self._frozen:
+            raise FrozenObjectError(
+                "Cannot modify frozen {}".format(type(self).__name__))
+
+    def _touch(self, name=None):
+        """Record that the object is about to be modified in place.
+
+        Args:
+            name (str): The container attribute about to be modified. If it
+                is still shared with a blueprint it is copied first.
+
+        Raises:
+            FrozenObjectError: If the object is frozen
+
+        """
+        self._check_frozen()
+        self._stamp()
+        if name is not None:
+            object.__setattr__(self, name, thaw_value(getattr(self, name)))
+
+    def set_logical_id(self, logical_id, resource_type=None):
+        """Set the logical ID the object is rendered with in a template.
+
+        Objects read from a template keep the logical IDs they had there, so
+        that Ref and GetAtt references to them still resolve once the
+        template is rendered again. The logical ID isn't part of the
+        object's content, and isn't copied by derive.
+
+        Args:
+            logical_id (str): The logical ID
+            resource_type (str): The resource type the logical ID is for, for
+                objects rendered as more than one resource, such as the
+                AWS::IAM::UserToGroupAddition of a group. Defaults to the
+                object's own resource.
+        Returns:
+            IamObject: The class instance for function chaining
+
+        Raises:
+            FrozenObjectError: If the object is frozen
+
+        """
+        self._touch()
+        logical_ids = getattr(self, '_logical_ids', None)
+        if logical_ids is None:
+            logical_ids = self._logical_ids = {}
+        logical_ids[resource_type] = logical_id
+        return self
+
+    def get_logical_id(self, default=None, resource_type=None):
+        """Get the logical ID the object is rendered with in a template.
+
+        Args:
+            default (str): The logical ID to use if none has been set,
+                normally derived from the object's name
+            resource_type (str): The resource type, as for set_logical_id
+        Returns:
+            str: The logical ID
+
+        """
+        logical_ids = getattr(self, '_logical_ids', None)
+        if not logical_ids:
+            return default
+        return logical_ids.get(resource_type, default)
+
+    def derive(self, **changes):
+        """Create a new object using this one as a blueprint.
+
+        The blueprint is frozen, and the new object shares all of its
+        children. Shared containers and children are copied only when the
+        new object modifies them, through the add_* and edit_* methods.
+
+        Args:
+            changes: Attributes to set on the new object, such as a new name
+        Returns:
+            IamObject: The new, unfrozen, object
+
+        """
+        self.freeze()
+        derived = type(self).__new__(type(self))
+        for name in self._fields:
+            object.__setattr__(derived, name, getattr(self, name))
+        for name, value in changes.items():
+            setattr(derived, name, value)
+        return derived
+
+    def edit(self, name):
+        """Get a child object for modification.
+
+        A child shared with a blueprint is replaced by a derived copy first,
+        so that modifying it doesn't affect any other object.
+
+        Args:
+            name (str): The attribute holding the child object
+        Returns:
+            IamObject: The child, which may now be modified
+
+        """
+        child = getattr(self, name)
+        if isinstance(child, IamObject) and child._frozen:
+            child = child.derive()
+            setattr(self, name, child)
+        return child
+
+    def _edit_item(self, name, match):
+        """Get an item of a container attribute for modification.
+
+        Args:
+            name (str): The container attribute
+            match (function): Called with each item, returning True for the
+                item to edit
+        Returns:
+            IamObject: The matching item, which may now be modified
+
+        Raises:
+            KeyError: If no item matches
+
+        """
+        self._touch(name)
+        items = getattr(self, name)
+        for index, item in enumerate(items):
+            if match(item):
+                if isinstance(item, IamObject) and item._frozen:
+                    item = items[index] = item.derive()
+                    self._adopt(item)
+                return item
+        raise KeyError(name)
+
+    def freeze(self):
+        """Make the object and all of its children immutable.
+
+        Returns:
+            IamObject: The class instance for function chaining
+
+        """
+        if not self._frozen:
+            for name in self._fields:
+                object.__setattr__(
+                    self, name, freeze_value(getattr(self, name)))
+            self._frozen = True
+        return self
+
+    def is_frozen(self):
+        """Check whether the object has been frozen.
+
+        Returns:
+            bool: True when the object is frozen
+
+        """
+        return self._frozen
+
+    def __hash__(self):
+        """Get the hash of the object.
+
+        Frozen objects hash by their contents, and the hash is computed only
+        once. Unfrozen objects hash by identity.
+
+        Returns:
+            int: The hash
+
+        """
+        if not self._frozen:
+            return object.__hash__(self)
+        if self._hash is None:
+            self._hash = hash((type(self).__name__,) + tuple(
+                getattr(self, name) for name in self._fields))
+        return self._hash
+
+    def __eq__(self, other):
+        """Compare the object with another.
+
+        Two frozen objects of the same type are equal when their contents are.
+        Unfrozen objects are only equal to themselves.
+
+        Args:
+            other (object): The object to compare against
+
+        Returns:
+            bool: Whether the objects are equal
+
+        """
+        if self is other:
+            return True
+        if (type(self) is not type(other) or not self._frozen or
+                not other._frozen or hash(self) != hash(other)):
+            return False
+        for name in self._fields:
+            if getattr(self, name) != getattr(other, name):
+                return False
+        return True
+
+    def __ne__(self, other):
+        """Compare the object with another for inequality.
+
+        Args:
+            other (object): The object to compare against
+
+        Returns:
+            bool: Whether the objects differ
+
+        """
+        return not self == other
+
+    def __getstate__(self):
+        """Get the state of the object for pickling and copying.
+
+        Returns:
+            dict: The slot values, excluding the process specific hash and
+                the parent links
+
+        """
+        return dict(
+            (name, getattr(self, name)) for name in _slot_names(type(self))
+            if name not in _UNPICKLED_SLOTS and hasattr(self, name))
+
+    def __setstate__(self, state):
+        """Restore the object from a pickled state.
+
+        Parent links aren't pickled, so they are recreated for the children
+        of the object.
+
+        Args:
+            state (dict): The slot values from __getstate__
+        """
+        object.__setattr__(self, '_hash', None)
+        object.__setattr__(self, '_building', False)
+        if not hasattr(self, '_parents'):
+            object.__setattr__(self, '_parents', None)
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+            self._adopt(value)
+
+
+# The values which _adopt looks into for children
+_ADOPTABLE = (IamObject, list, tuple, set, frozenset)
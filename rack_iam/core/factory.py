@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM bulk factory module.
+
+Builds many users, roles or groups at once from tabular data, such as an HR
+or service catalog export. Rows can come from a CSV file, a list of tuples
+with column names, a list of dictionaries, or a dictionary of columns such
+as lists, arrays or NumPy arrays.
+
+Objects are filled in directly rather than through their chained setters,
+policy documents named by the rows are frozen and shared by every object
+using them, and ARNs are generated for the whole batch in one go. A bad row
+is reported alongside the results instead of stopping the batch.
+"""
+from collections import namedtuple
+import csv
+
+from .arn import generate_arns
+from .group import Group
+from .helpers import string_types
+from .policy import InlinePolicy
+from .role import Role
+from .user import User
+
+BulkResult = namedtuple('BulkResult', ['objects', 'errors', 'arns'])
+RowError = namedtuple('RowError', ['row', 'error'])
+
+# The separator of list values within a single cell, such as groups
+LIST_SEPARATOR = ';'
+
+
+def _iter_rows(data, columns=None):
+    """Iterate over tabular data as dictionaries.
+
+    Args:
+        data (object): A CSV file object, a dictionary of columns, or a list
+            of dictionaries or tuples
+        columns ([]str): The column names of tuple rows
+
+    Yields:
+        dict: Each row, by column name, or a ValueError in place of a tuple
+            row without a value for each column
+
+    Raises:
+        ValueError: If the columns of a dictionary of columns differ in
+            length, or tuple rows are given without column names
+
+    """
+    if hasattr(data, 'read'):
+        for row in csv.DictReader(data):
+            yield row
+    elif isinstance(data, dict):
+        names = sorted(data)
+        lengths = dict((name, len(data[name])) for name in names)
+        for name in names:
+            if lengths[name] != lengths[names[0]]:
+                raise ValueError(
+                    "Column '{}' has {} values, but '{}' has {}".format(
+                        name, lengths[name], names[0], lengths[names[0]]))
+        for values in zip(*[data[name] for name in names]):
+            yield dict(zip(names, values))
+    else:
+        for row in data:
+            if isinstance(row, dict):
+                yield row
+            elif columns is None:
+                raise ValueError("Column names are needed for tuple rows")
+            elif len(row) != len(columns):
+                yield ValueError("Row has {} values for {} columns".format(
+                    len(row), len(columns)))
+            else:
+                yield dict(zip(columns, row))
+
+
+def _text(value):
+    """Get a cell as text, converting numbers and NumPy strings.
+
+    Args:
+        value (object): The cell
+
+    Returns:
+        str: The text, or None for an empty cell
+
+    """
+    if value is None:
+        return None
+    if isinstance(value, string_types):
+        return value or None
+    return str(value)
+
+
+def _items(value):
+    """Get a list valued cell as a list.
+
+    Args:
+        value (object): A separated string, or a sequence
+
+    Returns:
+        []str: The items
+
+    """
+    if value is None:
+        return []
+    if isinstance(value, string_types):
+        return [item.strip() for item in value.split(LIST_SEPARATOR)
+                if item.strip()]
+    return [_text(item) for item in value]
+
+
+def _name(row, column):
+    """Get the required name cell of a row.
+
+    Args:
+        row (dict): The row
+        column (str): The name column
+
+    Returns:
+        str: The name
+
+    Raises:
+        ValueError: If the name is missing
+
+    """
+    name = _text(row.get(column))
+    if name is None:
+        raise ValueError("Missing {}".format(column))
+    return name
+
+
+def _share(documents):
+    """Freeze the documents named by rows, so that they can be shared.
+
+    Args:
+        documents (dict): Policy documents by name
+
+    Returns:
+        tuple: The documents, and an inline policy for each, by name
+
+    """
+    documents = dict(documents or {})
+    inline = {}
+    for name, document in documents.items():
+        document.freeze()
+        inline[name] = InlinePolicy(name).set_policy_document(
+            document).freeze()
+    return documents, inline
+
+
+def _new(cls, **fields):
+    """Create an object from its field values, bypassing its setters.
+
+    Children must be frozen, as they aren't linked to the new object.
+
+    Args:
+        cls (type): The class of the object
+        fields: The value of every field
+
+    Returns:
+        IamObject: The new object
+
+    """
+    obj = cls.__new__(cls)
+    for name in cls._fields:
+        object.__setattr__(obj, name, fields[name])
+    return obj
+
+
+def _build(data, columns, account_id, resource_type, name_column, build):
+    """Build an object from each row, collecting errors and ARNs.
+
+    Args:
+        data (object): The tabular data
+        columns ([]str): The column names of tuple rows
+        account_id (str): The account to generate ARNs for, if any
+        resource_type (str): The ARN resource type, such as user
+        name_column (str): The column holding the object name
+        build (function): Called with a row to build its object
+
+    Returns:
+        BulkResult: The objects, row errors and ARNs
+
+    """
+    objects = []
+    errors = []
+    names = []
+    for index, row in enumerate(_iter_rows(data, columns)):
+        if isinstance(row, ValueError):
+            errors.append(RowError(index, row))
+            continue
+        try:
+            obj = build(row)
+        except (KeyError, TypeError, ValueError) as error:
+            errors.append(RowError(index, error))
+            continue
+        objects.append(obj)
+        names.append(getattr(obj, name_column))
+    arns = None
+    if account_id is not None:
+        arns = generate_arns(
+            'iam', ['{}/{}'.format(resource_type, name) for name in names],
+            (account_id,))
+    return BulkResult(objects, errors, arns)
+
+
+def _policies(row, inline):
+    """Get the shared inline policies named by a row.
+
+    Args:
+        row (dict): The row
+        inline (dict): The shared inline policies, by name
+
+    Returns:
+        []InlinePolicy: The policies
+
+    Raises:
+        KeyError: If a policy isn't one of the documents
+
+    """
+    policies = []
+    for name in _items(row.get('policies')):
+        if name not in inline:
+            raise KeyError("Unknown policy document '{}'".format(name))
+        policies.append(inline[name])
+    return policies
+
+
+def build_users(data, columns=None, documents=None, account_id=None):
+    """Build many users from tabular data.
+
+    Columns are username, and optionally path, groups, managed_policy_arns,
+    policies and password. List columns hold lists, or strings separated by
+    LIST_SEPARATOR. The policies column names entries of documents.
+
+    Args:
+        data (object): A CSV file object, a dictionary of columns, or a list
+            of dictionaries or tuples
+        columns ([]str): The column names of tuple rows
+        documents (dict): Policy documents by name. They are frozen and
+            shared by every user listing them, as inline policies.
+        account_id (str): When given, the ARN of each user is generated
+    Returns:
+        BulkResult: The users, an error for each row that failed, and the
+            ARNs of the users
+
+    """
+    inline = _share(documents)[1]
+
+    def build(row):
+        password = _text(row.get('password'))
+        return _new(
+            User,
+            username=_name(row, 'username'),
+            path=_text(row.get('path')) or '/',
+            groups=set(_items(row.get('groups'))),
+            managed_policy_arns=_items(row.get('managed_policy_arns')),
+            login_profile=(password, True) if password else None,
+            policies=_policies(row, inline))
+
+    return _build(data, columns, account_id, 'user', 'username', build)
+
+
+def build_roles(data, columns=None, documents=None, account_id=None):
+    """Build many roles from tabular data.
+
+    Columns are name, and optionally path, assume_role_policy,
+    managed_policy_arns and policies. The assume_role_policy and policies
+    columns name entries of documents.
+
+    Args:
+        data (object): A CSV file object, a dictionary of columns, or a list
+            of dictionaries or tuples
+        columns ([]str): The column names of tuple rows
+        documents (dict): Policy documents by name. They are frozen and
+            shared by every role using them.
+        account_id (str): When given, the ARN of each role is generated
+    Returns:
+        BulkResult: The roles, an error for each row that failed, and the
+            ARNs of the roles
+
+    """
+    documents, inline = _share(documents)
+
+    def build(row):
+        trust = _text(row.get('assume_role_policy'))
+        if trust is not None and trust not in documents:
+            raise KeyError("Unknown policy document '{}'".format(trust))
+        return _new(
+            Role,
+            name=_name(row, 'name'),
+            path=_text(row.get('path')) or '/',
+            assume_role_policy_document=documents.get(trust),
+            managed_policy_arns=_items(row.get('managed_policy_arns')),
+            policies=_policies(row, inline))
+
+    return _build(data, columns, account_id, 'role', 'name', build)
+
+
+def build_groups(data, columns=None, documents=None, account_id=None):
+    """Build many groups from tabular data.
+
+    Columns are groupname, and optionally path, users, managed_policy_arns
+    and policies.
+
+    Args:
+        data (object): A CSV file object, a dictionary of columns, or a list
+            of dictionaries or tuples
+        columns ([]str): The column names of tuple rows
+        documents (dict): Policy documents by name. They are frozen and
+            shared by every group listing them, as inline policies.
+        account_id (str): When given, the ARN of each group is generated
+    Returns:
+        BulkResult: The groups, an error for each row that failed, and the
+            ARNs of the groups
+
+    """
+    inline = _share(documents)[1]
+
+    def build(row):
+        return _new(
+            Group,
+            groupname=_name(row, 'groupname'),
+            path=_text(row.get('path')) or '/',
+            managed_policy_arns=_items(row.get('managed_policy_arns')),
+            policies=_policies(row, inline),
+            users=set(_items(row.get('users'))))
+
+    return _build(data, columns, account_id, 'group', 'groupname', build)
@@ -16,12 +16,19 @@
 
 This module is used to handle IAM groups.
 """
-from rack_iam.core.helpers import generate_arn
+from rack_iam.core.base import IamObject
+from rack_iam.core.arn import iam_arn
 
 
-class Group(object):
+class Group(IamObject):
     """A class for dealing with IAM groups."""
 
+    __slots__ = ('path', 'groupname', 'managed_policy_arns', 'policies',
+                 'users', '_membership')
+
+    _fields = ('groupname', 'path', 'managed_policy_arns', 'policies',
+               'users')
+
     def __init__(self, groupname, users=[], path='/'):
         """Create a group object.
 
@@ -60,7 +67,9 @@ class Group(object):
             Group: the class instance for function chaining
 
         """
+        self._touch('policies')
         self.policies.append(policy)
+        self._adopt(policy)
         return self
 
     def add_users(self, users):
@@ -71,10 +80,52 @@ class Group(object):
         Returns:
             Group: the class instance for function chaining
 
+        Raises:
+            FrozenObjectError: If the group is frozen, even when it is
+                registered with a MembershipIndex
+
         """
+        self._check_frozen()
+        membership = getattr(self, '_membership', None)
+        if membership is not None:
+            membership.add_users(self.groupname, users)
+            return self
+        self._touch('users')
         self.users.update(users)
         return self
 
+    def get_users(self):
+        """Get the users in the group.
+
+        When the group is registered with a MembershipIndex the users come
+        from the index, otherwise from the group's own users set.
+
+        Returns:
+            set: The names of the users
+
+        """
+        membership = getattr(self, '_membership', None)
+        if membership is not None:
+            return membership.users_of(self.groupname)
+        return self.users
+
+    def edit_policy(self, name):
+        """Get an inline policy of the group for modification.
+
+        When the group was derived from a blueprint, the policy is copied
+        first so the blueprint and its other variants are unaffected.
+
+        Args:
+            name (str): The name of the inline policy
+        Returns:
+            InlinePolicy: The policy, which may now be modified
+
+        Raises:
+            KeyError: If the group has no policy with the name
+
+        """
+        return self._edit_item('policies', lambda policy: policy.name == name)
+
     def get_arn(self, region='', account_id=''):
         """Generate an ARN for the Group resource.
 
@@ -82,5 +133,4 @@ class Group(object):
             str: The ARN for the group
 
         """
-        return generate_arn('aws', 'iam', region=region, account_id=account_id,
-                            resource='group/{}'.format(self.groupname))
+        return iam_arn('group', self.groupname, region, account_id)
@@ -16,8 +16,38 @@
 
 Primarily functions that are shared across other modules. Currently it has
 ARN related functions for use with the Statement module in declaring
-principals.
+principals, which share the caches of the arn module, as well as the version
+stamps used to track mutation and the lazy loading used by the package
+modules.
 """
+import importlib
+import itertools
+import sys
+
+from .arn import format_arn
+
+try:
+    string_types = (basestring,)
+except NameError:
+    string_types = (str,)
+
+# A process wide, monotonically increasing source of version stamps. Taking
+# the next value from a count is atomic in CPython, so stamps never repeat.
+_version_counter = itertools.count(1)
+
+
+def next_version():
+    """Generate a new mutation version stamp.
+
+    Stamps are unique and always larger than any stamp handed out before, so
+    the largest stamp within a group of objects changes whenever any one of
+    them is modified.
+
+    Returns:
+        int: The version stamp
+
+    """
+    return next(_version_counter)
 
 
 def generate_arn(partition='', service='', region='',
@@ -49,9 +79,7 @@ def generate_arn(partition='', service='', region='',
         str: The generated ARN
 
     """
-    return "arn:{}:{}:{}:{}:{}".format(
-        partition, service, region, account_id, resource
-    )
+    return format_arn(partition, service, region, account_id, resource)
 
 
 def generate_aws_account_arn(account_id, resource='root'):
@@ -75,3 +103,41 @@ def generate_aws_account_arn(account_id, resource='root'):
         service='iam',
         account_id=account_id,
         resource=resource)
+
+
+def lazy_attributes(module_name, attributes):
+    """Create the module level __getattr__ and __dir__ for lazy loading.
+
+    Each attribute is imported from its module the first time it is used, and
+    then stored on the module so later uses are plain lookups. Python versions
+    without module level __getattr__ (before 3.7) import everything at once.
+
+    Args:
+        module_name (str): The name of the module the attributes belong to
+        attributes (dict): A mapping of attribute name to the name of the
+            module which defines it
+
+    Returns:
+        tuple: The __getattr__ and __dir__ functions for the module
+
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        try:
+            source = attributes[name]
+        except KeyError:
+            raise AttributeError("module '{}' has no attribute '{}'".format(
+                module_name, name))
+        value = getattr(importlib.import_module(source), name)
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(attributes))
+
+    if sys.version_info < (3, 7):
+        for name in attributes:
+            __getattr__(name)
+
+    return __getattr__, __dir__
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM membership module.
+
+Users list the groups they are in, and groups list their users, but the two
+lists are kept separately. A MembershipIndex holds both directions of the
+relationship in one place, so that adding a user to a group on either side
+updates the other, and "who is in this group" doesn't mean scanning every
+user.
+"""
+
+
+class MembershipIndex(object):
+    """A two way index of which users are in which groups.
+
+    Users and groups are identified by name. Registered User and Group
+    objects are kept in sync with the index, so their groups and users sets,
+    and their versions, reflect every change made through the index. Frozen
+    objects, such as blueprints, keep the sets they were frozen with and
+    report the index's through get_groups and get_users, though their
+    versions still change so that cached renders are refreshed.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._groups_of = {}
+        self._users_of = {}
+        self._users = {}
+        self._groups = {}
+
+    def register_user(self, user_obj):
+        """Bind a User to the index, merging in its existing groups.
+
+        Args:
+            user_obj (User): The user to register
+        Returns:
+            User: The registered user
+
+        """
+        self.add_groups(user_obj.username, user_obj.groups)
+        self._users[user_obj.username] = user_obj
+        user_obj._membership = self
+        return user_obj
+
+    def register_group(self, group_obj):
+        """Bind a Group to the index, merging in its existing users.
+
+        Args:
+            group_obj (Group): The group to register
+        Returns:
+            Group: The registered group
+
+        """
+        self.add_users(group_obj.groupname, group_obj.users)
+        self._groups[group_obj.groupname] = group_obj
+        group_obj._membership = self
+        return group_obj
+
+    def unregister_user(self, user_obj):
+        """Unbind a User from the index, removing it from its groups.
+
+        The user keeps its own groups set, while registered groups no longer
+        list it.
+
+        Args:
+            user_obj (User): The user to unregister
+        Returns:
+            User: The unregistered user
+
+        """
+        username = user_obj.username
+        if self._users.get(username) is user_obj:
+            del self._users[username]
+        object.__setattr__(user_obj, '_membership', None)
+        for groupname in self.groups_of(username):
+            self.remove_users(groupname, (username,))
+        self._groups_of.pop(username, None)
+        return user_obj
+
+    def unregister_group(self, group_obj):
+        """Unbind a Group from the index, removing its users from it.
+
+        The group keeps its own users set, while registered users no longer
+        list it.
+
+        Args:
+            group_obj (Group): The group to unregister
+        Returns:
+            Group: The unregistered group
+
+        """
+        groupname = group_obj.groupname
+        if self._groups.get(groupname) is group_obj:
+            del self._groups[groupname]
+        object.__setattr__(group_obj, '_membership', None)
+        self.remove_users(groupname, self.users_of(groupname))
+        self._users_of.pop(groupname, None)
+        return group_obj
+
+    def _sync(self, usernames, groupnames):
+        """Prepare registered objects on both sides for modification.
+
+        Frozen objects only have a new version stamped, and are left out of
+        the result so that their sets aren't modified.
+
+        Args:
+            usernames ([]str): The users about to change
+            groupnames ([]str): The groups about to change
+        Returns:
+            tuple: The registered, unfrozen, users and groups, by name
+
+        """
+        users = {}
+        for username in usernames:
+            user_obj = self._users.get(username)
+            if user_obj is None:
+                continue
+            if user_obj.is_frozen():
+                user_obj._stamp()
+            else:
+                user_obj._touch('groups')
+                users[username] = user_obj
+        groups = {}
+        for groupname in groupnames:
+            group_obj = self._groups.get(groupname)
+            if group_obj is None:
+                continue
+            if group_obj.is_frozen():
+                group_obj._stamp()
+            else:
+                group_obj._touch('users')
+                groups[groupname] = group_obj
+        return users, groups
+
+    def add(self, username, groupname):
+        """Add a user to a group.
+
+        Args:
+            username (str): The name of the user
+            groupname (str): The name of the group
+        Returns:
+            MembershipIndex: The class instance for function chaining
+
+        """
+        return self.add_users(groupname, (username,))
+
+    def add_users(self, groupname, usernames):
+        """Add many users to a group.
+
+        Args:
+            groupname (str): The name of the group
+            usernames ([]str): The names of the users
+        Returns:
+            MembershipIndex: The class instance for function chaining
+
+        """
+        usernames = [
+            username for username in usernames
+            if username not in self._users_of.get(groupname, ())
+        ]
+        if not usernames:
+            return self
+        users, groups = self._sync(usernames, (groupname,))
+        self._users_of.setdefault(groupname, set()).update(usernames)
+        for username in usernames:
+            self._groups_of.setdefault(username, set()).add(groupname)
+            if username in users:
+                users[username].groups.add(groupname)
+        if groupname in groups:
+            groups[groupname].users.update(usernames)
+        return self
+
+    def add_groups(self, username, groupnames):
+        """Add a user to many groups.
+
+        Args:
+            username (str): The name of the user
+            groupnames ([]str): The names of the groups
+        Returns:
+            MembershipIndex: The class instance for function chaining
+
+        """
+        for groupname in list(groupnames):
+            self.add_users(groupname, (username,))
+        return self
+
+    def remove(self, username, groupname):
+        """Remove a user from a group.
+
+        Args:
+            username (str): The name of the user
+            groupname (str): The name of the group
+        Returns:
+            MembershipIndex: The class instance for function chaining
+
+        """
+        return self.remove_users(groupname, (username,))
+
+    def remove_users(self, groupname, usernames):
+        """Remove many users from a group.
+
+        Args:
+            groupname (str): The name of the group
+            usernames ([]str): The names of the users
+        Returns:
+            MembershipIndex: The class instance for function chaining
+
+        """
+        members = self._users_of.get(groupname, ())
+        usernames = [
+            username for username in usernames if username in members
+        ]
+        if not usernames:
+            return self
+        users, groups = self._sync(usernames, (groupname,))
+        members.difference_update(usernames)
+        for username in usernames:
+            self._groups_of[username].discard(groupname)
+            if username in users:
+                users[username].groups.discard(groupname)
+        if groupname in groups:
+            groups[groupname].users.difference_update(usernames)
+        return self
+
+    def move_users(self, usernames, from_group, to_group):
+        """Move users from one group to another.
+
+        Args:
+            usernames ([]str): The names of the users
+            from_group (str): The name of the group they leave
+            to_group (str): The name of the group they join
+        Returns:
+            MembershipIndex: The class instance for function chaining
+
+        """
+        usernames = list(usernames)
+        self.remove_users(from_group, usernames)
+        return self.add_users(to_group, usernames)
+
+    def is_member(self, username, groupname):
+        """Check whether a user is in a group.
+
+        Args:
+            username (str): The name of the user
+            groupname (str): The name of the group
+        Returns:
+            bool: True when the user is in the group
+
+        """
+        return username in self._users_of.get(groupname, ())
+
+    def users_of(self, groupname):
+        """Get the users in a group.
+
+        Args:
+            groupname (str): The name of the group
+        Returns:
+            frozenset: The names of the users
+
+        """
+        return frozenset(self._users_of.get(groupname, ()))
+
+    def groups_of(self, username):
+        """Get the groups a user is in.
+
+        Args:
+            username (str): The name of the user
+        Returns:
+            frozenset: The names of the groups
+
+        """
+        return frozenset(self._groups_of.get(username, ()))
@@ -0,0 +1,420 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM model module.
+
+An IamModel owns the roles, users, groups, policies and instance profiles of
+a deployment, and keeps reverse indexes over them: which principals use a
+managed policy ARN or an inline policy name, and which policies are attached
+to a principal. Lookups are dictionary accesses.
+
+The model watches its entities through the same parent links that propagate
+versions, so an entity modified directly, at any depth, is marked for
+re-indexing in constant time. Only the entities modified since the last
+lookup are re-indexed.
+"""
+from collections import OrderedDict
+import weakref
+
+from .group import Group
+from .membership import MembershipIndex
+from .policy import ManagedPolicy, Policy
+from .role import InstanceProfile, Role
+from .user import User
+
+# The kind of each entity type, with the attribute holding its name. Managed
+# policies come before policies as they are a subclass.
+KINDS = (
+    ('role', Role, 'name'),
+    ('user', User, 'username'),
+    ('group', Group, 'groupname'),
+    ('managed_policy', ManagedPolicy, 'name'),
+    ('policy', Policy, 'name'),
+    ('instance_profile', InstanceProfile, 'name'),
+)
+
+# The kinds which can have managed policies and inline policies
+_PRINCIPAL_KINDS = frozenset(['role', 'user', 'group'])
+
+# The policy attributes listing the principals the policy is attached to
+_ATTACHMENTS = (('role', 'roles'), ('user', 'users'), ('group', 'groups'))
+
+
+def _kind_of(entity):
+    """Find the kind of an entity.
+
+    Args:
+        entity (IamObject): The entity
+
+    Returns:
+        tuple: The kind and the name attribute
+
+    Raises:
+        TypeError: If the entity can't be held by a model
+
+    """
+    for kind, cls, name_attribute in KINDS:
+        if isinstance(entity, cls):
+            return kind, name_attribute
+    raise TypeError("Cannot add {} to a model".format(type(entity).__name__))
+
+
+def _hashable(values):
+    """Get the hashable members of a collection.
+
+    Troposphere helpers, such as a Ref to a managed policy, can't be indexed.
+
+    Args:
+        values ([]object): The values
+
+    Returns:
+        set: The hashable values
+
+    """
+    result = set()
+    for value in values or ():
+        try:
+            hash(value)
+        except TypeError:
+            continue
+        result.add(value)
+    return result
+
+
+class _Watcher(object):
+    """Stands in as a parent of an entity, to learn when it is modified.
+
+    Entities stamp their versions on their parents, so a watcher is told of
+    every modification within the entity and marks it as needing re-indexing.
+    """
+
+    __slots__ = ('_version', '_dirty', '_key', '__weakref__')
+
+    def __init__(self, dirty, key, version):
+        """Initialize the watcher.
+
+        Args:
+            dirty (set): The model's set of entities needing re-indexing
+            key (int): The key of the watched entity
+            version (int): The current version of the entity
+        """
+        self._version = version
+        self._dirty = dirty
+        self._key = key
+
+    def _propagate(self, version):
+        """Mark the watched entity as modified.
+
+        Args:
+            version (int): The version stamped on the entity
+        """
+        self._dirty.add(self._key)
+
+
+class IamModel(object):
+    """A registry of IAM entities with reverse indexes over their links."""
+
+    def __init__(self, entities=()):
+        """Initialize the model.
+
+        Args:
+            entities ([]IamObject): Roles, users, groups, policies, managed
+                policies and instance profiles to add
+        """
+        self.membership = MembershipIndex()
+        self._entities = OrderedDict()
+        self._records = {}
+        self._watchers = {}
+        self._dirty = set()
+        self._names = dict((kind, {}) for kind, _, _ in KINDS)
+        self._arns = {}
+        self._inline = {}
+        self._attached = {}
+        for entity in entities:
+            self.add(entity)
+
+    def __len__(self):
+        """Get the number of entities in the model.
+
+        Returns:
+            int: The number of entities
+
+        """
+        return len(self._entities)
+
+    def __contains__(self, entity):
+        """Check whether an entity is in the model.
+
+        Args:
+            entity (IamObject): The entity
+
+        Returns:
+            bool: True when the entity is in the model
+
+        """
+        return id(entity) in self._entities
+
+    def add(self, entity):
+        """Add an entity to the model.
+
+        Users and groups are also registered with the model's membership
+        index, merging their memberships.
+
+        Args:
+            entity (IamObject): A role, user, group, policy, managed policy
+                or instance profile
+        Returns:
+            IamModel: The class instance for function chaining
+
+        Raises:
+            TypeError: If the entity can't be held by a model
+            ValueError: If another entity of the same kind has the same name
+
+        """
+        key = id(entity)
+        if key in self._entities:
+            return self
+        kind, name_attribute = _kind_of(entity)
+        name = getattr(entity, name_attribute)
+        # Entities renamed since the last lookup are indexed under their old
+        # names until then
+        self._refresh()
+        if name in self._names[kind]:
+            raise ValueError("Duplicate {} '{}' in model".format(kind, name))
+        if kind == 'user':
+            self.membership.register_user(entity)
+        elif kind == 'group':
+            self.membership.register_group(entity)
+
+        self._entities[key] = entity
+        self._index(key)
+        if not entity.is_frozen():
+            watcher = _Watcher(self._dirty, key, entity.get_version())
+            self._watchers[key] = watcher
+            if entity._parents is None:
+                entity._parents = []
+            entity._parents.append(weakref.ref(watcher))
+        return self
+
+    def remove(self, entity):
+        """Remove an entity from the model.
+
+        Users and groups are also unregistered from the model's membership
+        index, dropping their memberships there.
+
+        Args:
+            entity (IamObject): The entity to remove
+        Returns:
+            IamModel: The class instance for function chaining
+
+        Raises:
+            KeyError: If the entity isn't in the model
+
+        """
+        key = id(entity)
+        if key in self._records:
+            self._unindex(key)
+        del self._entities[key]
+        kind = _kind_of(entity)[0]
+        if kind == 'user':
+            self.membership.unregister_user(entity)
+        elif kind == 'group':
+            self.membership.unregister_group(entity)
+        self._dirty.discard(key)
+        # The entity's link to the watcher dies with it
+        self._watchers.pop(key, None)
+        return self
+
+    def _index(self, key):
+        """Add an entity's links to the reverse indexes.
+
+        Args:
+            key (int): The key of the entity
+        """
+        entity = self._entities[key]
+        kind, name_attribute = _kind_of(entity)
+        name = getattr(entity, name_attribute)
+        holder = self._names[kind].get(name)
+        if holder is not None and holder is not entity:
+            raise ValueError("Duplicate {} '{}' in model".format(kind, name))
+        arns = set()
+        inline = set()
+        attached = set()
+        if kind in _PRINCIPAL_KINDS:
+            arns = _hashable(entity.managed_policy_arns)
+            inline = _hashable(policy.name for policy in entity.policies)
+        elif kind in ('policy', 'managed_policy'):
+            for target_kind, attribute in _ATTACHMENTS:
+                attached.update(
+                    (target_kind, target)
+                    for target in _hashable(getattr(entity, attribute)))
+
+        self._names[kind][name] = entity
+        for arn in arns:
+            self._arns.setdefault(arn, set()).add(key)
+        for policy_name in inline:
+            self._inline.setdefault(policy_name, set()).add(key)
+        for target in attached:
+            self._attached.setdefault(target, set()).add(key)
+        self._records[key] = (kind, name, arns, inline, attached)
+
+    def _unindex(self, key):
+        """Remove an entity's links from the reverse indexes.
+
+        Args:
+            key (int): The key of the entity
+        """
+        kind, name, arns, inline, attached = self._records.pop(key)
+        if self._names[kind].get(name) is self._entities[key]:
+            del self._names[kind][name]
+        for index, values in ((self._arns, arns), (self._inline, inline),
+                              (self._attached, attached)):
+            for value in values:
+                keys = index[value]
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+
+    def _refresh(self):
+        """Re-index the entities modified since the last lookup.
+
+        Raises:
+            ValueError: If an entity was renamed to the name of another of
+                the same kind. The entity stays unindexed, and lookups keep
+                raising, until one of them is renamed.
+
+        """
+        while self._dirty:
+            key = self._dirty.pop()
+            if key in self._entities:
+                if key in self._records:
+                    self._unindex(key)
+                try:
+                    self._index(key)
+                except ValueError:
+                    self._dirty.add(key)
+                    raise
+
+    def _lookup(self, index, value):
+        """Get the entities an index holds for a value.
+
+        Args:
+            index (dict): The reverse index
+            value (object): The value to look up
+
+        Returns:
+            []IamObject: The entities, in no particular order
+
+        """
+        self._refresh()
+        return [self._entities[key] for key in index.get(value, ())]
+
+    def get(self, kind, name):
+        """Get an entity by kind and name.
+
+        Args:
+            kind (str): One of role, user, group, policy, managed_policy or
+                instance_profile
+            name (str): The name of the entity
+        Returns:
+            IamObject: The entity, or None if there isn't one
+
+        Raises:
+            ValueError: If an entity was renamed to the name of another
+
+        """
+        self._refresh()
+        return self._names[kind].get(name)
+
+    def entities(self, kind):
+        """Get every entity of a kind, in the order they were added.
+
+        Args:
+            kind (str): One of role, user, group, policy, managed_policy or
+                instance_profile
+        Returns:
+            []IamObject: The entities
+
+        """
+        return [entity for entity in self._entities.values()
+                if _kind_of(entity)[0] == kind]
+
+    def principals_with_managed_policy(self, arn):
+        """Get the roles, users and groups using a managed policy ARN.
+
+        Args:
+            arn (str): The managed policy ARN
+        Returns:
+            []IamObject: The principals listing the ARN
+
+        """
+        return self._lookup(self._arns, arn)
+
+    def principals_with_inline_policy(self, name):
+        """Get the roles, users and groups with an inline policy of a name.
+
+        Args:
+            name (str): The name of the inline policy
+        Returns:
+            []IamObject: The principals with the inline policy
+
+        """
+        return self._lookup(self._inline, name)
+
+    def policies_attached_to(self, kind, name):
+        """Get the policies and managed policies attached to a principal.
+
+        Args:
+            kind (str): One of role, user or group
+            name (str): The name of the principal
+        Returns:
+            []Policy: The policies naming the principal
+
+        """
+        return self._lookup(self._attached, (kind, name))
+
+    def get_collections(self):
+        """Get the entities in the form taken by the bulk transforms.
+
+        The result can be passed straight to transform_template or
+        iter_template_resources as keyword arguments. Groups with members
+        are also listed as group_users.
+
+        Returns:
+            dict: Lists of entities, by argument name
+
+        """
+        collections = {
+            'roles': [],
+            'users': [],
+            'groups': [],
+            'policies': [],
+            'managed_policies': [],
+            'instance_profiles': [],
+            'group_users': [],
+        }
+        argument = {
+            'role': 'roles',
+            'user': 'users',
+            'group': 'groups',
+            'policy': 'policies',
+            'managed_policy': 'managed_policies',
+            'instance_profile': 'instance_profiles',
+        }
+        for entity in self._entities.values():
+            kind = _kind_of(entity)[0]
+            collections[argument[kind]].append(entity)
+            if kind == 'group' and entity.get_users():
+                collections['group_users'].append(entity)
+        return collections
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM path module.
+
+Roles, users, groups and instance profiles are organized under IAM paths
+such as /team/service/. A PathIndex files objects in a trie of path segments,
+so that working with everything under a prefix costs time in proportion to
+what is under it, rather than to the size of the whole model.
+"""
+from .base import FrozenObjectError
+
+
+def _segments(path):
+    """Split an IAM path into its segments.
+
+    Args:
+        path (str): A path such as /team/service/. The slashes at either end
+            are optional.
+
+    Returns:
+        []str: The segments, empty for the root path
+
+    """
+    path = path.strip('/')
+    if not path:
+        return []
+    return path.split('/')
+
+
+class _PathNode(object):
+    """A node of the path trie, holding the objects at one path."""
+
+    __slots__ = ('name', 'parent', 'children', 'objects', 'count')
+
+    def __init__(self, name, parent):
+        """Initialize an empty node.
+
+        Args:
+            name (str): The path segment of the node
+            parent (_PathNode): The parent node, None for the root
+        """
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.objects = {}
+        self.count = 0
+
+    def iter_objects(self):
+        """Iterate over the objects at and below the node.
+
+        Yields:
+            IamObject: Each object in the subtree
+
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for obj in node.objects.values():
+                yield obj
+            stack.extend(node.children.values())
+
+
+class PathIndex(object):
+    """A trie of objects by IAM path, supporting prefix queries.
+
+    Objects are filed under their path when added. A path changed directly on
+    an object isn't seen by the index until the object is added again, so
+    objects in the index should be re-pathed with `repath`.
+    """
+
+    def __init__(self, objects=()):
+        """Initialize the index.
+
+        Args:
+            objects ([]IamObject): Objects with a path attribute to add, such
+                as roles, users, groups and instance profiles
+        """
+        self._root = _PathNode('', None)
+        self._nodes = {}
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self):
+        """Get the number of objects in the index.
+
+        Returns:
+            int: The number of objects
+
+        """
+        return self._root.count
+
+    def _node(self, prefix, create=False):
+        """Find the node for a path.
+
+        Args:
+            prefix (str): The path
+            create (bool): Whether to create missing nodes
+
+        Returns:
+            _PathNode: The node, or None if it doesn't exist
+
+        """
+        node = self._root
+        for segment in _segments(prefix):
+            child = node.children.get(segment)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[segment] = _PathNode(segment, node)
+            node = child
+        return node
+
+    def _adjust(self, node, delta):
+        """Change the subtree counts of a node and its ancestors.
+
+        Empty nodes are pruned from the trie as they are passed.
+
+        Args:
+            node (_PathNode): The node whose objects changed
+            delta (int): The change in the number of objects
+        """
+        while node is not None:
+            node.count += delta
+            parent = node.parent
+            if parent is not None and not node.count:
+                del parent.children[node.name]
+            node = parent
+
+    def add(self, obj):
+        """Add an object, or re-file it if its path has changed.
+
+        Args:
+            obj (IamObject): An object with a path attribute
+        Returns:
+            PathIndex: The class instance for function chaining
+
+        """
+        if id(obj) in self._nodes:
+            self.remove(obj)
+        node = self._node(obj.path, create=True)
+        node.objects[id(obj)] = obj
+        self._nodes[id(obj)] = node
+        self._adjust(node, 1)
+        return self
+
+    def remove(self, obj):
+        """Remove an object.
+
+        Args:
+            obj (IamObject): The object to remove
+        Returns:
+            PathIndex: The class instance for function chaining
+
+        Raises:
+            KeyError: If the object isn't in the index
+
+        """
+        node = self._nodes.pop(id(obj))
+        del node.objects[id(obj)]
+        self._adjust(node, -1)
+        return self
+
+    def find(self, prefix):
+        """Get every object under a path.
+
+        Args:
+            prefix (str): The path, such as /team/. Matching is by whole
+                segments, so /team/ doesn't match /teams/.
+        Returns:
+            []IamObject: The objects at the path or below it
+
+        """
+        node = self._node(prefix)
+        if node is None:
+            return []
+        return list(node.iter_objects())
+
+    def count(self, prefix):
+        """Count the objects under a path, in time proportional to its depth.
+
+        Args:
+            prefix (str): The path
+        Returns:
+            int: The number of objects at the path or below it
+
+        """
+        node = self._node(prefix)
+        if node is None:
+            return 0
+        return node.count
+
+    def children(self, prefix='/'):
+        """Get the paths directly below a path, with their subtree counts.
+
+        Args:
+            prefix (str): The path
+        Returns:
+            dict: The number of objects under each child path, by path
+
+        """
+        node = self._node(prefix)
+        if node is None:
+            return {}
+        base = '/'.join([''] + _segments(prefix) + [''])
+        return dict(
+            (base + name + '/', child.count)
+            for name, child in node.children.items())
+
+    def repath(self, old_prefix, new_prefix):
+        """Move every object under one path to another.
+
+        The part of each object's path below old_prefix is kept, so moving
+        /team/ to /org/team/ turns /team/service/ into /org/team/service/.
+
+        Args:
+            old_prefix (str): The path to move objects from
+            new_prefix (str): The path to move them to
+        Returns:
+            []IamObject: The moved objects
+
+        Raises:
+            FrozenObjectError: If any of the objects is frozen, in which case
+                none are moved
+
+        """
+        moved = self.find(old_prefix)
+        for obj in moved:
+            if obj.is_frozen():
+                raise FrozenObjectError(
+                    "Cannot re-path frozen {}".format(type(obj).__name__))
+        old_length = len(_segments(old_prefix))
+        new_segments = _segments(new_prefix)
+        for obj in moved:
+            self.remove(obj)
+            path_segments = new_segments + _segments(obj.path)[old_length:]
+            obj.path = '/'.join([''] + path_segments + [''])
+            self.add(obj)
+        return moved
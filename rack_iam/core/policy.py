@@ -17,11 +17,65 @@
 This module is meant to work with policies, determining what permissions are
 allowed in a role. Ties in very closely with the statement module.
 """
-from rack_iam.core.helpers import generate_arn
+import json
 
+from rack_iam.core.base import IamObject, freeze_value
+from rack_iam.core.arn import iam_arn
+from rack_iam.core.pool import content_key
+from rack_iam.core.statement import Statement
 
-class PolicyDocument(object):
-    """Handles statements within policies."""
+# Statement keys which Statement objects can represent
+_STATEMENT_KEYS = frozenset([
+    'Sid', 'Effect', 'Action', 'Resource', 'Principal', 'Condition'
+])
+
+
+def _decode_statement(statement_dict):
+    """Create a Statement from its IAM policy JSON form.
+
+    Args:
+        statement_dict (dict): The decoded statement JSON
+
+    Returns:
+        Statement: The new statement
+
+    Raises:
+        ValueError: If the statement uses keys Statement can't represent,
+            such as NotAction
+
+    """
+    unsupported = set(statement_dict) - _STATEMENT_KEYS
+    if unsupported:
+        raise ValueError("Unsupported statement keys: {}".format(
+            ', '.join(sorted(unsupported))))
+    statement = Statement(statement_dict.get('Effect'),
+                          statement_dict.get('Action'),
+                          statement_dict.get('Resource'),
+                          statement_dict.get('Sid'))
+    statement.principal = statement_dict.get('Principal')
+    statement.condition = statement_dict.get('Condition')
+    return statement
+
+
+class PolicyDocument(IamObject):
+    """Handles statements within policies.
+
+    Statements are normally held in a list. A document created with
+    from_table is instead backed by a StatementTable, which is converted to
+    Statement objects the first time the statements are accessed. Documents
+    loaded with from_json or from_dict similarly keep the raw document until
+    the statements are accessed, and transform it as is until then.
+
+    Statement IDs must be unique within a document. An index of statement
+    positions by Sid backs get_statement, replace_statement and
+    remove_statement. It is kept up to date by the methods of the document,
+    and rebuilt if the statements are changed in any other way.
+    """
+
+    __slots__ = ('_statements', '_table', '_raw', '_sid_index', '_sid_indexed',
+                 'policy_id')
+
+    _fields = ('policy_id', 'statements')
 
     POLICY_VERSION = "2012-10-17"
 
@@ -34,6 +88,115 @@ class PolicyDocument(object):
         self.statements = []
         self.policy_id = policy_id
 
+    @classmethod
+    def from_table(cls, table, policy_id=None):
+        """Create a policy document backed by a StatementTable.
+
+        Args:
+            table (StatementTable): The statements of the document
+            policy_id (str): The ID of the policy
+        Returns:
+            PolicyDocument: The new policy document
+
+        """
+        document = cls(policy_id)
+        document._statements = None
+        document._table = table
+        return document
+
+    @classmethod
+    def from_dict(cls, document_dict):
+        """Create a policy document from a decoded IAM policy document.
+
+        Statements are not created until they are accessed.
+
+        Args:
+            document_dict (dict): The policy document, as decoded from JSON
+        Returns:
+            PolicyDocument: The new policy document
+
+        """
+        document = cls(document_dict.get('Id'))
+        document._statements = None
+        document._raw = (document._version, document_dict)
+        return document
+
+    @classmethod
+    def from_json(cls, document_json):
+        """Create a policy document from IAM policy document JSON.
+
+        Statements are not created until they are accessed.
+
+        Args:
+            document_json (str): The policy document JSON
+        Returns:
+            PolicyDocument: The new policy document
+
+        """
+        return cls.from_dict(json.loads(document_json))
+
+    @property
+    def statements(self):
+        """The list of Statement objects in the document."""
+        if self._table is not None:
+            self._statements = self._table.to_statements()
+            self._table = None
+            self._adopt(self._statements)
+        elif self._raw is not None:
+            raw_statements = self._raw[1].get('Statement', [])
+            if isinstance(raw_statements, dict):
+                raw_statements = [raw_statements]
+            self._statements = [
+                _decode_statement(statement) for statement in raw_statements
+            ]
+            self._raw = None
+            self._adopt(self._statements)
+        return self._statements
+
+    @statements.setter
+    def statements(self, statements):
+        """Replace the statements of the document."""
+        self._statements = statements
+        self._table = None
+        self._raw = None
+        self._sid_index = None
+
+    def get_raw(self):
+        """Get the raw document the policy document was loaded from.
+
+        Returns:
+            dict: The raw document, or None if the document wasn't loaded
+                from one, or it has been accessed or modified since
+
+        """
+        if self._raw is not None and self._raw[0] == self._version:
+            return self._raw[1]
+        return None
+
+    def get_statement_table(self):
+        """Get the StatementTable backing the document, if there is one.
+
+        Returns:
+            StatementTable: The table, or None once the statements have been
+                converted to Statement objects
+
+        """
+        return self._table
+
+    def get_version(self):
+        """Get the version of the document and its statements.
+
+        A backing StatementTable is included, though statements added to the
+        table aren't propagated to the parents of the document.
+
+        Returns:
+            int: The latest version stamp within the document
+
+        """
+        if self._table is not None:
+            return max(self._version, self._table.get_version())
+        return self._version
+
     def set_policy_id(self, policy_id):
         """Set the id of the policy.
 
@@ -46,6 +209,90 @@ class PolicyDocument(object):
         self.policy_id = policy_id
         return self
 
+    def _sid_positions(self):
+        """Get the index of statement positions by Sid.
+
+        The index is rebuilt only when the list of statements has been
+        replaced or resized since it was last brought up to date. Changes
+        within the statements, which also stamp the document's version,
+        leave it as it is. A Sid changed directly on a statement is caught
+        by the lookups, which check the statement they find.
+
+        Returns:
+            dict: The position of each statement with a Sid
+
+        Raises:
+            ValueError: If the statements have duplicate Sids
+
+        """
+        statements = self.statements
+        index = getattr(self, '_sid_index', None)
+        indexed = getattr(self, '_sid_indexed', None)
+        if (index is None or indexed[0] is not statements or
+                indexed[1] != len(statements)):
+            index = {}
+            for position, statement in enumerate(statements):
+                sid = statement.sid
+                if sid is None:
+                    continue
+                if sid in index:
+                    raise ValueError(
+                        "Duplicate Sid '{}' in policy document".format(sid))
+                index[sid] = position
+            self._sid_index = index
+            self._mark_sid_index()
+        return index
+
+    def _mark_sid_index(self):
+        """Record that the Sid index matches the current statements."""
+        self._sid_indexed = (self._statements, len(self._statements))
+
+    def _find_sid(self, sid):
+        """Get the position of the statement with a Sid.
+
+        Args:
+            sid (str): The statement ID to look for
+
+        Returns:
+            int: The position of the statement
+
+        Raises:
+            KeyError: If no statement has the Sid
+
+        """
+        position = self._sid_positions().get(sid)
+        if position is None or self.statements[position].sid != sid:
+            # A statement's Sid was changed directly on the statement, which
+            # the document can't see, so the index has to be rebuilt
+            self._sid_index = None
+            position = self._sid_positions().get(sid)
+            if position is None:
+                raise KeyError(sid)
+        return position
+
+    def _check_sid(self, sid):
+        """Ensure a Sid is not already used by a statement in the document.
+
+        Args:
+            sid (str): The statement ID about to be added
+
+        Raises:
+            ValueError: If a statement already has the Sid
+
+        """
+        if sid is None:
+            return
+        position = self._sid_positions().get(sid)
+        if position is None:
+            return
+        if self.statements[position].sid != sid:
+            # The index is stale, see _find_sid
+            self._sid_index = None
+            if sid not in self._sid_positions():
+                return
+        raise ValueError(
+            "Duplicate Sid '{}' in policy document".format(sid))
+
     def add_statement(self, statement):
         """Add a statement to a policy document.
 
@@ -54,9 +301,11 @@ class PolicyDocument(object):
         Returns:
             PolicyDocument: the class instance for function chaining
 
+        Raises:
+            ValueError: If the Sid of the statement is already in use
+
         """
-        self.statements.append(statement)
-        return self
+        return self.add_statements([statement])
 
     def add_statements(self, statements):
         """Add multiple statements to a policy document.
@@ -66,18 +315,155 @@ class PolicyDocument(object):
         Returns:
             PolicyDocument: The class instance for function chaining
 
+        Raises:
+            ValueError: If the Sid of a statement is already in use, in which
+                case none of the statements are added
+
         """
+        statements = list(statements)
+        added = set()
+        for statement in statements:
+            sid = statement.sid
+            if sid is not None:
+                if sid in added:
+                    raise ValueError(
+                        "Duplicate Sid '{}' in policy document".format(sid))
+                self._check_sid(sid)
+                added.add(sid)
+
+        index = self._sid_positions()
+        self._touch('statements')
+        position = len(self.statements)
         self.statements.extend(statements)
+        self._adopt(statements)
+        for statement in statements:
+            if statement.sid is not None:
+                index[statement.sid] = position
+            position += 1
+        self._mark_sid_index()
+        return self
+
+    def get_statement(self, sid):
+        """Get the statement with a Sid.
+
+        Args:
+            sid (str): The statement ID to look for
+
+        Returns:
+            Statement: The statement
+
+        Raises:
+            KeyError: If no statement has the Sid
+
+        """
+        return self.statements[self._find_sid(sid)]
+
+    def replace_statement(self, sid, statement):
+        """Replace the statement with a Sid, keeping its position.
+
+        Args:
+            sid (str): The statement ID of the statement to replace
+            statement (Statement): The new statement
+        Returns:
+            PolicyDocument: The class instance for function chaining
+
+        Raises:
+            KeyError: If no statement has the Sid
+            ValueError: If the new statement's Sid is used by another
+                statement
+
+        """
+        position = self._find_sid(sid)
+        if statement.sid != sid:
+            self._check_sid(statement.sid)
+
+        index = self._sid_positions()
+        self._touch('statements')
+        self.statements[position] = statement
+        self._adopt(statement)
+        del index[sid]
+        if statement.sid is not None:
+            index[statement.sid] = position
+        self._mark_sid_index()
+        return self
+
+    def remove_statement(self, sid):
+        """Remove the statement with a Sid.
+
+        Finding the statement takes constant time, though the statements
+        after it have to be shifted along.
+
+        Args:
+            sid (str): The statement ID of the statement to remove
+        Returns:
+            PolicyDocument: The class instance for function chaining
+
+        Raises:
+            KeyError: If no statement has the Sid
+
+        """
+        position = self._find_sid(sid)
+        index = self._sid_positions()
+        self._touch('statements')
+        del self.statements[position]
+        del index[sid]
+        for moved in range(position, len(self.statements)):
+            moved_sid = self.statements[moved].sid
+            if moved_sid is not None:
+                index[moved_sid] = moved
+        self._mark_sid_index()
         return self
 
+    def normalize(self):
+        """Put the document and its statements into their canonical form.
+
+        Each statement is normalized, and statements left identical to an
+        earlier one are dropped. The order of the remaining statements is
+        kept. Shared, frozen, statements which aren't canonical are replaced
+        by normalized copies. A document which is already canonical is left
+        untouched, without stamping a new version.
+
+        Returns:
+            PolicyDocument: The class instance for function chaining
+
+        Raises:
+            FrozenObjectError: If the document is frozen and not canonical
+
+        """
+        statements = []
+        seen = set()
+        changed = False
+        for statement in self.statements:
+            changes = statement._normalized_changes()
+            if changes and statement.is_frozen():
+                statement = statement.derive(**changes)
+                changed = True
+            elif changes:
+                statement.normalize()
+            # Frozen statements hold tuples where others hold lists
+            key = content_key(freeze_value(tuple(
+                getattr(statement, name) for name in Statement._fields)))
+            if key in seen:
+                changed = True
+                continue
+            seen.add(key)
+            statements.append(statement)
+        if changed:
+            self.statements = statements
+        return self
 
-class PolicyBase(object):
+
+class PolicyBase(IamObject):
     """The base class for Policy related top-level objects.
 
     The parent class for both inline policies and policy resources. This is done
     as both slightly differ in structure.
     """
 
+    __slots__ = ('name', 'policy_document')
+
+    _fields = ('name', 'policy_document')
+
     def __init__(self, name):
         """Create a PolicyBase object.
 
@@ -103,6 +489,18 @@ class PolicyBase(object):
         self.policy_document = policy_document
         return self
 
+    def edit_policy_document(self):
+        """Get the policy document for modification.
+
+        When the policy was derived from a blueprint, the document is copied
+        first so the blueprint and its other variants are unaffected.
+
+        Returns:
+            PolicyDocument: The document, which may now be modified
+
+        """
+        return self.edit('policy_document')
+
 
 class InlinePolicy(PolicyBase):
     """A class for dealing with inline policy objects.
@@ -112,6 +510,8 @@ class InlinePolicy(PolicyBase):
     a role.
     """
 
+    __slots__ = ()
+
     def __init__(self, name):
         """Initialize an InlinePolicy object."""
         super(InlinePolicy, self).__init__(name)
@@ -120,6 +520,10 @@ class InlinePolicy(PolicyBase):
 class Policy(PolicyBase):
     """A class for dealing with policy objects."""
 
+    __slots__ = ('groups', 'roles', 'users')
+
+    _fields = PolicyBase._fields + ('groups', 'roles', 'users')
+
     def __init__(self, name, groups=[], roles=[], users=[]):
         """Create a policy object.
 
@@ -149,6 +553,7 @@ class Policy(PolicyBase):
             Policy: the class instance for function chaining
 
         """
+        self._touch('users')
         self.users.update(users)
         return self
 
@@ -164,6 +569,7 @@ class Policy(PolicyBase):
             Policy: the class instance for function chaining
 
         """
+        self._touch('roles')
         self.roles.update(roles)
         return self
 
@@ -179,12 +585,17 @@ class Policy(PolicyBase):
             Policy: the class instance for function chaining
 
         """
+        self._touch('groups')
         self.groups.update(groups)
 
 
 class ManagedPolicy(Policy):
     """A class for dealing with managed policy objects."""
 
+    __slots__ = ('description',)
+
+    _fields = Policy._fields + ('description',)
+
     def __init__(self, name, desc, groups=[], roles=[], users=[]):
         """Create a managed object.
 
@@ -208,5 +619,4 @@ class ManagedPolicy(Policy):
             str: The ARN for the managed policy
 
         """
-        return generate_arn('aws', 'iam', region=region, account_id=account_id,
-                            resource='policy/{}'.format(self.name))
+        return iam_arn('policy', self.name, region, account_id)
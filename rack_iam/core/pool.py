@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM interning module.
+
+Across a large model the same action strings, ARNs and even whole statements
+are repeated many thousands of times. A StatementPool keeps a single canonical
+copy of each distinct value so that repeats share one object. This reduces
+memory and lets identity based caches, such as the policy document transform
+cache, recognise repeated content.
+
+Interned values and statements are shared between every object using them,
+so they are frozen: lists become tuples, dictionaries become FrozenDicts and
+statements can't be modified. Use derive to create a modifiable statement
+from a pooled one.
+"""
+from .base import FrozenDict
+from .helpers import string_types
+
+# The most statements or values held by the default pool before it is emptied
+DEFAULT_POOL_SIZE = 65536
+
+_LIST = object()
+_TUPLE = object()
+_DICT = object()
+_SET = object()
+
+
+def content_key(value):
+    """Build a hashable key which identifies the contents of a value.
+
+    Args:
+        value (object): A string, list, tuple, dict, set or other value
+
+    Returns:
+        object: A hashable key. Equal contents always give equal keys.
+
+    """
+    if isinstance(value, string_types):
+        return value
+    if isinstance(value, list):
+        return (_LIST,) + tuple(content_key(item) for item in value)
+    if isinstance(value, tuple):
+        return (_TUPLE,) + tuple(content_key(item) for item in value)
+    if isinstance(value, dict):
+        return (_DICT,) + tuple(sorted(
+            (name, content_key(item)) for name, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (_SET, frozenset(content_key(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        return (id(value),)
+    # The type is included so that True, 1 and 1.0 stay distinct
+    return (type(value), value)
+
+
+class StatementPool(object):
+    """A pool holding one canonical copy of strings, values and statements.
+
+    A pool with a maximum size is emptied once either its values or its
+    statements reach it, as an ArnCache is. Objects already using pooled
+    values keep them, but later repeats get new canonical copies.
+    """
+
+    def __init__(self, maxsize=None):
+        """Initialize an empty pool.
+
+        Args:
+            maxsize (int): The most statements, and the most values, to hold.
+                Defaults to no limit.
+        """
+        self.maxsize = maxsize
+        self._values = {}
+        self._statements = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        """Get the number of distinct statements held by the pool.
+
+        Returns:
+            int: The number of pooled statements
+
+        """
+        return len(self._statements)
+
+    def intern_string(self, value):
+        """Get the canonical copy of a string.
+
+        Args:
+            value (str): The string to intern
+
+        Returns:
+            str: The pooled string equal to value
+
+        """
+        return self._pooled(self._values, value, value)
+
+    def _pooled(self, entries, key, value):
+        """Get the pooled entry for a key, adding value if there isn't one.
+
+        Args:
+            entries (dict): The values or statements of the pool
+            key (object): The key of the entry
+            value (object): The entry to add if the key isn't pooled
+
+        Returns:
+            object: The pooled entry
+
+        """
+        pooled = entries.get(key)
+        if pooled is None:
+            if self.maxsize is not None and len(entries) >= self.maxsize:
+                entries.clear()
+            pooled = entries[key] = value
+        return pooled
+
+    def intern_value(self, value):
+        """Get the canonical copy of a statement value.
+
+        Strings, and lists, tuples and dicts of them (such as actions,
+        resources, principals and conditions) are pooled with their items
+        interned as well. Pooled lists are tuples and pooled dictionaries are
+        FrozenDicts. Any other value is returned unchanged.
+
+        Args:
+            value (object): The value to intern
+
+        Returns:
+            object: The pooled value equal to value
+
+        """
+        if isinstance(value, string_types):
+            return self.intern_string(value)
+        if not isinstance(value, (list, tuple, dict)):
+            return value
+
+        key = content_key(value)
+        pooled = self._values.get(key)
+        if pooled is None:
+            if isinstance(value, dict):
+                pooled = FrozenDict(
+                    (self.intern_string(name), self.intern_value(item))
+                    for name, item in value.items())
+            else:
+                pooled = tuple(self.intern_value(item) for item in value)
+            pooled = self._pooled(self._values, key, pooled)
+        return pooled
+
+    def intern_arns(self, arns):
+        """Get the canonical copy of a list of ARNs.
+
+        Useful for the managed_policy_arns of roles, users and groups, which
+        frequently repeat across principals.
+
+        Args:
+            arns ([]str): The ARNs to intern
+
+        Returns:
+            tuple: The pooled tuple equal to arns
+
+        """
+        return self.intern_value(arns)
+
+    def intern(self, statement):
+        """Get the canonical statement with the same contents.
+
+        The first statement seen with a given set of contents becomes the
+        canonical one, and has its values interned before it is frozen.
+
+        Args:
+            statement (Statement): The statement to intern
+
+        Returns:
+            Statement: The pooled, frozen, statement equal to statement
+
+        """
+        key = (
+            content_key(statement.effect), content_key(statement.action),
+            content_key(statement.resource), content_key(statement.principal),
+            content_key(statement.condition), content_key(statement.sid)
+        )
+        pooled = self._statements.get(key)
+        if pooled is not None:
+            self.hits += 1
+            return pooled
+
+        self.misses += 1
+        if statement.is_frozen():
+            statement = statement.derive()
+        statement.effect = self.intern_value(statement.effect)
+        statement.action = self.intern_value(statement.action)
+        statement.resource = self.intern_value(statement.resource)
+        statement.principal = self.intern_value(statement.principal)
+        statement.condition = self.intern_value(statement.condition)
+        statement.sid = self.intern_value(statement.sid)
+        return self._pooled(self._statements, key, statement.freeze())
+
+    def intern_document(self, document):
+        """Replace the statements of a policy document with pooled ones.
+
+        Args:
+            document (PolicyDocument): The document to intern
+        Returns:
+            PolicyDocument: The document, for function chaining
+
+        """
+        document.statements = [
+            self.intern(statement) for statement in document.statements
+        ]
+        return document
+
+    def clear(self):
+        """Remove everything from the pool and reset the counters."""
+        self._values.clear()
+        self._statements.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+default_pool = StatementPool(DEFAULT_POOL_SIZE)
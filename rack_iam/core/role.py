@@ -19,12 +19,19 @@ This is the high level role module. In most cases of integration, another object
 is possibly used (troposphere for example). This module primarily integrates
 with the policy module.
 """
-from rack_iam.core.helpers import generate_arn
+from rack_iam.core.base import IamObject
+from rack_iam.core.arn import iam_arn
 
 
-class Role(object):
+class Role(IamObject):
     """A class for dealing with IAM roles."""
 
+    __slots__ = ('name', 'path', 'assume_role_policy_document',
+                 'managed_policy_arns', 'policies')
+
+    _fields = ('name', 'path', 'assume_role_policy_document',
+               'managed_policy_arns', 'policies')
+
     def __init__(self, name, path="/"):
         """Initialize the role object with name and path.
 
@@ -52,9 +59,28 @@ class Role(object):
             Role: the class instance for function chaining
 
         """
+        self._touch('policies')
         self.policies.append(policy)
+        self._adopt(policy)
         return self
 
+    def edit_policy(self, name):
+        """Get an inline policy of the role for modification.
+
+        When the role was derived from a blueprint, the policy is copied
+        first so the blueprint and its other variants are unaffected.
+
+        Args:
+            name (str): The name of the inline policy
+        Returns:
+            InlinePolicy: The policy, which may now be modified
+
+        Raises:
+            KeyError: If the role has no policy with the name
+
+        """
+        return self._edit_item('policies', lambda policy: policy.name == name)
+
     def set_assume_policy(self, policy):
         """Set the assume role policy document to the role.
 
@@ -68,6 +94,18 @@ class Role(object):
         self.assume_role_policy_document = policy
         return self
 
+    def edit_assume_policy(self):
+        """Get the assume role policy document for modification.
+
+        When the role was derived from a blueprint, the document is copied
+        first so the blueprint and its other variants are unaffected.
+
+        Returns:
+            PolicyDocument: The document, which may now be modified
+
+        """
+        return self.edit('assume_role_policy_document')
+
     def set_managed_policy_arns(self, policy_arns):
         """Set the managed policy ARNS.
 
@@ -87,13 +125,16 @@ class Role(object):
             str: The ARN for the role
 
         """
-        return generate_arn('aws', 'iam', region=region, account_id=account_id,
-                            resource='role/{}'.format(self.name))
+        return iam_arn('role', self.name, region, account_id)
 
 
-class InstanceProfile(object):
+class InstanceProfile(IamObject):
     """Class for dealing with Instance profiles."""
 
+    __slots__ = ('name', 'rolename', 'path')
+
+    _fields = ('name', 'rolename', 'path')
+
     def __init__(self, name, rolename, path='/'):
         """Initialize the Instance Profile with name, role, and path.
 
@@ -117,5 +158,4 @@ class InstanceProfile(object):
             str: The ARN for the instance profile
 
         """
-        return generate_arn('aws', 'iam', region=region, account_id=account_id,
-                            resource='instance-profile/{}'.format(self.name))
+        return iam_arn('instance-profile', self.name, region, account_id)
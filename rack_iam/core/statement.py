@@ -18,12 +18,113 @@ The lowest level module of core and the main location where permissions are
 defined. Given this it's also the most complex module. Used by the policy
 module.
 """
-from .helpers import generate_aws_account_arn
+from .base import IamObject
+from .helpers import generate_aws_account_arn, string_types
+from .pool import content_key, default_pool
+
+
+def _lower_prefix(action):
+    """Lower case the service prefix of an action, such as S3:GetObject.
+
+    Args:
+        action (str): The action
+
+    Returns:
+        str: The action with a lower case prefix
+
+    """
+    prefix, separator, name = action.partition(':')
+    if not separator or prefix.islower():
+        return action
+    return prefix.lower() + separator + name
+
+
+def _normalize_values(value, lower_prefix=False, wildcard=False):
+    """Get the canonical form of a statement value.
+
+    Strings are sorted and deduplicated, and where it is a wildcard a "*"
+    stands in for everything else. A single value is a scalar, several are a
+    list. Values that aren't strings, such as troposphere helpers, are kept
+    after the strings in their original order. Dictionaries, as used by
+    principals and conditions, have each of their values normalized.
+
+    Args:
+        value (object): The value to normalize
+        lower_prefix (bool): Whether to lower case the service prefix of
+            each string, as IAM does for actions
+        wildcard (bool): Whether "*" matches everything, as it does in
+            actions, resources and principals. In conditions it is compared
+            literally by operators such as StringEquals.
+    Returns:
+        object: The canonical value. This is value itself when it is already
+            canonical.
+
+    """
+    if isinstance(value, dict):
+        normalized = dict(
+            (name, _normalize_values(item, wildcard=wildcard))
+            for name, item in value.items())
+        for name, item in normalized.items():
+            if item is not value[name]:
+                return normalized
+        return value
+    if isinstance(value, string_types):
+        items = (value,)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    else:
+        return value
+    if not items:
+        return value
+
+    strings = set()
+    others = []
+    for item in items:
+        if isinstance(item, string_types):
+            strings.add(_lower_prefix(item) if lower_prefix else item)
+        else:
+            others.append(item)
+    if wildcard and "*" in strings:
+        canonical = "*"
+    else:
+        canonical = sorted(strings) + others
+        if len(canonical) == 1:
+            canonical = canonical[0]
+
+    if isinstance(canonical, list):
+        if isinstance(value, (list, tuple)) and list(value) == canonical:
+            return value
+    elif canonical == value:
+        return value
+    return canonical
+
+
+def _as_list(value):
+    """Get a list of the members of a statement value.
+
+    Args:
+        value (object): A single value, a container of values, or None
+
+    Returns:
+        []object: The members, in a new list
+
+    """
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
 
 
-class Statement(object):
+class Statement(IamObject):
     """Statement class that handles basic permissions."""
 
+    __slots__ = ('effect', 'action', 'principal', 'condition', 'resource',
+                 'sid', '_members')
+
+    _fields = ('effect', 'action', 'resource', 'principal', 'condition',
+               'sid')
+
     def __init__(self, effect, action, resource=None, sid=None):
         """Initialize a statement with various permissions.
 
@@ -51,6 +152,65 @@ class Statement(object):
         self.resource = resource
         self.sid = sid
 
+    def intern(self, pool=None):
+        """Get the pooled statement with the same contents as this one.
+
+        Pooled statements are frozen, including this one if it becomes the
+        canonical statement. Use derive to modify one.
+
+        Args:
+            pool (StatementPool): The pool to use. Defaults to the shared
+                rack_iam.core.pool.default_pool
+        Returns:
+            Statement: The canonical statement, which may be this one
+
+        """
+        if pool is None:
+            pool = default_pool
+        return pool.intern(self)
+
+    def normalize(self):
+        """Put the statement into its canonical form.
+
+        Actions, resources, and the values of principals and conditions are
+        sorted and deduplicated, with a single value as a scalar and several
+        as a list. A "*" among actions, resources or principals replaces the
+        other values, while condition values are kept as they are. Action
+        service prefixes are lower cased. Statements with
+        the same meaning then have the same contents, so they hash, cache
+        and diff alike. A statement which is already canonical is left
+        untouched, without stamping a new version.
+
+        Returns:
+            Statement: The class instance for function chaining
+
+        Raises:
+            FrozenObjectError: If the statement is frozen and not canonical
+
+        """
+        for name, value in self._normalized_changes().items():
+            setattr(self, name, value)
+        return self
+
+    def _normalized_changes(self):
+        """Get the attributes which differ from their canonical form.
+
+        Returns:
+            dict: The canonical value of each attribute that isn't canonical
+
+        """
+        changes = {}
+        for name, value in (
+                ('action', _normalize_values(self.action, lower_prefix=True,
+                                             wildcard=True)),
+                ('resource', _normalize_values(self.resource, wildcard=True)),
+                ('principal', _normalize_values(self.principal,
+                                                wildcard=True)),
+                ('condition', _normalize_values(self.condition))):
+            if value is not getattr(self, name):
+                changes[name] = value
+        return changes
+
     def set_statement_id(self, sid):
         """Set the ID for the statement.
 
@@ -109,7 +269,7 @@ class Statement(object):
         # which may have parameters passed in as Join/Ref and will cause
         # ugly results when passed to format(), used by
         # generate_*_arn type functions
-        if isinstance(account_id, basestring):
+        if isinstance(account_id, string_types):
             self.set_principal("AWS", generate_aws_account_arn(
                 account_id, resource))
         else:
@@ -140,7 +300,7 @@ class Statement(object):
         principals = []
 
         for account_id, resource in account_resource_map:
-            if isinstance(account_id, basestring):
+            if isinstance(account_id, string_types):
                 principals.append(generate_aws_account_arn(
                     account_id, resource
                 ))
@@ -236,3 +396,194 @@ class Statement(object):
         """
         self.set_condition("StringEquals", {"sts:ExternalId", external_id})
         return self
+
+    # Incremental modification
+    def _owned(self, index_key, value):
+        """Check whether a container was copied by this statement.
+
+        Lists and dictionaries may be shared with other statements, such as
+        the rows of a StatementTable or statements interned in a pool, so
+        they are copied before they are first modified in place.
+
+        Args:
+            index_key (object): Identifies the container among the
+                statement's
+            value (object): The container currently held
+
+        Returns:
+            bool: True if the container belongs to this statement alone
+
+        """
+        members = getattr(self, '_members', None)
+        if members is None:
+            members = self._members = {}
+        entry = members.get(index_key)
+        return entry is not None and entry[0] is value
+
+    def _add_members(self, index_key, items, values):
+        """Append values to a list of members, skipping those already in it.
+
+        The list is copied first unless the statement already owns it. A set
+        of the members is kept alongside each list, so checking for a
+        duplicate takes constant time. The set is rebuilt if the list has
+        been resized by something else since it was built.
+
+        Args:
+            index_key (object): Identifies the list among the statement's
+            items ([]object): The list of members to append to
+            values ([]object): The values to add
+        Returns:
+            []object: The list the values were added to, which must be stored
+                in place of items
+
+        """
+        if self._owned(index_key, items):
+            entry = self._members[index_key]
+            if entry[1] != len(items):
+                entry[2] = set(content_key(item) for item in items)
+        else:
+            items = list(items)
+            entry = [items, 0, set(content_key(item) for item in items)]
+            self._members[index_key] = entry
+        seen = entry[2]
+        for value in values:
+            key = content_key(value)
+            if key not in seen:
+                seen.add(key)
+                items.append(value)
+        entry[1] = len(items)
+        return items
+
+    def _own_mapping(self, index_key, mapping):
+        """Get a copy of a dictionary the statement can modify in place.
+
+        Args:
+            index_key (object): Identifies the dictionary among the
+                statement's
+            mapping (dict): The dictionary currently held
+
+        Returns:
+            dict: The dictionary, copied unless the statement already owns it
+
+        """
+        if not self._owned(index_key, mapping):
+            mapping = dict(mapping)
+            self._members[index_key] = [mapping]
+        return mapping
+
+    def _mapping(self, name):
+        """Get a principal or condition dictionary for modification.
+
+        Args:
+            name (str): The attribute holding the dictionary
+
+        Returns:
+            dict: The dictionary, now held by the attribute
+
+        Raises:
+            ValueError: If the attribute holds something other than a
+                dictionary, such as a "*" principal
+
+        """
+        self._touch()
+        mapping = getattr(self, name)
+        if mapping is None:
+            mapping = {}
+        elif not isinstance(mapping, dict):
+            raise ValueError("Cannot add to the {} {!r}".format(name, mapping))
+        mapping = self._own_mapping(name, mapping)
+        object.__setattr__(self, name, mapping)
+        return mapping
+
+    def _add_to_attribute(self, name, values):
+        """Add values to the action or resource of the statement.
+
+        Args:
+            name (str): The attribute to add to
+            values (object): A value, or a list of values
+        """
+        self._touch()
+        items = getattr(self, name)
+        if not isinstance(items, list):
+            items = _as_list(items)
+        object.__setattr__(self, name,
+                           self._add_members(name, items, _as_list(values)))
+
+    def add_action(self, actions):
+        """Add actions to the statement, skipping any already present.
+
+        Args:
+            actions ([]str or str): The actions to add
+        Returns:
+            Statement: the class instance for function chaining
+
+        """
+        self._add_to_attribute('action', actions)
+        return self
+
+    def add_resource(self, resources):
+        """Add resources to the statement, skipping any already present.
+
+        Args:
+            resources ([]str or str): The resources to add
+        Returns:
+            Statement: the class instance for function chaining
+
+        """
+        self._add_to_attribute('resource', resources)
+        return self
+
+    def add_principal(self, name, values):
+        """Add to a principal of the statement, skipping any already present.
+
+        Unlike set_principal this keeps the existing principals, so large
+        trust policies can be built up or edited one account at a time.
+
+        Args:
+            name (str): The name of the principal, such as "AWS"
+            values ([]str or str): The principal values to add
+        Returns:
+            Statement: the class instance for function chaining
+
+        Raises:
+            ValueError: If the principal isn't a dictionary, such as "*"
+
+        """
+        principal = self._mapping('principal')
+        items = principal.get(name)
+        if not isinstance(items, list):
+            items = _as_list(items)
+        principal[name] = self._add_members(('principal', name), items,
+                                            _as_list(values))
+        return self
+
+    def add_condition(self, operator, key, values):
+        """Add to a condition of the statement, skipping values present.
+
+        Unlike set_condition this keeps the existing conditions.
+
+        Args:
+            operator (str): The condition operator, such as "StringEquals"
+            key (str): The condition key, such as "aws:SourceVpc"
+            values ([]str or str): The values to add
+        Returns:
+            Statement: the class instance for function chaining
+
+        Raises:
+            ValueError: If the condition isn't a dictionary
+
+        """
+        condition = self._mapping('condition')
+        block = condition.get(operator)
+        if block is None:
+            block = {}
+        elif not isinstance(block, dict):
+            raise ValueError("Cannot add to the condition {!r}".format(block))
+        block = condition[operator] = self._own_mapping(
+            ('condition', operator), block)
+        items = block.get(key)
+        if not isinstance(items, list):
+            items = _as_list(items)
+        block[key] = self._add_members(('condition', operator, key), items,
+                                       _as_list(values))
+        return self
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM statement table module.
+
+A columnar store for very large sets of statements. Rather than one Statement
+object per statement, each of effect, action, resource, principal, condition
+and sid is held as an array of integer ids into a table of distinct values.
+Repeated values are stored once, and filtering works on the distinct values
+and the integer columns instead of on objects.
+
+A StatementTable can back a PolicyDocument, see PolicyDocument.from_table.
+Statements are only created from it when they are asked for.
+"""
+from array import array
+
+from .helpers import next_version
+from .pool import content_key
+from .statement import Statement
+
+COLUMNS = ('effect', 'action', 'resource', 'principal', 'condition', 'sid')
+
+
+def _matches(value, criterion):
+    """Check whether a stored value satisfies a filter criterion.
+
+    A value matches when it equals the criterion, or when it is a list or
+    dictionary (such as a principal) which holds the criterion.
+
+    Args:
+        value (object): The stored value
+        criterion (object): The value being filtered for
+
+    Returns:
+        bool: Whether the value matches
+
+    """
+    if value == criterion:
+        return True
+    if isinstance(value, (list, tuple)):
+        return criterion in value
+    if isinstance(value, dict):
+        for item in value.values():
+            if _matches(item, criterion):
+                return True
+    return False
+
+
+class StatementTable(object):
+    """Columnar, struct of arrays, storage for statements."""
+
+    __slots__ = ('_values', '_ids', '_columns', '_version')
+
+    def __init__(self, values=None):
+        """Initialize an empty statement table.
+
+        Args:
+            values (StatementTable): A table to share the value table with.
+                Used so that tables taken from one another encode values
+                identically.
+        """
+        if values is None:
+            # Id 0 is always None, for columns which are unset
+            self._values = [None]
+            self._ids = {content_key(None): 0}
+        else:
+            self._values = values._values
+            self._ids = values._ids
+        self._columns = dict((name, array('l')) for name in COLUMNS)
+        self._version = next_version()
+
+    @classmethod
+    def from_columns(cls, effect, action, resource=None, principal=None,
+                     condition=None, sid=None):
+        """Create a table from whole columns of values.
+
+        Args:
+            effect ([]str): The effect of each statement
+            action ([]object): The action of each statement
+            resource ([]object): The resource of each statement
+            principal ([]dict): The principal of each statement
+            condition ([]dict): The condition of each statement
+            sid ([]str): The statement ID of each statement
+        Returns:
+            StatementTable: The new table
+
+        Raises:
+            ValueError: If the columns differ in length
+
+        """
+        table = cls()
+        rows = len(effect)
+        given = (effect, action, resource, principal, condition, sid)
+        for name, column in zip(COLUMNS, given):
+            if column is None:
+                column = [None] * rows
+            elif len(column) != rows:
+                raise ValueError(
+                    "Column {} has {} rows, expected {}".format(
+                        name, len(column), rows))
+            if name == 'action':
+                column = ["*" if value == ["*"] else value
+                          for value in column]
+            table._columns[name].extend(table._encode(value)
+                                        for value in column)
+        table._version = next_version()
+        return table
+
+    @classmethod
+    def from_statements(cls, statements):
+        """Create a table from Statement objects.
+
+        Args:
+            statements ([]Statement): The statements to store
+        Returns:
+            StatementTable: The new table
+
+        """
+        return cls().extend(statements)
+
+    def _encode(self, value):
+        """Get the id of a value, adding it to the value table if needed.
+
+        Args:
+            value (object): The value to encode
+
+        Returns:
+            int: The id of the value
+
+        """
+        key = content_key(value)
+        value_id = self._ids.get(key)
+        if value_id is None:
+            value_id = self._ids[key] = len(self._values)
+            self._values.append(value)
+        return value_id
+
+    def __len__(self):
+        """Get the number of statements in the table.
+
+        Returns:
+            int: The number of statements
+
+        """
+        return len(self._columns['effect'])
+
+    def __getitem__(self, row):
+        """Get a statement from the table.
+
+        Args:
+            row (int): The row of the statement
+
+        Returns:
+            Statement: A new Statement object for the row
+
+        """
+        effect, action, resource, principal, condition, sid = \
+            self.get_row(row)
+        statement = Statement(effect, action, resource, sid)
+        statement.principal = principal
+        statement.condition = condition
+        return statement
+
+    def __iter__(self):
+        """Iterate over the table as Statement objects.
+
+        Returns:
+            iterator: Statement objects for each row
+
+        """
+        return (self[row] for row in range(len(self)))
+
+    def get_version(self):
+        """Get the mutation version of the table.
+
+        Returns:
+            int: A version stamp which changes whenever statements are added
+
+        """
+        return self._version
+
+    def append(self, statement):
+        """Add a Statement to the table.
+
+        Args:
+            statement (Statement): The statement to add
+        Returns:
+            StatementTable: The class instance for function chaining
+
+        """
+        for name in COLUMNS:
+            self._columns[name].append(
+                self._encode(getattr(statement, name)))
+        self._version = next_version()
+        return self
+
+    def extend(self, statements):
+        """Add multiple Statements to the table.
+
+        Args:
+            statements ([]Statement): The statements to add
+        Returns:
+            StatementTable: The class instance for function chaining
+
+        """
+        for statement in statements:
+            self.append(statement)
+        return self
+
+    def get_row(self, row):
+        """Get the decoded values of a row.
+
+        Args:
+            row (int): The row to decode
+
+        Returns:
+            tuple: The effect, action, resource, principal, condition and sid
+
+        """
+        values = self._values
+        return tuple(values[self._columns[name][row]] for name in COLUMNS)
+
+    def iter_rows(self):
+        """Iterate over the decoded values of every row.
+
+        Yields:
+            tuple: The effect, action, resource, principal, condition and sid
+
+        """
+        values = self._values
+        columns = [self._columns[name] for name in COLUMNS]
+        for ids in zip(*columns):
+            yield tuple(values[value_id] for value_id in ids)
+
+    def column(self, name):
+        """Get the decoded values of a whole column.
+
+        Args:
+            name (str): One of effect, action, resource, principal, condition
+                or sid
+
+        Returns:
+            []object: The value of the column for each row
+
+        """
+        values = self._values
+        return [values[value_id] for value_id in self._columns[name]]
+
+    def select(self, effect=None, action=None, resource=None, principal=None,
+               sid=None):
+        """Find the rows matching all of the given criteria.
+
+        Each criterion is first checked against the distinct values of the
+        table, then the rows are found by comparing integer ids in the
+        columns. A criterion matches a value equal to it, or a list or
+        principal holding it, so action="s3:GetObject" matches statements
+        granting ["s3:GetObject", "s3:PutObject"].
+
+        Args:
+            effect (str): The effect to match
+            action (str): An action to match
+            resource (str): A resource to match
+            principal (str): A principal value to match, such as an ARN or
+                service name
+            sid (str): The statement ID to match
+        Returns:
+            []int: The matching rows, in table order
+
+        """
+        rows = None
+        criteria = (('effect', effect), ('action', action),
+                    ('resource', resource), ('principal', principal),
+                    ('sid', sid))
+        for name, criterion in criteria:
+            if criterion is None:
+                continue
+            ids = set(value_id for value_id, value in enumerate(self._values)
+                      if _matches(value, criterion))
+            column = self._columns[name]
+            if rows is None:
+                rows = [row for row, value_id in enumerate(column)
+                        if value_id in ids]
+            else:
+                rows = [row for row in rows if column[row] in ids]
+        if rows is None:
+            return list(range(len(self)))
+        return rows
+
+    def take(self, rows):
+        """Create a new table holding only some rows of this one.
+
+        The new table shares this table's value table.
+
+        Args:
+            rows ([]int): The rows to keep
+        Returns:
+            StatementTable: The new table
+
+        """
+        table = StatementTable(self)
+        for name in COLUMNS:
+            column = self._columns[name]
+            table._columns[name].extend(column[row] for row in rows)
+        return table
+
+    def filter(self, **criteria):
+        """Create a new table holding the rows matching some criteria.
+
+        Args:
+            criteria: The criteria, as accepted by select
+        Returns:
+            StatementTable: The new table
+
+        """
+        return self.take(self.select(**criteria))
+
+    def to_statements(self):
+        """Convert the whole table to Statement objects.
+
+        Returns:
+            []Statement: A new Statement object for each row
+
+        """
+        return list(self)
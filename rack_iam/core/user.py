@@ -16,12 +16,19 @@
 
 This module is used to handle IAM users.
 """
-from rack_iam.core.helpers import generate_arn
+from rack_iam.core.base import IamObject
+from rack_iam.core.arn import iam_arn
 
 
-class User(object):
+class User(IamObject):
     """A class for dealing with IAM users."""
 
+    __slots__ = ('groups', 'path', 'username', 'managed_policy_arns',
+                 'login_profile', 'policies', '_membership')
+
+    _fields = ('username', 'path', 'groups', 'managed_policy_arns',
+               'login_profile', 'policies')
+
     def __init__(self, username, groups=[], path='/'):
         """Create a user object.
 
@@ -80,10 +87,35 @@ class User(object):
         Returns:
             User: the class instance for function chaining
 
+        Raises:
+            FrozenObjectError: If the user is frozen, even when it is
+                registered with a MembershipIndex
+
         """
+        self._check_frozen()
+        membership = getattr(self, '_membership', None)
+        if membership is not None:
+            membership.add(self.username, group_name)
+            return self
+        self._touch('groups')
         self.groups.add(group_name)
         return self
 
+    def get_groups(self):
+        """Get the groups the user is in.
+
+        When the user is registered with a MembershipIndex the groups come
+        from the index, otherwise from the user's own groups set.
+
+        Returns:
+            set: The names of the groups
+
+        """
+        membership = getattr(self, '_membership', None)
+        if membership is not None:
+            return membership.groups_of(self.username)
+        return self.groups
+
     def add_policy(self, policy):
         """Add a policy to the user.
 
@@ -93,9 +125,28 @@ class User(object):
             User: the class instance for function chaining
 
         """
+        self._touch('policies')
         self.policies.append(policy)
+        self._adopt(policy)
         return self
 
+    def edit_policy(self, name):
+        """Get an inline policy of the user for modification.
+
+        When the user was derived from a blueprint, the policy is copied
+        first so the blueprint and its other variants are unaffected.
+
+        Args:
+            name (str): The name of the inline policy
+        Returns:
+            InlinePolicy: The policy, which may now be modified
+
+        Raises:
+            KeyError: If the user has no policy with the name
+
+        """
+        return self._edit_item('policies', lambda policy: policy.name == name)
+
     def get_arn(self, region='', account_id=''):
         """Generate an ARN for the User resource.
 
@@ -103,5 +154,4 @@ class User(object):
             str: The ARN for the user
 
         """
-        return generate_arn('aws', 'iam', region=region, account_id=account_id,
-                            resource='user/{}'.format(self.username))
+        return iam_arn('user', self.username, region, account_id)
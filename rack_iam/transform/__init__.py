@@ -20,4 +20,8 @@ various permissions related AWS formats. Plans are for the ability to export:
 * CloudFormation style dictionary objects
 * S3 bucket policy JSON
 * IAM policy JSON
+
+The ir submodule compiles a model once, so that it can be rendered in several
+of these formats without walking the objects again. The troposphere_adapter
+submodule builds troposphere resources directly from Rack IAM objects.
 """
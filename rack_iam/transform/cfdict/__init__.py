@@ -18,26 +18,95 @@ This module is used in the transformation of various Rack IAM objects to
 a python dictionary which is formatted to the structure of the respective
 CloudFormation object.
 
+The reader submodule does the reverse, reading CloudFormation templates back
+into Rack IAM objects.
+
+The transforms are loaded lazily, the first time they are used.
 """
-from .policy import (
-    transform_inline_policy,
-    transform_policy,
-    transform_policy_document,
-    transform_managed_policy,
-)
-from .user import transform_user
-from .group import transform_group, transform_group_users
-from .role import transform_role
-from .statement import transform_statement
+from rack_iam.core.helpers import lazy_attributes
+
+_ATTRIBUTES = {
+    'transform_inline_policy': 'rack_iam.transform.cfdict.policy',
+    'transform_policy': 'rack_iam.transform.cfdict.policy',
+    'transform_policy_document': 'rack_iam.transform.cfdict.policy',
+    'transform_managed_policy': 'rack_iam.transform.cfdict.policy',
+    'transform_user': 'rack_iam.transform.cfdict.user',
+    'transform_group': 'rack_iam.transform.cfdict.group',
+    'transform_group_users': 'rack_iam.transform.cfdict.group',
+    'transform_role': 'rack_iam.transform.cfdict.role',
+    'transform_instance_profile': 'rack_iam.transform.cfdict.role',
+    'transform_template': 'rack_iam.transform.cfdict.template',
+    'iter_template_resources': 'rack_iam.transform.cfdict.template',
+    'transform_model': 'rack_iam.transform.cfdict.template',
+    'iter_model_resources': 'rack_iam.transform.cfdict.template',
+    'TransformCache': 'rack_iam.transform.cfdict.cache',
+    'PolicyDocumentCache': 'rack_iam.transform.cfdict.cache',
+    'enable_policy_document_cache': 'rack_iam.transform.cfdict.cache',
+    'disable_policy_document_cache': 'rack_iam.transform.cfdict.cache',
+    'get_policy_document_cache': 'rack_iam.transform.cfdict.cache',
+    'enable_resource_cache': 'rack_iam.transform.cfdict.cache',
+    'disable_resource_cache': 'rack_iam.transform.cfdict.cache',
+    'get_resource_cache': 'rack_iam.transform.cfdict.cache',
+    'iter_template_json': 'rack_iam.transform.cfdict.stream',
+    'iter_template_yaml': 'rack_iam.transform.cfdict.stream',
+    'write_template_json': 'rack_iam.transform.cfdict.stream',
+    'write_template_yaml': 'rack_iam.transform.cfdict.stream',
+    'transform_statement': 'rack_iam.transform.cfdict.statement',
+    'transform': 'rack_iam.transform.cfdict.dispatch',
+    'register_transform': 'rack_iam.transform.cfdict.dispatch',
+    'get_transform': 'rack_iam.transform.cfdict.dispatch',
+    'encode_json': 'rack_iam.transform.cfdict.encoder',
+    'encode_json_bytes': 'rack_iam.transform.cfdict.encoder',
+    'set_json_backend': 'rack_iam.transform.cfdict.encoder',
+    'get_json_backend': 'rack_iam.transform.cfdict.encoder',
+    'transform_statement_table': 'rack_iam.transform.cfdict.statement',
+    'read_template': 'rack_iam.transform.cfdict.reader',
+    'read_template_objects': 'rack_iam.transform.cfdict.reader',
+    'read_template_resources': 'rack_iam.transform.cfdict.reader',
+    'read_resource': 'rack_iam.transform.cfdict.reader',
+    'open_template': 'rack_iam.transform.cfdict.reader',
+}
 
 __all__ = [
     'transform_role',
     'transform_statement',
+    'transform_statement_table',
     'transform_policy_document',
     'transform_policy',
     'transform_inline_policy',
     'transform_managed_policy',
     'transform_user',
     'transform_group',
-    'transform_group_users'
+    'transform_group_users',
+    'transform_instance_profile',
+    'transform_template',
+    'iter_template_resources',
+    'transform_model',
+    'iter_model_resources',
+    'iter_template_json',
+    'iter_template_yaml',
+    'write_template_json',
+    'write_template_yaml',
+    'TransformCache',
+    'PolicyDocumentCache',
+    'enable_policy_document_cache',
+    'disable_policy_document_cache',
+    'get_policy_document_cache',
+    'enable_resource_cache',
+    'disable_resource_cache',
+    'get_resource_cache',
+    'encode_json',
+    'encode_json_bytes',
+    'set_json_backend',
+    'get_json_backend',
+    'transform',
+    'register_transform',
+    'get_transform',
+    'read_template',
+    'read_template_objects',
+    'read_template_resources',
+    'read_resource',
+    'open_template'
 ]
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
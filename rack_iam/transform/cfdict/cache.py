@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Memoization of transforms.
+
+A single PolicyDocument, such as a common trust policy, is often attached to
+hundreds of roles. With the policy document cache enabled it is rendered once
+and the result is shared by every resource which references it.
+
+The resource cache does the same for whole resources. A template is usually
+re-rendered after a small change to the model, and with the resource cache
+enabled only the resources whose subtree changed are rendered again, while
+the output for the rest is reused.
+
+Entries are keyed on the identity of the object and validated against its
+version, which changes whenever anything within the object is modified
+through attribute assignment or the object's methods.
+
+Both caches are opt-in, see `enable_policy_document_cache` and
+`enable_resource_cache`. The dictionaries and lists of a cached result are
+copied for every caller, so a caller modifying its result can't change what
+the cache, or another caller, holds.
+"""
+from collections import OrderedDict
+import threading
+
+_active_cache = None
+_resource_cache = None
+
+
+def copy_rendered(value):
+    """Copy the dictionaries and lists of a rendered structure.
+
+    Strings, numbers and anything else the structure holds, such as
+    troposphere helpers, are immutable or never modified by the transforms,
+    and are shared with the original.
+
+    Args:
+        value (object): The rendered structure
+
+    Returns:
+        object: The copy
+
+    """
+    if isinstance(value, dict):
+        return dict((name, copy_rendered(item))
+                    for name, item in value.items())
+    if isinstance(value, list):
+        return [copy_rendered(item) for item in value]
+    return value
+
+
+class TransformCache(object):
+    """A bounded, least recently used cache of transformed objects."""
+
+    def __init__(self, maxsize=1024):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize (int): The most objects to keep before the least
+                recently used one is evicted
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Get the number of cached objects.
+
+        Returns:
+            int: The number of cached objects
+
+        """
+        return len(self._entries)
+
+    def lookup(self, obj, render):
+        """Get the transformed form of an object, rendering it on a miss.
+
+        Args:
+            obj (IamObject): The object to look up
+            render (function): Called with the object to render it when no
+                up to date entry exists. Entries for different render
+                functions are kept separately.
+
+        Returns:
+            dict: A copy of the rendered dictionary
+
+        """
+        key = (id(obj), render)
+        version = obj.get_version()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None and entry[1] == version:
+                # Re-inserting marks the entry as most recently used. The
+                # entry holds a reference to the object, so the id can't be
+                # reused by another object while the entry exists.
+                self._entries[key] = entry
+                self.hits += 1
+                return copy_rendered(entry[2])
+            self.misses += 1
+
+        rendered = render(obj)
+        with self._lock:
+            self._entries[key] = (obj, version, rendered)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return copy_rendered(rendered)
+
+    def clear(self):
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+PolicyDocumentCache = TransformCache
+
+
+def enable_policy_document_cache(maxsize=1024):
+    """Turn on memoization for transform_policy_document.
+
+    Any previously enabled cache is replaced.
+
+    Args:
+        maxsize (int): The most documents to keep cached
+
+    Returns:
+        TransformCache: The newly active cache, for inspecting counters
+
+    """
+    global _active_cache
+    _active_cache = TransformCache(maxsize)
+    return _active_cache
+
+
+def disable_policy_document_cache():
+    """Turn off memoization for transform_policy_document."""
+    global _active_cache
+    _active_cache = None
+
+
+def get_policy_document_cache():
+    """Get the active policy document cache.
+
+    Returns:
+        TransformCache: The active cache, or None when caching is off
+
+    """
+    return _active_cache
+
+
+def enable_resource_cache(maxsize=65536):
+    """Turn on memoization for resource transforms.
+
+    Any previously enabled cache is replaced.
+
+    Args:
+        maxsize (int): The most resources to keep cached
+
+    Returns:
+        TransformCache: The newly active cache, for inspecting counters
+
+    """
+    global _resource_cache
+    _resource_cache = TransformCache(maxsize)
+    return _resource_cache
+
+
+def disable_resource_cache():
+    """Turn off memoization for resource transforms."""
+    global _resource_cache
+    _resource_cache = None
+
+
+def get_resource_cache():
+    """Get the active resource cache.
+
+    Returns:
+        TransformCache: The active cache, or None when caching is off
+
+    """
+    return _resource_cache
+
+
+def cached_resource(obj, render):
+    """Render a resource, reusing the cached output when it is up to date.
+
+    Args:
+        obj (IamObject): The object to render
+        render (function): The function rendering the resource body
+
+    Returns:
+        dict: The CloudFormation resource
+
+    """
+    resource_cache = _resource_cache
+    if resource_cache is None:
+        return render(obj)
+    return resource_cache.lookup(obj, render)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Transformation of any Rack IAM object through a type registry.
+
+`transform` picks the transform for an object by its type, so callers don't
+need to know which of the per type functions to use. The transform for a
+type is found by walking its MRO the first time the type is seen, and is
+then a single dictionary lookup. Transforms for new types, such as
+subclasses of the core classes, are added with `register_transform`.
+"""
+from rack_iam.core.group import Group
+from rack_iam.core.policy import (InlinePolicy, ManagedPolicy, Policy,
+                                  PolicyDocument)
+from rack_iam.core.role import InstanceProfile, Role
+from rack_iam.core.statement import Statement
+from rack_iam.core.table import StatementTable
+from rack_iam.core.user import User
+
+from .group import transform_group
+from .policy import (transform_inline_policy, transform_managed_policy,
+                     transform_policy, transform_policy_document)
+from .role import transform_instance_profile, transform_role
+from .statement import transform_statement, transform_statement_table
+from .user import transform_user
+
+# Transforms registered for each type
+_registry = {}
+
+# The transform resolved for each type seen, including unregistered
+# subclasses of registered types
+_dispatch = {}
+
+
+def register_transform(cls, func=None):
+    """Register the transform for a type and its subclasses.
+
+    Can be used as a decorator, as in `@register_transform(MyRole)`.
+
+    Args:
+        cls (type): The type the transform handles
+        func (function): Called with an object of the type, returning its
+            CloudFormation structured dictionary
+    Returns:
+        function: The transform, or a decorator registering it when func
+            isn't given
+
+    """
+    if func is None:
+        return lambda decorated: register_transform(cls, decorated)
+    _registry[cls] = func
+    # Registering can change the transform resolved for any subclass
+    _dispatch.clear()
+    return func
+
+
+def get_transform(cls):
+    """Get the transform for a type.
+
+    Args:
+        cls (type): The type of the objects to transform
+    Returns:
+        function: The transform registered for the type or, failing that,
+            for its nearest base class
+
+    Raises:
+        TypeError: If no transform handles the type
+
+    """
+    try:
+        return _dispatch[cls]
+    except KeyError:
+        pass
+    for klass in cls.__mro__:
+        func = _registry.get(klass)
+        if func is not None:
+            _dispatch[cls] = func
+            return func
+    raise TypeError("No transform registered for {}".format(cls.__name__))
+
+
+def transform(obj):
+    """Transform any Rack IAM object to a CF structured python dictionary.
+
+    Roles, users, groups, policies and instance profiles produce a
+    dictionary keyed by logical ID, as their own transforms do. Statements,
+    tables and documents produce their unkeyed forms.
+
+    Args:
+        obj (object): The object to transform
+    Returns:
+        object: The CloudFormation structured output for the object
+
+    Raises:
+        TypeError: If no transform handles the type of the object
+
+    """
+    return get_transform(type(obj))(obj)
+
+
+for _cls, _func in (
+        (Role, transform_role),
+        (InstanceProfile, transform_instance_profile),
+        (User, transform_user),
+        (Group, transform_group),
+        (InlinePolicy, transform_inline_policy),
+        (Policy, transform_policy),
+        (ManagedPolicy, transform_managed_policy),
+        (PolicyDocument, transform_policy_document),
+        (Statement, transform_statement),
+        (StatementTable, transform_statement_table)):
+    register_transform(_cls, _func)
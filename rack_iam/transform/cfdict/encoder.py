@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Canonical JSON encoding of cfdict output.
+
+The transforms leave sets, tuples and troposphere helpers in their output.
+The encoder here turns them into JSON with sets sorted and dictionary keys in
+sorted order, so the same model always encodes to the same bytes, which
+content hashes and caches can depend on.
+
+orjson is used when it is installed, falling back to the json module
+otherwise. Both backends produce identical output for the strings, integers,
+booleans and nulls making up IAM templates. Floats in exponent form are the
+exception, as the backends spell the exponent differently.
+"""
+import json
+
+from rack_iam.core.helpers import string_types
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The names of the available backends, in order of preference
+BACKENDS = ('orjson', 'json') if orjson is not None else ('json',)
+
+_backend = BACKENDS[0]
+
+
+def set_json_backend(name=None):
+    """Choose the backend used to encode JSON.
+
+    Args:
+        name (str): orjson or json. None picks the fastest available.
+
+    Raises:
+        ValueError: If the backend isn't available
+
+    """
+    global _backend
+    if name is None:
+        name = BACKENDS[0]
+    if name not in BACKENDS:
+        raise ValueError("JSON backend '{}' is not available".format(name))
+    _backend = name
+
+
+def get_json_backend():
+    """Get the name of the backend used to encode JSON.
+
+    Returns:
+        str: orjson or json
+
+    """
+    return _backend
+
+
+def sorted_set(value):
+    """Sort the members of a set for output.
+
+    Sets of strings sort by value. Sets mixing types, such as strings and
+    troposphere helpers, sort by the encoded form of each member.
+
+    Args:
+        value (set): The set
+
+    Returns:
+        list: The sorted members
+
+    """
+    for item in value:
+        if not isinstance(item, string_types):
+            return sorted(value, key=encode_json)
+    return sorted(value)
+
+
+def _default(value):
+    """Encode values the backends don't natively support.
+
+    Args:
+        value (object): The value the backend failed to encode
+
+    Returns:
+        object: A JSON serializable replacement for value
+
+    Raises:
+        TypeError: If the value has no known representation
+
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted_set(value)
+    if isinstance(value, tuple):
+        return list(value)
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    raise TypeError("{!r} is not JSON serializable".format(value))
+
+
+def _encode_json(value, indent):
+    """Encode a value with the json module.
+
+    Args:
+        value (object): The value to encode
+        indent (int): The indentation, or None for compact output
+
+    Returns:
+        str: The JSON text
+
+    """
+    if indent is None:
+        separators = (',', ':')
+    else:
+        separators = (',', ': ')
+    return json.dumps(value, default=_default, sort_keys=True, indent=indent,
+                      separators=separators, ensure_ascii=False)
+
+
+def encode_json(value, indent=None):
+    """Encode cfdict output as canonical JSON text.
+
+    Args:
+        value (object): The value, such as a resource dictionary or a whole
+            template
+        indent (int): Indentation for pretty printed output. None emits the
+            most compact form.
+    Returns:
+        str: The JSON text
+
+    Raises:
+        TypeError: If the value holds something without a JSON form
+
+    """
+    if _backend == 'orjson' and indent in (None, 2):
+        option = orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=_default,
+                                option=option).decode('utf-8')
+        except TypeError:
+            # Such as integers too large for orjson, or non string keys
+            pass
+    return _encode_json(value, indent)
+
+
+def encode_json_bytes(value, indent=None):
+    """Encode cfdict output as canonical UTF-8 JSON bytes.
+
+    Args:
+        value (object): The value to encode
+        indent (int): Indentation for pretty printed output
+    Returns:
+        bytes: The UTF-8 encoded JSON
+
+    """
+    if _backend == 'orjson' and indent is None:
+        try:
+            return orjson.dumps(value, default=_default,
+                                option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    text = encode_json(value, indent)
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    return text
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Transformation of group related objects."""
+from .cache import cached_resource
 from .policy import transform_inline_policy
 
 
@@ -27,31 +28,73 @@ def transform_group(group_obj):
         dict: The CloudFormation structured dictionary
 
     """
-    group_dictionary = {
-        group_obj.groupname: {
-            "Type": "AWS::IAM::Group"
-        }
+    return {
+        group_obj.get_logical_id(group_obj.groupname):
+            transform_group_resource(group_obj)
     }
 
+
+def transform_group_resource(group_obj):
+    """Transform a Group object to an unkeyed CF resource dictionary.
+
+    Args:
+        group_obj (Group): The Rack IAM Group object to convert
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(group_obj, _render_group_resource)
+
+
+def _render_group_resource(group_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        group_obj (Group): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return group_resource_dict(
+        group_obj.groupname, group_obj.path, group_obj.managed_policy_arns,
+        group_obj.get_users(),
+        [transform_inline_policy(policy) for policy in group_obj.policies])
+
+
+def group_resource_dict(groupname, path, managed_policy_arns, users,
+                        policies):
+    """Build an AWS::IAM::Group resource.
+
+    Args:
+        groupname (str): The name of the group
+        path (str): The path of the group
+        managed_policy_arns ([]str): The managed policy ARNs
+        users ([]str): The names of the users in the group, only listed
+            alongside inline policies
+        policies ([]dict): The rendered inline policies
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
     group_properties = {
-        "Path": group_obj.path,
-        "GroupName": group_obj.groupname
+        "Path": path,
+        "GroupName": groupname
     }
 
-    if len(group_obj.managed_policy_arns) > 0:
-        group_properties["ManagedPolicyArns"] = group_obj.managed_policy_arns
-
-    if len(group_obj.policies) > 0:
-        group_properties["Users"] = group_obj.users
+    if len(managed_policy_arns) > 0:
+        group_properties["ManagedPolicyArns"] = managed_policy_arns
 
-    if len(group_obj.policies) > 0:
-        group_properties["Policies"] = [
-            transform_inline_policy(policy)
-            for policy in group_obj.policies
-        ]
+    if len(policies) > 0:
+        group_properties["Users"] = users
+        group_properties["Policies"] = policies
 
-    group_dictionary[group_obj.groupname]["Properties"] = group_properties
-    return group_dictionary
+    return {
+        "Type": "AWS::IAM::Group",
+        "Properties": group_properties
+    }
 
 
 def transform_group_users(group_obj):
@@ -65,11 +108,71 @@ def transform_group_users(group_obj):
 
     """
     return {
-        '{}UserAssociation'.format(group_obj.groupname): {
-            "Type": "AWS::IAM::UserToGroupAddition",
-            "Properties": {
-                "GroupName": group_obj.groupname,
-                "Users": group_obj.users
-            }
+        group_users_logical_id(group_obj):
+            transform_group_users_resource(group_obj)
+    }
+
+
+def group_users_logical_id(group_obj):
+    """Generate the logical ID used for a group's UserToGroupAddition.
+
+    A logical ID set on the group for the UserToGroupAddition resource type
+    takes precedence.
+
+    Args:
+        group_obj (Group): The Rack IAM Group the association is for
+
+    Returns:
+        str: The logical ID of the association resource
+
+    """
+    return group_obj.get_logical_id(
+        '{}UserAssociation'.format(group_obj.groupname),
+        'AWS::IAM::UserToGroupAddition')
+
+
+def transform_group_users_resource(group_obj):
+    """Transform a Group object's users into an unkeyed UserToGroupAddition.
+
+    Args:
+        group_obj (Group): The Rack IAM Group to get the users for association
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(group_obj, _render_group_users_resource)
+
+
+def _render_group_users_resource(group_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        group_obj (Group): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return group_users_resource_dict(group_obj.groupname,
+                                     group_obj.get_users())
+
+
+def group_users_resource_dict(groupname, users):
+    """Build an AWS::IAM::UserToGroupAddition resource.
+
+    Args:
+        groupname (str): The name of the group
+        users ([]str): The names of the users to add to it
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return {
+        "Type": "AWS::IAM::UserToGroupAddition",
+        "Properties": {
+            "GroupName": groupname,
+            "Users": users
         }
     }
@@ -13,7 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Transformation of policy related objects."""
-from .statement import transform_statement
+from .cache import cached_resource, copy_rendered, get_policy_document_cache
+from .statement import transform_statement, transform_statement_table
 
 
 def transform_policy_properties(policy_obj):
@@ -27,24 +28,41 @@ def transform_policy_properties(policy_obj):
         dict: The CloudFormation structured properties
 
     """
-    policy_properties = {}
-
+    document = None
     if policy_obj.policy_document:
-        policy_properties["PolicyDocument"] = \
-            transform_policy_document(
-                policy_obj.policy_document
-            )
+        document = transform_policy_document(policy_obj.policy_document)
+    return policy_properties(document, policy_obj.groups, policy_obj.users,
+                             policy_obj.roles)
+
 
-    if len(policy_obj.groups) > 0:
-        policy_properties["Groups"] = policy_obj.groups
+def policy_properties(document, groups, users, roles):
+    """Build the properties shared by ManagedPolicy and Policy resources.
 
-    if len(policy_obj.users) > 0:
-        policy_properties["Users"] = policy_obj.users
+    Args:
+        document (dict): The rendered policy document, or None
+        groups ([]str): The names of the groups the policy is attached to
+        users ([]str): The names of the users the policy is attached to
+        roles ([]str): The names of the roles the policy is attached to
 
-    if len(policy_obj.roles) > 0:
-        policy_properties["Roles"] = policy_obj.roles
+    Returns:
+        dict: The CloudFormation structured properties
+
+    """
+    properties = {}
 
-    return policy_properties
+    if document is not None:
+        properties["PolicyDocument"] = document
+
+    if len(groups) > 0:
+        properties["Groups"] = groups
+
+    if len(users) > 0:
+        properties["Users"] = users
+
+    if len(roles) > 0:
+        properties["Roles"] = roles
+
+    return properties
 
 
 def transform_policy(policy_obj):
@@ -58,16 +76,55 @@ def transform_policy(policy_obj):
         dict: The CloudFormation structured python dictionary
 
     """
-    policy_properties = transform_policy_properties(policy_obj)
-    policy_properties["PolicyName"] = policy_obj.name
-    policy_dict = {
-        policy_obj.name: {
-            "Type": "AWS::IAM::Policy",
-            "Properties": policy_properties
-        }
+    return {
+        policy_obj.get_logical_id(policy_obj.name):
+            transform_policy_resource(policy_obj)
     }
 
-    return policy_dict
+
+def transform_policy_resource(policy_obj):
+    """Transform a Policy object to an unkeyed CF resource dictionary.
+
+    Args:
+        policy_obj (Policy): The Rack IAM Policy object to convert
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(policy_obj, _render_policy_resource)
+
+
+def _render_policy_resource(policy_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        policy_obj (Policy): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return policy_resource_dict(policy_obj.name,
+                                transform_policy_properties(policy_obj))
+
+
+def policy_resource_dict(name, properties):
+    """Build an AWS::IAM::Policy resource.
+
+    Args:
+        name (str): The name of the policy
+        properties (dict): The properties from policy_properties
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    properties["PolicyName"] = name
+    return {
+        "Type": "AWS::IAM::Policy",
+        "Properties": properties
+    }
 
 
 def transform_managed_policy(policy_obj):
@@ -81,17 +138,59 @@ def transform_managed_policy(policy_obj):
         dict: The CloudFormation structured python dictionary
 
     """
-    policy_properties = transform_policy_properties(policy_obj)
-    policy_properties["ManagedPolicyName"] = policy_obj.name
-    policy_properties["Description"] = policy_obj.description
-    policy_dict = {
-        policy_obj.name: {
-            "Type": "AWS::IAM::ManagedPolicy",
-            "Properties": policy_properties
-        }
+    return {
+        policy_obj.get_logical_id(policy_obj.name):
+            transform_managed_policy_resource(policy_obj)
     }
 
-    return policy_dict
+
+def transform_managed_policy_resource(policy_obj):
+    """Transform a ManagedPolicy object to an unkeyed CF resource dictionary.
+
+    Args:
+        policy_obj (ManagedPolicy): The Rack IAM Managed Policy object to
+            convert
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(policy_obj, _render_managed_policy_resource)
+
+
+def _render_managed_policy_resource(policy_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        policy_obj (ManagedPolicy): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return managed_policy_resource_dict(
+        policy_obj.name, policy_obj.description,
+        transform_policy_properties(policy_obj))
+
+
+def managed_policy_resource_dict(name, description, properties):
+    """Build an AWS::IAM::ManagedPolicy resource.
+
+    Args:
+        name (str): The name of the managed policy
+        description (str): The description of the managed policy
+        properties (dict): The properties from policy_properties
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    properties["ManagedPolicyName"] = name
+    properties["Description"] = description
+    return {
+        "Type": "AWS::IAM::ManagedPolicy",
+        "Properties": properties
+    }
 
 
 def transform_inline_policy(policy_obj):
@@ -104,16 +203,30 @@ def transform_inline_policy(policy_obj):
     Returns:
         dict: The CloudFormation structured python dictionary
 
+    """
+    document = None
+    if policy_obj.policy_document:
+        document = transform_policy_document(policy_obj.policy_document)
+    return inline_policy_dict(policy_obj.name, document)
+
+
+def inline_policy_dict(name, document):
+    """Build the CF structured dictionary for an inline policy.
+
+    Args:
+        name (str): The name of the inline policy
+        document (dict): The rendered policy document, or None
+
+    Returns:
+        dict: The CloudFormation structured python dictionary
+
     """
     policy_dict = {
-        "PolicyName": policy_obj.name
+        "PolicyName": name
     }
 
-    if policy_obj.policy_document:
-        policy_dict["PolicyDocument"] = \
-            transform_policy_document(
-                policy_obj.policy_document
-            )
+    if document is not None:
+        policy_dict["PolicyDocument"] = document
 
     return policy_dict
 
@@ -121,6 +234,10 @@ def transform_inline_policy(policy_obj):
 def transform_policy_document(document_obj):
     """Transform a PolicyDocument object to a CF structured python dictionary.
 
+    When a policy document cache is enabled the document is rendered once,
+    and every caller which transforms the same, unchanged document gets a
+    copy of the result.
+
     Args:
         document_obj (PolicyDocument): The Rack IAM PolicyDocument object to
         convert to a CloudFormation dictionary
@@ -129,15 +246,62 @@ def transform_policy_document(document_obj):
         dict: The CloudFormation structured python dictionary
 
     """
-    document_dict = {
-        "Version": document_obj.POLICY_VERSION,
-        "Statement": [
+    document_cache = get_policy_document_cache()
+    if document_cache is not None:
+        return document_cache.lookup(document_obj, _render_policy_document)
+    return _render_policy_document(document_obj)
+
+
+def _render_policy_document(document_obj):
+    """Render a PolicyDocument object without consulting the cache.
+
+    A document loaded from a raw dictionary which hasn't been accessed or
+    modified is passed through without decoding its statements. The result
+    is a copy, so modifying it leaves the raw dictionary as it was.
+
+    Args:
+        document_obj (PolicyDocument): The Rack IAM PolicyDocument object to
+        convert to a CloudFormation dictionary
+
+    Returns:
+        dict: The CloudFormation structured python dictionary
+
+    """
+    raw = document_obj.get_raw()
+    if raw is not None:
+        return copy_rendered(raw)
+
+    table = document_obj.get_statement_table()
+    if table is not None:
+        statements = transform_statement_table(table)
+    else:
+        statements = [
             transform_statement(statement)
             for statement in document_obj.statements
         ]
+
+    return policy_document_dict(document_obj.POLICY_VERSION,
+                                document_obj.policy_id, statements)
+
+
+def policy_document_dict(version, policy_id, statements):
+    """Build the CF structured dictionary for a policy document.
+
+    Args:
+        version (str): The policy language version
+        policy_id (str): The ID of the policy, or None
+        statements ([]dict): The rendered statements
+
+    Returns:
+        dict: The CloudFormation structured python dictionary
+
+    """
+    document_dict = {
+        "Version": version,
+        "Statement": statements
     }
 
-    if document_obj.policy_id:
-        document_dict["Id"] = document_obj.policy_id
+    if policy_id:
+        document_dict["Id"] = policy_id
 
     return document_dict
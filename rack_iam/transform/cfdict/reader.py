@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Reading CloudFormation templates back into Rack IAM objects.
+
+The inverse of the cfdict transforms. JSON templates are scanned one resource
+at a time: a tokenizer walks the template text, or a memory mapped file,
+finding the span and Type of each entry in the Resources section. Only the
+resources which are asked for are decoded, and only one of them is held as a
+dictionary at a time, so a large template is never loaded in full. Objects
+are built as the generators are consumed, and their policy documents keep
+the raw dictionaries until their statements are accessed.
+
+YAML templates aren't scanned, but once loaded their Resources mapping can be
+passed to `read_resource`.
+"""
+import contextlib
+import json
+import mmap
+import re
+
+from rack_iam.core.base import freeze_value
+from rack_iam.core.group import Group
+from rack_iam.core.helpers import string_types
+from rack_iam.core.policy import (InlinePolicy, ManagedPolicy, Policy,
+                                  PolicyDocument)
+from rack_iam.core.role import InstanceProfile, Role
+from rack_iam.core.user import User
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOKENS = (r'(?P<string>' + _STRING + r')|(?P<open>[{\[])|(?P<close>[}\]])'
+           r'|(?P<colon>:)')
+# Skips to the next bracket outside of a string
+_BRACKETS = (r'[^"{}\[\]]*(?:' + _STRING + r'[^"{}\[\]]*)*'
+             r'(?:(?P<open>[{\[])|(?P<close>[}\]]))')
+_TEXT_PATTERNS = (re.compile(_TOKENS), re.compile(_BRACKETS))
+_BYTES_PATTERNS = (re.compile(_TOKENS.encode('ascii')),
+                   re.compile(_BRACKETS.encode('ascii')))
+
+
+def _decode(token):
+    """Decode a JSON string or document from text or UTF-8 bytes.
+
+    Args:
+        token (str|bytes): The JSON
+
+    Returns:
+        object: The decoded value
+
+    """
+    if not isinstance(token, type(u'')):
+        token = token.decode('utf-8')
+    return json.loads(token)
+
+
+def _decode_string(token):
+    """Decode a JSON string token, without the decoder if it has no escapes.
+
+    Args:
+        token (str|bytes): The JSON string, including its quotes
+
+    Returns:
+        str: The decoded string
+
+    """
+    if not isinstance(token, type(u'')):
+        token = token.decode('utf-8')
+    if '\\' in token:
+        return json.loads(token)
+    return token[1:-1]
+
+
+def _skip_value(buffer, pos, brackets):
+    """Find the end of an object or array without tokenizing its contents.
+
+    Args:
+        buffer (str|bytes|mmap.mmap): The JSON
+        pos (int): The offset just after the opening bracket
+        brackets (re.RegexObject): The bracket pattern for the buffer type
+
+    Returns:
+        int: The offset just after the closing bracket
+
+    Raises:
+        ValueError: If the value isn't closed
+
+    """
+    depth = 1
+    while depth:
+        match = brackets.match(buffer, pos)
+        if match is None:
+            raise ValueError("Unterminated JSON value at {}".format(pos))
+        depth += 1 if match.lastgroup == 'open' else -1
+        pos = match.end()
+    return pos
+
+
+def _resource_spans(buffer):
+    """Find the resources in a JSON template without decoding them.
+
+    Only the keys of the template, its Resources and their top level are
+    tokenized. Any deeper value, such as a resource's Properties or another
+    section of the template, is skipped from bracket to bracket, and scanning
+    stops at the end of the Resources section.
+
+    Args:
+        buffer (str|bytes|mmap.mmap): The template JSON
+
+    Yields:
+        tuple: The logical ID, the Type (or None if it isn't a string) and the
+            start and end offsets of each resource
+
+    """
+    if isinstance(buffer, type(u'')):
+        tokens, brackets = _TEXT_PATTERNS
+    else:
+        tokens, brackets = _BYTES_PATTERNS
+    pos = depth = 0
+    previous = last_string = key = None
+    in_resources = False
+    logical_id = start = resource_type = None
+    while True:
+        match = tokens.search(buffer, pos)
+        if match is None:
+            return
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'string':
+            if (logical_id is not None and depth == 3 and
+                    previous == 'colon' and key == 'Type'):
+                resource_type = _decode_string(match.group())
+            last_string = match
+        elif kind == 'colon':
+            key = _decode_string(last_string.group())
+        elif kind == 'open':
+            depth += 1
+            if depth == 2 and previous == 'colon' and key == 'Resources':
+                in_resources = True
+            elif depth == 3 and in_resources and previous == 'colon':
+                logical_id, start, resource_type = key, match.start(), None
+            elif depth > 1:
+                pos = _skip_value(buffer, pos, brackets)
+                depth -= 1
+                kind = 'close'
+        else:
+            depth -= 1
+            if in_resources and depth == 2 and logical_id is not None:
+                yield logical_id, resource_type, start, pos
+                logical_id = None
+            elif in_resources and depth == 1:
+                return
+        previous = kind
+
+
+def read_template_resources(buffer, types=None):
+    """Read the resources of a JSON template one at a time.
+
+    Args:
+        buffer (str|bytes|mmap.mmap): The template JSON, such as the buffer
+            given by `open_template`
+        types (iterable): The resource types to read. Resources of any other
+            type are skipped without being decoded. Defaults to every type.
+    Yields:
+        tuple: The logical ID and the resource dictionary
+
+    """
+    if types is not None:
+        types = frozenset(types)
+    for logical_id, resource_type, start, end in _resource_spans(buffer):
+        if types is None or resource_type in types:
+            yield logical_id, _decode(buffer[start:end])
+
+
+@contextlib.contextmanager
+def open_template(path, use_mmap=True):
+    """Open a template file for reading.
+
+    Args:
+        path (str): The path of the template
+        use_mmap (bool): Whether to memory map the file rather than reading
+            it into memory. Empty files are always read.
+    Yields:
+        bytes|mmap.mmap: The template buffer
+
+    """
+    with open(path, 'rb') as template_file:
+        buffer = None
+        if use_mmap:
+            try:
+                buffer = mmap.mmap(template_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+            except ValueError:
+                pass
+        if buffer is None:
+            yield template_file.read()
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def _policy_document(document):
+    """Create a policy document from its template form.
+
+    Args:
+        document (dict|str): The policy document, or its JSON
+
+    Returns:
+        PolicyDocument: The policy document
+
+    """
+    if isinstance(document, string_types):
+        return PolicyDocument.from_json(document)
+    return PolicyDocument.from_dict(document)
+
+
+def _inline_policies(properties):
+    """Create the inline policies of a role, user or group.
+
+    Args:
+        properties (dict): The resource properties
+
+    Returns:
+        []InlinePolicy: The inline policies
+
+    """
+    policies = []
+    for policy_dict in properties.get('Policies', []):
+        policy = InlinePolicy(policy_dict.get('PolicyName'))
+        if policy_dict.get('PolicyDocument'):
+            policy.set_policy_document(
+                _policy_document(policy_dict['PolicyDocument']))
+        policies.append(policy)
+    return policies
+
+
+def _principals(properties, key):
+    """Get the principal names of a resource, ready to be held in a set.
+
+    Names may be intrinsic functions such as Ref, which are frozen so they
+    can be hashed, and are rendered back unchanged.
+
+    Args:
+        properties (dict): The resource properties
+        key (str): The property, such as Users or Groups
+    Returns:
+        []object: The names
+
+    """
+    return [freeze_value(name) for name in properties.get(key) or []]
+
+
+def read_role(logical_id, properties):
+    """Create a Role from AWS::IAM::Role properties.
+
+    Args:
+        logical_id (str): The logical ID, used when RoleName isn't set
+        properties (dict): The resource properties
+    Returns:
+        Role: The role
+
+    """
+    role_obj = Role(properties.get('RoleName', logical_id),
+                    properties.get('Path', '/'))
+    if properties.get('AssumeRolePolicyDocument'):
+        role_obj.set_assume_policy(
+            _policy_document(properties['AssumeRolePolicyDocument']))
+    role_obj.set_managed_policy_arns(properties.get('ManagedPolicyArns', []))
+    role_obj.policies = _inline_policies(properties)
+    return role_obj.set_logical_id(logical_id)
+
+
+def read_user(logical_id, properties):
+    """Create a User from AWS::IAM::User properties.
+
+    Args:
+        logical_id (str): The logical ID, used when UserName isn't set
+        properties (dict): The resource properties
+    Returns:
+        User: The user
+
+    """
+    user_obj = User(properties.get('UserName', logical_id),
+                    _principals(properties, 'Groups'),
+                    properties.get('Path', '/'))
+    user_obj.set_managed_policy_arns(properties.get('ManagedPolicyArns', []))
+    login_profile = properties.get('LoginProfile')
+    if login_profile:
+        user_obj.set_login_profile(
+            login_profile.get('Password'),
+            login_profile.get('PasswordResetRequired', False))
+    user_obj.policies = _inline_policies(properties)
+    return user_obj.set_logical_id(logical_id)
+
+
+def read_group(logical_id, properties):
+    """Create a Group from AWS::IAM::Group properties.
+
+    Args:
+        logical_id (str): The logical ID, used when GroupName isn't set
+        properties (dict): The resource properties
+    Returns:
+        Group: The group
+
+    """
+    group_obj = Group(properties.get('GroupName', logical_id),
+                      _principals(properties, 'Users'),
+                      properties.get('Path', '/'))
+    group_obj.set_managed_policy_arns(properties.get('ManagedPolicyArns', []))
+    group_obj.policies = _inline_policies(properties)
+    return group_obj.set_logical_id(logical_id)
+
+
+def _attach_policy(policy_obj, logical_id, properties):
+    """Set the logical ID, policy document and principals of a policy.
+
+    Args:
+        policy_obj (Policy): The policy or managed policy
+        logical_id (str): The logical ID of the resource
+        properties (dict): The resource properties
+    Returns:
+        Policy: The policy
+
+    """
+    if properties.get('PolicyDocument'):
+        policy_obj.set_policy_document(
+            _policy_document(properties['PolicyDocument']))
+    policy_obj.add_groups(_principals(properties, 'Groups'))
+    policy_obj.add_roles(_principals(properties, 'Roles'))
+    policy_obj.add_users(_principals(properties, 'Users'))
+    return policy_obj.set_logical_id(logical_id)
+
+
+def read_policy(logical_id, properties):
+    """Create a Policy from AWS::IAM::Policy properties.
+
+    Args:
+        logical_id (str): The logical ID, used when PolicyName isn't set
+        properties (dict): The resource properties
+    Returns:
+        Policy: The policy
+
+    """
+    return _attach_policy(Policy(properties.get('PolicyName', logical_id)),
+                          logical_id, properties)
+
+
+def read_managed_policy(logical_id, properties):
+    """Create a ManagedPolicy from AWS::IAM::ManagedPolicy properties.
+
+    Args:
+        logical_id (str): The logical ID, used when ManagedPolicyName isn't
+            set
+        properties (dict): The resource properties
+    Returns:
+        ManagedPolicy: The managed policy
+
+    """
+    return _attach_policy(
+        ManagedPolicy(properties.get('ManagedPolicyName', logical_id),
+                      properties.get('Description', '')),
+        logical_id, properties)
+
+
+def read_instance_profile(logical_id, properties):
+    """Create an InstanceProfile from AWS::IAM::InstanceProfile properties.
+
+    Args:
+        logical_id (str): The logical ID, used when InstanceProfileName isn't
+            set
+        properties (dict): The resource properties
+    Returns:
+        InstanceProfile: The instance profile
+
+    """
+    roles = properties.get('Roles') or [None]
+    return InstanceProfile(properties.get('InstanceProfileName', logical_id),
+                           roles[0], properties.get('Path', '/')
+                           ).set_logical_id(logical_id)
+
+
+def read_group_users(logical_id, properties):
+    """Create a Group from AWS::IAM::UserToGroupAddition properties.
+
+    The group only holds its users, and is rendered back with
+    transform_group_users under the same logical ID.
+
+    Args:
+        logical_id (str): The logical ID of the resource
+        properties (dict): The resource properties
+    Returns:
+        Group: The group
+
+    """
+    return Group(properties.get('GroupName'),
+                 _principals(properties, 'Users')).set_logical_id(
+                     logical_id, 'AWS::IAM::UserToGroupAddition')
+
+
+READERS = {
+    'AWS::IAM::Role': read_role,
+    'AWS::IAM::User': read_user,
+    'AWS::IAM::Group': read_group,
+    'AWS::IAM::UserToGroupAddition': read_group_users,
+    'AWS::IAM::Policy': read_policy,
+    'AWS::IAM::ManagedPolicy': read_managed_policy,
+    'AWS::IAM::InstanceProfile': read_instance_profile
+}
+
+# The transform_template argument each resource type is collected under
+_COLLECTIONS = {
+    'AWS::IAM::Role': 'roles',
+    'AWS::IAM::User': 'users',
+    'AWS::IAM::Group': 'groups',
+    'AWS::IAM::UserToGroupAddition': 'group_users',
+    'AWS::IAM::Policy': 'policies',
+    'AWS::IAM::ManagedPolicy': 'managed_policies',
+    'AWS::IAM::InstanceProfile': 'instance_profiles'
+}
+
+
+def read_resource(logical_id, resource):
+    """Create a Rack IAM object from a CloudFormation resource.
+
+    Args:
+        logical_id (str): The logical ID of the resource
+        resource (dict): The resource, with Type and Properties
+    Returns:
+        IamObject: The new object
+
+    Raises:
+        ValueError: If the resource type has no Rack IAM equivalent
+
+    """
+    try:
+        reader = READERS[resource.get('Type')]
+    except KeyError:
+        raise ValueError("Unsupported resource type: {}".format(
+            resource.get('Type')))
+    return reader(logical_id, resource.get('Properties') or {})
+
+
+def _check_types(types):
+    """Check that every resource type can be read.
+
+    Args:
+        types (iterable): The resource types, or None for all of them
+
+    Returns:
+        frozenset: The resource types
+
+    Raises:
+        ValueError: If a resource type has no Rack IAM equivalent
+
+    """
+    if types is None:
+        return frozenset(READERS)
+    types = frozenset(types)
+    unsupported = types - frozenset(READERS)
+    if unsupported:
+        raise ValueError("Unsupported resource types: {}".format(
+            ', '.join(sorted(unsupported))))
+    return types
+
+
+def read_template_objects(buffer, types=None):
+    """Read the IAM resources of a JSON template as Rack IAM objects.
+
+    Objects are created one at a time as the generator is consumed, and
+    resources of other types are never decoded.
+
+    Args:
+        buffer (str|bytes|mmap.mmap): The template JSON
+        types (iterable): The resource types to read, such as
+            'AWS::IAM::Role'. Defaults to every type in READERS.
+    Yields:
+        tuple: The logical ID and the object
+
+    Raises:
+        ValueError: If a resource type has no Rack IAM equivalent
+
+    """
+    types = _check_types(types)
+    for logical_id, resource in read_template_resources(buffer, types):
+        yield logical_id, read_resource(logical_id, resource)
+
+
+def read_template(buffer, types=None):
+    """Read the IAM resources of a JSON template into collections.
+
+    The result can be passed as keyword arguments to transform_template.
+    Each object keeps the logical ID it was read from, and each
+    UserToGroupAddition stays a separate Group under group_users, so the
+    template is rendered back with the same resources.
+
+    Args:
+        buffer (str|bytes|mmap.mmap): The template JSON
+        types (iterable): The resource types to read. Defaults to every type
+            in READERS.
+    Returns:
+        dict: Lists of objects, keyed by the transform_template argument
+            they belong to
+
+    Raises:
+        ValueError: If a resource type has no Rack IAM equivalent
+
+    """
+    types = _check_types(types)
+    collections = dict((name, []) for name in _COLLECTIONS.values())
+    for logical_id, resource in read_template_resources(buffer, types):
+        collections[_COLLECTIONS[resource['Type']]].append(
+            read_resource(logical_id, resource))
+    return collections
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Transformation of role related objects."""
+from .cache import cached_resource
 from .policy import transform_policy_document
 from .policy import transform_inline_policy
 
@@ -28,32 +29,143 @@ def transform_role(role_obj):
         dict: The CloudFormation structured python dictionary.
 
     """
-    role_dictionary = {
-        role_obj.name: {
-            "Type": "AWS::IAM::Role"
-        }
+    return {
+        role_obj.get_logical_id(role_obj.name):
+            transform_role_resource(role_obj)
     }
 
+
+def transform_role_resource(role_obj):
+    """Transform a Role object to an unkeyed CF resource dictionary.
+
+    This is the body of the resource only, without the logical ID wrapper, so
+    that it can be placed directly into a larger Resources mapping.
+
+    Args:
+        role_obj (Role): The Rack IAM Role object to convert
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(role_obj, _render_role_resource)
+
+
+def _render_role_resource(role_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        role_obj (Role): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    trust = None
+    if role_obj.assume_role_policy_document:
+        trust = transform_policy_document(
+            role_obj.assume_role_policy_document)
+    return role_resource_dict(
+        role_obj.name, role_obj.path, trust, role_obj.managed_policy_arns,
+        [transform_inline_policy(policy) for policy in role_obj.policies])
+
+
+def role_resource_dict(name, path, trust, managed_policy_arns, policies):
+    """Build an AWS::IAM::Role resource.
+
+    Args:
+        name (str): The name of the role
+        path (str): The path of the role
+        trust (dict): The rendered assume role policy document, or None
+        managed_policy_arns ([]str): The managed policy ARNs
+        policies ([]dict): The rendered inline policies
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
     role_properties = {
-        "Path": role_obj.path,
-        "RoleName": role_obj.name
+        "Path": path,
+        "RoleName": name
     }
 
-    if role_obj.assume_role_policy_document:
-        role_properties["AssumeRolePolicyDocument"] = \
-            transform_policy_document(
-                role_obj.assume_role_policy_document
-            )
-
-    if role_obj.managed_policy_arns:
-        role_properties["ManagedPolicyArns"] = \
-            role_obj.managed_policy_arns
-
-    if len(role_obj.policies) > 0:
-        role_properties["Policies"] = [
-            transform_inline_policy(policy)
-            for policy in role_obj.policies
-        ]
-
-    role_dictionary[role_obj.name]["Properties"] = role_properties
-    return role_dictionary
+    if trust is not None:
+        role_properties["AssumeRolePolicyDocument"] = trust
+
+    if managed_policy_arns:
+        role_properties["ManagedPolicyArns"] = managed_policy_arns
+
+    if len(policies) > 0:
+        role_properties["Policies"] = policies
+
+    return {
+        "Type": "AWS::IAM::Role",
+        "Properties": role_properties
+    }
+
+
+def transform_instance_profile(profile_obj):
+    """Transform an InstanceProfile object to a CF structured dictionary.
+
+    Args:
+        profile_obj (InstanceProfile): The Rack IAM InstanceProfile object to
+            convert to a CloudFormation dictionary.
+
+    Returns:
+        dict: The CloudFormation structured python dictionary.
+
+    """
+    return {
+        profile_obj.get_logical_id(profile_obj.name):
+            transform_instance_profile_resource(profile_obj)
+    }
+
+
+def transform_instance_profile_resource(profile_obj):
+    """Transform an InstanceProfile object to an unkeyed CF resource dictionary.
+
+    Args:
+        profile_obj (InstanceProfile): The Rack IAM InstanceProfile object to
+            convert
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(profile_obj, _render_instance_profile_resource)
+
+
+def _render_instance_profile_resource(profile_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        profile_obj (InstanceProfile): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return instance_profile_resource_dict(profile_obj.name, profile_obj.path,
+                                          profile_obj.rolename)
+
+
+def instance_profile_resource_dict(name, path, rolename):
+    """Build an AWS::IAM::InstanceProfile resource.
+
+    Args:
+        name (str): The name of the instance profile
+        path (str): The path of the instance profile
+        rolename (str): The name of the role in the instance profile
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return {
+        "Type": "AWS::IAM::InstanceProfile",
+        "Properties": {
+            "InstanceProfileName": name,
+            "Path": path,
+            "Roles": [rolename]
+        }
+    }
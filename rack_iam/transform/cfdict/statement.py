@@ -25,22 +25,62 @@ def transform_statement(statement_object):
     Returns:
         dict: The CloudFormation structured python dictionary.
 
+    """
+    return statement_dict(
+        statement_object.effect, statement_object.action,
+        statement_object.resource, statement_object.principal,
+        statement_object.condition, statement_object.sid)
+
+
+def transform_statement_table(table_object):
+    """Transform a StatementTable to CF structured python dictionaries.
+
+    The rows are rendered directly from the table's columns, without creating
+    Statement objects.
+
+    Args:
+        table_object (StatementTable): The Rack IAM StatementTable to convert
+
+    Returns:
+        []dict: A CloudFormation structured dictionary for each statement
+
+    """
+    return [
+        statement_dict(*row)
+        for row in table_object.iter_rows()
+    ]
+
+
+def statement_dict(effect, action, resource, principal, condition, sid):
+    """Build the CF structured dictionary for a single statement.
+
+    Args:
+        effect (str): The effect of the statement
+        action (object): The action(s) of the statement
+        resource (object): The resource(s) of the statement
+        principal (dict): The principal of the statement
+        condition (dict): The condition of the statement
+        sid (str): The statement ID
+
+    Returns:
+        dict: The CloudFormation structured python dictionary.
+
     """
     statement_dict = {
-        "Effect": statement_object.effect,
-        "Action": statement_object.action,
+        "Effect": effect,
+        "Action": action,
     }
 
-    if statement_object.sid:
-        statement_dict["Sid"] = statement_object.sid
+    if sid:
+        statement_dict["Sid"] = sid
 
-    if statement_object.resource:
-        statement_dict["Resource"] = statement_object.resource
+    if resource:
+        statement_dict["Resource"] = resource
 
-    if statement_object.principal:
-        statement_dict["Principal"] = statement_object.principal
+    if principal:
+        statement_dict["Principal"] = principal
 
-    if statement_object.condition:
-        statement_dict["Condition"] = statement_object.condition
+    if condition:
+        statement_dict["Condition"] = condition
 
     return statement_dict
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Streaming output of CloudFormation templates.
+
+The writers here take the (logical ID, resource) pairs produced by
+`iter_template_resources` and serialize them one resource at a time. Only a
+single resource is ever held as a dictionary and as text, so peak memory
+follows the largest resource rather than the size of the whole template.
+"""
+import json
+import numbers
+import re
+
+from .encoder import encode_json, sorted_set
+
+TEMPLATE_FORMAT_VERSION = "2010-09-09"
+
+# Plain YAML keys which don't need quoting. Anything else, along with words
+# that YAML 1.1 parsers read as booleans or nulls, is emitted double quoted.
+_YAML_PLAIN_KEY = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_YAML_RESERVED = frozenset([
+    'y', 'yes', 'n', 'no', 'true', 'false', 'on', 'off', 'null'
+])
+
+
+def _plain(value):
+    """Convert values YAML can't represent into plain structures.
+
+    Sets are emitted as sorted lists so output is stable across runs, tuples
+    (as found in frozen objects) are emitted as lists, while
+    objects with a `to_dict` method (troposphere helpers such as Ref and Join)
+    are emitted using their dictionary form.
+
+    Args:
+        value (object): The value to convert
+
+    Returns:
+        object: A list, dictionary, or the original value
+
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted_set(value)
+    if isinstance(value, tuple):
+        return list(value)
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return value
+
+
+def iter_template_json(resources, indent=None, encoding=None):
+    """Serialize template resources to JSON one chunk at a time.
+
+    Every chunk after the template header holds exactly one resource, so the
+    chunks can be handed to `writelines`, or encoded and batched up for
+    `os.writev`.
+
+    Args:
+        resources (iterable): (logical ID, resource dict) pairs, such as those
+            produced by `iter_template_resources`
+        indent (int): Indentation for pretty printed output. None emits the
+            most compact form.
+        encoding (str): When given, chunks are encoded to bytes
+
+    Yields:
+        str: Consecutive pieces of the JSON template
+
+    """
+    if indent is None:
+        separators = (',', ':')
+        newline = pad = ''
+    else:
+        separators = (',', ': ')
+        newline = '\n'
+        pad = ' ' * indent
+
+    def dumps(value):
+        return encode_json(value, indent)
+
+    def chunk(text):
+        return text.encode(encoding) if encoding else text
+
+    yield chunk('{' + newline + pad + dumps("AWSTemplateFormatVersion") +
+                separators[1] + dumps(TEMPLATE_FORMAT_VERSION) +
+                separators[0] + newline + pad + dumps("Resources") +
+                separators[1] + '{')
+
+    resource_pad = pad * 2
+    delimiter = ''
+    for logical_id, resource in resources:
+        body = dumps(resource)
+        if newline:
+            body = body.replace(newline, newline + resource_pad)
+        yield chunk(delimiter + newline + resource_pad + dumps(logical_id) +
+                    separators[1] + body)
+        delimiter = separators[0]
+
+    yield chunk(newline + pad + '}' + newline + '}' + newline)
+
+
+def write_template_json(fp, resources, indent=None):
+    """Write template resources as JSON to a file-like object.
+
+    Args:
+        fp (file): The file-like object to write to
+        resources (iterable): (logical ID, resource dict) pairs
+        indent (int): Indentation for pretty printed output
+    """
+    fp.writelines(iter_template_json(resources, indent=indent))
+
+
+def _yaml_key(key):
+    """Format a mapping key for YAML output.
+
+    Args:
+        key (str): The key to format
+
+    Returns:
+        str: The key, quoted when a plain scalar would be ambiguous
+
+    """
+    if _YAML_PLAIN_KEY.match(key) and key.lower() not in _YAML_RESERVED:
+        return key
+    return json.dumps(key)
+
+
+def _yaml_scalar(value):
+    """Format a scalar, or an empty collection, for YAML output.
+
+    Strings are always double quoted using JSON escaping, which is also valid
+    YAML, so values such as "*" or "true" keep their meaning.
+
+    Args:
+        value (object): The value to format
+
+    Returns:
+        str: The YAML representation of value
+
+    """
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, numbers.Number):
+        return repr(value)
+    if isinstance(value, dict):
+        return '{}'
+    if isinstance(value, list):
+        return '[]'
+    return json.dumps(value)
+
+
+def _yaml_block(value, indent):
+    """Generate YAML lines for a non-empty mapping or sequence.
+
+    Args:
+        value (dict or list): The collection to emit
+        indent (int): The number of spaces to indent by
+
+    Yields:
+        str: Lines of YAML without trailing newlines
+
+    """
+    pad = ' ' * indent
+    if isinstance(value, dict):
+        for key, item in value.items():
+            item = _plain(item)
+            if isinstance(item, (dict, list)) and item:
+                yield '{}{}:'.format(pad, _yaml_key(key))
+                for line in _yaml_block(item, indent + 2):
+                    yield line
+            else:
+                yield '{}{}: {}'.format(pad, _yaml_key(key),
+                                        _yaml_scalar(item))
+    else:
+        for item in value:
+            item = _plain(item)
+            if isinstance(item, (dict, list)) and item:
+                lines = _yaml_block(item, indent + 2)
+                yield '{}- {}'.format(pad, next(lines)[indent + 2:])
+                for line in lines:
+                    yield line
+            else:
+                yield '{}- {}'.format(pad, _yaml_scalar(item))
+
+
+def iter_template_yaml(resources, encoding=None):
+    """Serialize template resources to YAML one chunk at a time.
+
+    Args:
+        resources (iterable): (logical ID, resource dict) pairs, such as those
+            produced by `iter_template_resources`
+        encoding (str): When given, chunks are encoded to bytes
+
+    Yields:
+        str: Consecutive pieces of the YAML template
+
+    """
+    def chunk(text):
+        return text.encode(encoding) if encoding else text
+
+    yield chunk('AWSTemplateFormatVersion: {}\nResources:\n'.format(
+        json.dumps(TEMPLATE_FORMAT_VERSION)))
+
+    for logical_id, resource in resources:
+        lines = ['  {}:'.format(_yaml_key(logical_id))]
+        lines.extend(_yaml_block(_plain(resource), 4))
+        lines.append('')
+        yield chunk('\n'.join(lines))
+
+
+def write_template_yaml(fp, resources):
+    """Write template resources as YAML to a file-like object.
+
+    Args:
+        fp (file): The file-like object to write to
+        resources (iterable): (logical ID, resource dict) pairs
+    """
+    fp.writelines(iter_template_yaml(resources))
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bulk transformation of whole Rack IAM models.
+
+Rather than calling a transform per object and merging the resulting single
+key dictionaries, the functions here walk collections of Rack IAM objects and
+place each resource body directly into one CloudFormation Resources mapping.
+"""
+from .group import (
+    group_users_logical_id,
+    transform_group_resource,
+    transform_group_users_resource,
+)
+from .policy import transform_managed_policy_resource, transform_policy_resource
+from .role import transform_instance_profile_resource, transform_role_resource
+from .user import transform_user_resource
+
+
+def _iter_sources(roles, users, groups, policies, managed_policies,
+                  instance_profiles, group_users):
+    """Pair every object to be rendered with its logical ID and transform.
+
+    Objects use the logical ID set on them, or else their name.
+
+    Yields:
+        tuple: The logical ID, the resource transform function and the object
+
+    """
+    for role_obj in roles:
+        yield (role_obj.get_logical_id(role_obj.name),
+               transform_role_resource, role_obj)
+
+    for user_obj in users:
+        yield (user_obj.get_logical_id(user_obj.username),
+               transform_user_resource, user_obj)
+
+    for group_obj in groups:
+        yield (group_obj.get_logical_id(group_obj.groupname),
+               transform_group_resource, group_obj)
+
+    for group_obj in group_users:
+        yield (group_users_logical_id(group_obj),
+               transform_group_users_resource, group_obj)
+
+    for policy_obj in policies:
+        yield (policy_obj.get_logical_id(policy_obj.name),
+               transform_policy_resource, policy_obj)
+
+    for policy_obj in managed_policies:
+        yield (policy_obj.get_logical_id(policy_obj.name),
+               transform_managed_policy_resource, policy_obj)
+
+    for profile_obj in instance_profiles:
+        yield (profile_obj.get_logical_id(profile_obj.name),
+               transform_instance_profile_resource, profile_obj)
+
+
+def _collision(logical_id, obj):
+    """Build the error raised when two resources share a logical ID.
+
+    Args:
+        logical_id (str): The logical ID which was already taken
+        obj (object): The Rack IAM object which tried to reuse it
+
+    Returns:
+        ValueError: The exception to raise
+
+    """
+    return ValueError(
+        "Duplicate logical ID '{}' for {} resource".format(
+            logical_id, type(obj).__name__))
+
+
+def iter_template_resources(roles=(), users=(), groups=(), policies=(),
+                            managed_policies=(), instance_profiles=(),
+                            group_users=()):
+    """Transform collections of Rack IAM objects one resource at a time.
+
+    Resources are produced in argument order. Logical ID collisions are
+    detected as the resources are produced, so nothing after the first
+    duplicate is rendered.
+
+    Args:
+        roles ([]Role): Roles to render as AWS::IAM::Role
+        users ([]User): Users to render as AWS::IAM::User
+        groups ([]Group): Groups to render as AWS::IAM::Group
+        policies ([]Policy): Policies to render as AWS::IAM::Policy
+        managed_policies ([]ManagedPolicy): Managed policies to render as
+            AWS::IAM::ManagedPolicy
+        instance_profiles ([]InstanceProfile): Instance profiles to render as
+            AWS::IAM::InstanceProfile
+        group_users ([]Group): Groups whose users should be rendered as an
+            AWS::IAM::UserToGroupAddition
+
+    Yields:
+        tuple: The logical ID and the CloudFormation resource dictionary
+
+    Raises:
+        ValueError: If two resources resolve to the same logical ID
+
+    """
+    seen = set()
+    for logical_id, transform, obj in _iter_sources(
+            roles, users, groups, policies, managed_policies,
+            instance_profiles, group_users):
+        if logical_id in seen:
+            raise _collision(logical_id, obj)
+        seen.add(logical_id)
+        yield logical_id, transform(obj)
+
+
+def transform_template(roles=(), users=(), groups=(), policies=(),
+                       managed_policies=(), instance_profiles=(),
+                       group_users=()):
+    """Transform collections of Rack IAM objects into a Resources mapping.
+
+    Every resource body is written straight into the returned mapping, so no
+    intermediate single resource dictionaries need to be merged.
+
+    Args:
+        roles ([]Role): Roles to render as AWS::IAM::Role
+        users ([]User): Users to render as AWS::IAM::User
+        groups ([]Group): Groups to render as AWS::IAM::Group
+        policies ([]Policy): Policies to render as AWS::IAM::Policy
+        managed_policies ([]ManagedPolicy): Managed policies to render as
+            AWS::IAM::ManagedPolicy
+        instance_profiles ([]InstanceProfile): Instance profiles to render as
+            AWS::IAM::InstanceProfile
+        group_users ([]Group): Groups whose users should be rendered as an
+            AWS::IAM::UserToGroupAddition
+
+    Returns:
+        dict: The CloudFormation Resources mapping, keyed by logical ID
+
+    Raises:
+        ValueError: If two resources resolve to the same logical ID
+
+    """
+    resources = {}
+    for logical_id, transform, obj in _iter_sources(
+            roles, users, groups, policies, managed_policies,
+            instance_profiles, group_users):
+        if logical_id in resources:
+            raise _collision(logical_id, obj)
+        resources[logical_id] = transform(obj)
+
+    return resources
+
+
+def iter_model_resources(model):
+    """Transform every entity of an IamModel one resource at a time.
+
+    Args:
+        model (IamModel): The model to render
+
+    Yields:
+        tuple: The logical ID and the CloudFormation resource dictionary
+
+    Raises:
+        ValueError: If two resources resolve to the same logical ID
+
+    """
+    return iter_template_resources(**model.get_collections())
+
+
+def transform_model(model):
+    """Transform every entity of an IamModel into a Resources mapping.
+
+    Args:
+        model (IamModel): The model to render
+
+    Returns:
+        dict: The CloudFormation Resources mapping, keyed by logical ID
+
+    Raises:
+        ValueError: If two resources resolve to the same logical ID
+
+    """
+    return transform_template(**model.get_collections())
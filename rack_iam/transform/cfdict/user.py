@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Transformation of user related objects."""
+from .cache import cached_resource
 from .policy import transform_inline_policy
 
 
@@ -27,36 +28,80 @@ def transform_user(user_obj):
         dict: The CloudFormation structured python dictionary.
 
     """
-    user_dictionary = {
-        user_obj.username: {
-            "Type": "AWS::IAM::User"
-        }
+    return {
+        user_obj.get_logical_id(user_obj.username):
+            transform_user_resource(user_obj)
     }
 
+
+def transform_user_resource(user_obj):
+    """Transform a User object to an unkeyed CF resource dictionary.
+
+    Args:
+        user_obj (User): The Rack IAM User object to convert
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return cached_resource(user_obj, _render_user_resource)
+
+
+def _render_user_resource(user_obj):
+    """Render the resource body without consulting the cache.
+
+    Args:
+        user_obj (User): The object to render
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
+    return user_resource_dict(
+        user_obj.username, user_obj.path, user_obj.managed_policy_arns,
+        user_obj.get_groups(),
+        [transform_inline_policy(policy) for policy in user_obj.policies],
+        user_obj.login_profile)
+
+
+def user_resource_dict(username, path, managed_policy_arns, groups, policies,
+                       login_profile):
+    """Build an AWS::IAM::User resource.
+
+    Args:
+        username (str): The name of the user
+        path (str): The path of the user
+        managed_policy_arns ([]str): The managed policy ARNs
+        groups ([]str): The names of the groups the user is in
+        policies ([]dict): The rendered inline policies
+        login_profile (tuple): The password and whether it must be reset, or
+            None
+
+    Returns:
+        dict: The CloudFormation resource with Type and Properties
+
+    """
     user_properties = {
-        "Path": user_obj.path,
-        "UserName": user_obj.username
+        "Path": path,
+        "UserName": username
     }
 
-    if user_obj.managed_policy_arns:
-        user_properties["ManagedPolicyArns"] = \
-            user_obj.managed_policy_arns
+    if managed_policy_arns:
+        user_properties["ManagedPolicyArns"] = managed_policy_arns
 
-    if user_obj.groups:
-        user_properties["Groups"] = \
-            user_obj.groups
+    if groups:
+        user_properties["Groups"] = groups
 
-    if len(user_obj.policies) > 0:
-        user_properties["Policies"] = [
-            transform_inline_policy(policy)
-            for policy in user_obj.policies
-        ]
+    if len(policies) > 0:
+        user_properties["Policies"] = policies
 
-    if user_obj.login_profile:
+    if login_profile:
         user_properties["LoginProfile"] = {
-            "Password": user_obj.login_profile[0],
-            "PasswordResetRequired": user_obj.login_profile[1]
+            "Password": login_profile[0],
+            "PasswordResetRequired": login_profile[1]
         }
 
-    user_dictionary[user_obj.username]["Properties"] = user_properties
-    return user_dictionary
+    return {
+        "Type": "AWS::IAM::User",
+        "Properties": user_properties
+    }
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM intermediate representation.
+
+A model is compiled once into an immutable intermediate representation,
+which emitters then render as CloudFormation, Terraform JSON or IAM API
+requests, without walking the Rack IAM objects again.
+
+The compiler and emitters are loaded lazily, the first time they are used.
+"""
+from rack_iam.core.helpers import lazy_attributes
+
+_ATTRIBUTES = {
+    'Compiler': 'rack_iam.transform.ir.compiler',
+    'compile_template': 'rack_iam.transform.ir.compiler',
+    'compile_model': 'rack_iam.transform.ir.compiler',
+    'emit': 'rack_iam.transform.ir.emitters',
+    'emit_cfdict': 'rack_iam.transform.ir.emitters',
+    'emit_terraform': 'rack_iam.transform.ir.emitters',
+    'emit_iam_api': 'rack_iam.transform.ir.emitters',
+    'register_emitter': 'rack_iam.transform.ir.emitters',
+}
+
+__all__ = [
+    'Compiler',
+    'compile_template',
+    'compile_model',
+    'emit',
+    'emit_cfdict',
+    'emit_terraform',
+    'emit_iam_api',
+    'register_emitter'
+]
+
+__getattr__, __dir__ = lazy_attributes(__name__, _ATTRIBUTES)
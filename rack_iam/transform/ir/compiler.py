@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Lowering of Rack IAM objects into the intermediate representation.
+
+The intermediate representation (IR) is a tree of named tuples holding only
+immutable values: sets become sorted tuples, lists become tuples and
+dictionaries become FrozenDicts. Compiling walks the object graph once, and
+any number of emitters can then read the result, as it can never change
+underneath them. Documents, statements and inline policies shared between
+objects are compiled once and shared in the IR too. Resources carry the
+logical IDs the cfdict transforms would give them.
+"""
+from collections import namedtuple
+
+from rack_iam.core.base import FrozenDict, freeze_value
+from rack_iam.transform.cfdict.encoder import sorted_set
+from rack_iam.transform.cfdict.group import group_users_logical_id
+
+StatementIR = namedtuple('StatementIR', [
+    'effect', 'action', 'resource', 'principal', 'condition', 'sid'])
+DocumentIR = namedtuple('DocumentIR', [
+    'version', 'policy_id', 'statements', 'raw'])
+InlinePolicyIR = namedtuple('InlinePolicyIR', ['name', 'document'])
+RoleIR = namedtuple('RoleIR', [
+    'name', 'path', 'trust', 'managed_policy_arns', 'policies',
+    'logical_id'])
+UserIR = namedtuple('UserIR', [
+    'name', 'path', 'groups', 'managed_policy_arns', 'policies',
+    'login_profile', 'logical_id'])
+GroupIR = namedtuple('GroupIR', [
+    'name', 'path', 'managed_policy_arns', 'policies', 'users',
+    'logical_id', 'users_logical_id'])
+PolicyIR = namedtuple('PolicyIR', [
+    'name', 'document', 'roles', 'users', 'groups', 'logical_id'])
+ManagedPolicyIR = namedtuple('ManagedPolicyIR', [
+    'name', 'description', 'document', 'roles', 'users', 'groups',
+    'logical_id'])
+InstanceProfileIR = namedtuple('InstanceProfileIR', [
+    'name', 'role', 'path', 'logical_id'])
+ModelIR = namedtuple('ModelIR', [
+    'roles', 'users', 'groups', 'policies', 'managed_policies',
+    'instance_profiles', 'group_users'])
+
+
+def _names(value):
+    """Compile a collection of names, such as the users of a group.
+
+    Args:
+        value (object): A set, list or tuple of names
+
+    Returns:
+        tuple: The names, sorted when they came from a set
+
+    """
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted_set(value))
+    return freeze_value(list(value or ()))
+
+
+class Compiler(object):
+    """Lowers Rack IAM objects into the IR, sharing repeated children."""
+
+    def __init__(self):
+        """Initialize the compiler with empty memos."""
+        self._memo = {}
+
+    def _memoized(self, obj, lower):
+        """Compile an object once, however often it is shared.
+
+        Args:
+            obj (IamObject): The object
+            lower (function): Called with the object to compile it
+
+        Returns:
+            tuple: The compiled object
+
+        """
+        key = id(obj)
+        entry = self._memo.get(key)
+        if entry is None:
+            # The object is kept so its id can't be reused while memoized
+            entry = self._memo[key] = (obj, lower(obj))
+        return entry[1]
+
+    def statement(self, statement_obj):
+        """Compile a Statement.
+
+        Args:
+            statement_obj (Statement): The statement
+        Returns:
+            StatementIR: The compiled statement
+
+        """
+        return self._memoized(statement_obj, lambda obj: StatementIR(
+            obj.effect, freeze_value(obj.action), freeze_value(obj.resource),
+            freeze_value(obj.principal), freeze_value(obj.condition),
+            obj.sid))
+
+    def document(self, document_obj):
+        """Compile a PolicyDocument.
+
+        A raw document which hasn't been accessed is kept raw, without
+        decoding its statements.
+
+        Args:
+            document_obj (PolicyDocument): The document
+        Returns:
+            DocumentIR: The compiled document, or None for no document
+
+        """
+        if document_obj is None:
+            return None
+        return self._memoized(document_obj, self._lower_document)
+
+    def _lower_document(self, document_obj):
+        """Compile a PolicyDocument without consulting the memo.
+
+        Args:
+            document_obj (PolicyDocument): The document
+        Returns:
+            DocumentIR: The compiled document
+
+        """
+        raw = document_obj.get_raw()
+        if raw is not None:
+            return DocumentIR(None, None, None, freeze_value(raw))
+        table = document_obj.get_statement_table()
+        if table is not None:
+            statements = tuple(
+                StatementIR(*freeze_value(row)) for row in table.iter_rows())
+        else:
+            statements = tuple(
+                self.statement(statement)
+                for statement in document_obj.statements)
+        return DocumentIR(document_obj.POLICY_VERSION,
+                          document_obj.policy_id, statements, None)
+
+    def inline_policies(self, policies):
+        """Compile a list of InlinePolicy objects.
+
+        Args:
+            policies ([]InlinePolicy): The policies
+        Returns:
+            tuple: The compiled policies
+
+        """
+        return tuple(
+            self._memoized(policy, lambda obj: InlinePolicyIR(
+                obj.name, self.document(obj.policy_document)))
+            for policy in policies)
+
+    def role(self, role_obj):
+        """Compile a Role.
+
+        Args:
+            role_obj (Role): The role
+        Returns:
+            RoleIR: The compiled role
+
+        """
+        return self._memoized(role_obj, lambda obj: RoleIR(
+            obj.name, obj.path, self.document(obj.assume_role_policy_document),
+            freeze_value(list(obj.managed_policy_arns or ())),
+            self.inline_policies(obj.policies),
+            obj.get_logical_id(obj.name)))
+
+    def user(self, user_obj):
+        """Compile a User.
+
+        Args:
+            user_obj (User): The user
+        Returns:
+            UserIR: The compiled user
+
+        """
+        return self._memoized(user_obj, lambda obj: UserIR(
+            obj.username, obj.path, _names(obj.get_groups()),
+            freeze_value(list(obj.managed_policy_arns or ())),
+            self.inline_policies(obj.policies),
+            freeze_value(obj.login_profile),
+            obj.get_logical_id(obj.username)))
+
+    def group(self, group_obj):
+        """Compile a Group.
+
+        Args:
+            group_obj (Group): The group
+        Returns:
+            GroupIR: The compiled group
+
+        """
+        return self._memoized(group_obj, lambda obj: GroupIR(
+            obj.groupname, obj.path,
+            freeze_value(list(obj.managed_policy_arns or ())),
+            self.inline_policies(obj.policies), _names(obj.get_users()),
+            obj.get_logical_id(obj.groupname), group_users_logical_id(obj)))
+
+    def policy(self, policy_obj):
+        """Compile a Policy.
+
+        Args:
+            policy_obj (Policy): The policy
+        Returns:
+            PolicyIR: The compiled policy
+
+        """
+        return self._memoized(policy_obj, lambda obj: PolicyIR(
+            obj.name, self.document(obj.policy_document), _names(obj.roles),
+            _names(obj.users), _names(obj.groups),
+            obj.get_logical_id(obj.name)))
+
+    def managed_policy(self, policy_obj):
+        """Compile a ManagedPolicy.
+
+        Args:
+            policy_obj (ManagedPolicy): The managed policy
+        Returns:
+            ManagedPolicyIR: The compiled managed policy
+
+        """
+        return self._memoized(policy_obj, lambda obj: ManagedPolicyIR(
+            obj.name, obj.description, self.document(obj.policy_document),
+            _names(obj.roles), _names(obj.users), _names(obj.groups),
+            obj.get_logical_id(obj.name)))
+
+    def instance_profile(self, profile_obj):
+        """Compile an InstanceProfile.
+
+        Args:
+            profile_obj (InstanceProfile): The instance profile
+        Returns:
+            InstanceProfileIR: The compiled instance profile
+
+        """
+        return self._memoized(profile_obj, lambda obj: InstanceProfileIR(
+            obj.name, obj.rolename, obj.path, obj.get_logical_id(obj.name)))
+
+
+def compile_template(roles=(), users=(), groups=(), policies=(),
+                     managed_policies=(), instance_profiles=(),
+                     group_users=()):
+    """Compile collections of Rack IAM objects into the IR.
+
+    The arguments are the same as those of transform_template.
+
+    Args:
+        roles ([]Role): Roles
+        users ([]User): Users
+        groups ([]Group): Groups
+        policies ([]Policy): Policies
+        managed_policies ([]ManagedPolicy): Managed policies
+        instance_profiles ([]InstanceProfile): Instance profiles
+        group_users ([]Group): Groups whose users are to be added to them as
+            a separate resource
+    Returns:
+        ModelIR: The compiled model
+
+    """
+    compiler = Compiler()
+    return ModelIR(
+        tuple(compiler.role(obj) for obj in roles),
+        tuple(compiler.user(obj) for obj in users),
+        tuple(compiler.group(obj) for obj in groups),
+        tuple(compiler.policy(obj) for obj in policies),
+        tuple(compiler.managed_policy(obj) for obj in managed_policies),
+        tuple(compiler.instance_profile(obj) for obj in instance_profiles),
+        tuple(compiler.group(obj) for obj in group_users))
+
+
+def compile_model(model):
+    """Compile every entity of an IamModel into the IR.
+
+    Args:
+        model (IamModel): The model
+    Returns:
+        ModelIR: The compiled model
+
+    """
+    return compile_template(**model.get_collections())
+
+
+def thaw(value):
+    """Convert an IR value back into plain lists and dictionaries.
+
+    Args:
+        value (object): A value held by the IR
+
+    Returns:
+        object: A new, mutable, equivalent of the value
+
+    """
+    if isinstance(value, FrozenDict):
+        return dict((name, thaw(item)) for name, item in value.items())
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    if isinstance(value, frozenset):
+        return sorted_set(value)
+    return value
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Emitters rendering the intermediate representation in output formats.
+
+Each emitter is a function taking a ModelIR, and any options of its own, and
+returning the model in one format. They only read the IR, so emitting a
+compiled model in several formats costs one walk of the object graph in
+total. New formats are added with `register_emitter`.
+
+Resources and policy documents are rendered by the builders of the cfdict
+transforms, such as role_resource_dict, which take plain values, so there
+is one set of CloudFormation rendering rules for objects and the IR alike.
+"""
+import hashlib
+import re
+
+from rack_iam.core.arn import iam_arn
+from rack_iam.transform.cfdict.encoder import encode_json
+from rack_iam.transform.cfdict.group import (group_resource_dict,
+                                             group_users_resource_dict)
+from rack_iam.transform.cfdict.policy import (inline_policy_dict,
+                                              managed_policy_resource_dict,
+                                              policy_document_dict,
+                                              policy_properties,
+                                              policy_resource_dict)
+from rack_iam.transform.cfdict.role import (instance_profile_resource_dict,
+                                            role_resource_dict)
+from rack_iam.transform.cfdict.statement import statement_dict
+from rack_iam.transform.cfdict.user import user_resource_dict
+
+from .compiler import thaw
+
+# Characters not allowed in a Terraform resource name
+_TERRAFORM_INVALID = re.compile(r'[^A-Za-z0-9_-]')
+
+
+def document_dict(document):
+    """Render a compiled policy document as a policy dictionary.
+
+    Args:
+        document (DocumentIR): The compiled document
+
+    Returns:
+        dict: The IAM policy document
+
+    """
+    if document.raw is not None:
+        return thaw(document.raw)
+    return policy_document_dict(document.version, document.policy_id, [
+        statement_dict(statement.effect, thaw(statement.action),
+                       thaw(statement.resource), thaw(statement.principal),
+                       thaw(statement.condition), statement.sid)
+        for statement in document.statements])
+
+
+def _optional_document_dict(document):
+    """Render a compiled policy document which may be missing.
+
+    Args:
+        document (DocumentIR): The compiled document, or None
+
+    Returns:
+        dict: The IAM policy document, or None
+
+    """
+    if document is None:
+        return None
+    return document_dict(document)
+
+
+def _inline_policy_dicts(policies):
+    """Render compiled inline policies as CloudFormation does.
+
+    Args:
+        policies ([]InlinePolicyIR): The compiled inline policies
+
+    Returns:
+        []dict: The PolicyName and PolicyDocument of each policy
+
+    """
+    return [
+        inline_policy_dict(policy.name,
+                           _optional_document_dict(policy.document))
+        for policy in policies]
+
+
+def _cfdict_policy_properties(policy):
+    """Render the properties shared by policies and managed policies.
+
+    Args:
+        policy (PolicyIR): The compiled policy, or managed policy
+
+    Returns:
+        dict: The CloudFormation properties
+
+    """
+    return policy_properties(_optional_document_dict(policy.document),
+                             thaw(policy.groups), thaw(policy.users),
+                             thaw(policy.roles))
+
+
+def emit_cfdict(model):
+    """Emit a compiled model as a CloudFormation Resources mapping.
+
+    Resources are built by the same functions as the cfdict transforms use,
+    so the output matches that of transform_template for the same objects.
+
+    Args:
+        model (ModelIR): The compiled model
+    Returns:
+        dict: The CloudFormation Resources mapping, keyed by logical ID
+
+    Raises:
+        ValueError: If two resources resolve to the same logical ID
+
+    """
+    resources = {}
+
+    def add(logical_id, resource):
+        if logical_id in resources:
+            raise ValueError(
+                "Duplicate logical ID '{}' for {} resource".format(
+                    logical_id, resource["Type"]))
+        resources[logical_id] = resource
+
+    for role in model.roles:
+        add(role.logical_id, role_resource_dict(
+            role.name, role.path, _optional_document_dict(role.trust),
+            thaw(role.managed_policy_arns),
+            _inline_policy_dicts(role.policies)))
+
+    for user in model.users:
+        add(user.logical_id, user_resource_dict(
+            user.name, user.path, thaw(user.managed_policy_arns),
+            thaw(user.groups), _inline_policy_dicts(user.policies),
+            user.login_profile))
+
+    for group in model.groups:
+        add(group.logical_id, group_resource_dict(
+            group.name, group.path, thaw(group.managed_policy_arns),
+            thaw(group.users), _inline_policy_dicts(group.policies)))
+
+    for group in model.group_users:
+        add(group.users_logical_id,
+            group_users_resource_dict(group.name, thaw(group.users)))
+
+    for policy in model.policies:
+        add(policy.logical_id, policy_resource_dict(
+            policy.name, _cfdict_policy_properties(policy)))
+
+    for policy in model.managed_policies:
+        add(policy.logical_id, managed_policy_resource_dict(
+            policy.name, policy.description,
+            _cfdict_policy_properties(policy)))
+
+    for profile in model.instance_profiles:
+        add(profile.logical_id, instance_profile_resource_dict(
+            profile.name, profile.path, profile.role))
+
+    return resources
+
+
+def terraform_name(*parts):
+    """Build a Terraform resource name from IAM names.
+
+    Args:
+        parts ([]str): The names to join
+
+    Returns:
+        str: A valid Terraform resource name
+
+    """
+    name = _TERRAFORM_INVALID.sub('_', '_'.join(str(part) for part in parts))
+    if not name[:1].isalpha() and not name.startswith('_'):
+        name = '_' + name
+    return name
+
+
+def _terraform_suffix(source):
+    """Build a short, stable suffix identifying where a resource came from.
+
+    Args:
+        source (tuple): The kind of resource and the names it was built from
+
+    Returns:
+        str: Eight hexadecimal digits
+
+    """
+    text = u'\0'.join(u'{}'.format(part) for part in source)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:8]
+
+
+def emit_terraform(model):
+    """Emit a compiled model as Terraform JSON configuration.
+
+    Policy documents are embedded as canonical JSON strings. Terraform can't
+    set a user's password, so login profiles only carry the reset flag.
+
+    Different IAM names can give the same Terraform name, such as john.doe
+    and john_doe, as can an inline policy and a Policy of the same name
+    attached to the same principal. The first resource keeps the name, and
+    any later one has a hash of its source appended.
+
+    Args:
+        model (ModelIR): The compiled model
+    Returns:
+        dict: The Terraform configuration, with a resource block per type
+
+    Raises:
+        ValueError: If the model holds the same resource twice
+
+    """
+    blocks = {}
+    sources = {}
+
+    def add(resource_type, source, body):
+        block = blocks.setdefault(resource_type, {})
+        name = terraform_name(*source[1:])
+        if name in block:
+            if source in sources.setdefault(resource_type, set()):
+                raise ValueError("Duplicate {} resource for {}".format(
+                    resource_type, ', '.join(
+                        u'{}'.format(part) for part in source[1:])))
+            name = '{}_{}'.format(name, _terraform_suffix(source))
+        sources.setdefault(resource_type, set()).add(source)
+        block[name] = body
+        return name
+
+    def inline(principal, principal_name, policies):
+        for policy in policies:
+            body = {"name": policy.name, principal: principal_name}
+            if policy.document:
+                body["policy"] = encode_json(document_dict(policy.document))
+            add("aws_iam_{}_policy".format(principal),
+                ("inline", principal_name, policy.name), body)
+
+    def attachments(principal, principal_name, arns):
+        for index, arn in enumerate(arns):
+            add("aws_iam_{}_policy_attachment".format(principal),
+                ("attachment", principal_name, index),
+                {principal: principal_name, "policy_arn": arn})
+
+    for role in model.roles:
+        body = {"name": role.name, "path": role.path}
+        if role.trust:
+            body["assume_role_policy"] = encode_json(
+                document_dict(role.trust))
+        add("aws_iam_role", ("role", role.name), body)
+        inline("role", role.name, role.policies)
+        attachments("role", role.name, role.managed_policy_arns)
+
+    for user in model.users:
+        add("aws_iam_user", ("user", user.name),
+            {"name": user.name, "path": user.path})
+        inline("user", user.name, user.policies)
+        attachments("user", user.name, user.managed_policy_arns)
+        if user.groups:
+            add("aws_iam_user_group_membership", ("user", user.name),
+                {"user": user.name, "groups": list(user.groups)})
+        if user.login_profile:
+            add("aws_iam_user_login_profile", ("user", user.name),
+                {"user": user.name,
+                 "password_reset_required": user.login_profile[1]})
+
+    for group in model.groups:
+        add("aws_iam_group", ("group", group.name),
+            {"name": group.name, "path": group.path})
+        inline("group", group.name, group.policies)
+        attachments("group", group.name, group.managed_policy_arns)
+
+    for group in model.group_users:
+        add("aws_iam_group_membership", ("group", group.name), {
+            "name": group.users_logical_id,
+            "group": group.name,
+            "users": list(group.users)
+        })
+
+    for policy in model.policies:
+        for principal in ("role", "user", "group"):
+            for principal_name in getattr(policy, principal + "s"):
+                body = {"name": policy.name, principal: principal_name}
+                if policy.document:
+                    body["policy"] = encode_json(
+                        document_dict(policy.document))
+                add("aws_iam_{}_policy".format(principal),
+                    ("policy", principal_name, policy.name), body)
+
+    for policy in model.managed_policies:
+        body = {"name": policy.name, "description": policy.description}
+        if policy.document:
+            body["policy"] = encode_json(document_dict(policy.document))
+        name = add("aws_iam_policy", ("managed_policy", policy.name), body)
+        if policy.roles or policy.users or policy.groups:
+            add("aws_iam_policy_attachment", ("managed_policy", policy.name), {
+                "name": policy.name,
+                "policy_arn": "${{aws_iam_policy.{}.arn}}".format(name),
+                "roles": list(policy.roles),
+                "users": list(policy.users),
+                "groups": list(policy.groups)
+            })
+
+    for profile in model.instance_profiles:
+        add("aws_iam_instance_profile", ("instance_profile", profile.name),
+            {"name": profile.name, "role": profile.role,
+             "path": profile.path})
+
+    return {"resource": blocks}
+
+
+def emit_iam_api(model, account_id=''):
+    """Emit a compiled model as IAM API requests.
+
+    Requests are ordered so that everything is created before it is
+    referred to: groups, users and roles, then managed policies, and then
+    attachments, memberships and instance profiles.
+
+    Args:
+        model (ModelIR): The compiled model
+        account_id (str): The account, used for the ARNs of managed policies
+    Returns:
+        []dict: The requests, each with an Action and its Parameters
+
+    """
+    requests = []
+
+    def request(action, **parameters):
+        requests.append({"Action": action, "Parameters": parameters})
+
+    def policy_json(document):
+        return encode_json(document_dict(document))
+
+    for group in model.groups:
+        request("CreateGroup", GroupName=group.name, Path=group.path)
+    for user in model.users:
+        request("CreateUser", UserName=user.name, Path=user.path)
+        if user.login_profile:
+            request("CreateLoginProfile", UserName=user.name,
+                    Password=user.login_profile[0],
+                    PasswordResetRequired=user.login_profile[1])
+    for role in model.roles:
+        parameters = {"RoleName": role.name, "Path": role.path}
+        if role.trust:
+            parameters["AssumeRolePolicyDocument"] = policy_json(role.trust)
+        request("CreateRole", **parameters)
+    for policy in model.managed_policies:
+        parameters = {"PolicyName": policy.name,
+                      "Description": policy.description}
+        if policy.document:
+            parameters["PolicyDocument"] = policy_json(policy.document)
+        request("CreatePolicy", **parameters)
+
+    principals = (
+        ("Group", "GroupName", model.groups),
+        ("User", "UserName", model.users),
+        ("Role", "RoleName", model.roles),
+    )
+    for kind, name_parameter, entities in principals:
+        for entity in entities:
+            for policy in entity.policies:
+                parameters = {name_parameter: entity.name,
+                              "PolicyName": policy.name}
+                if policy.document:
+                    parameters["PolicyDocument"] = policy_json(
+                        policy.document)
+                request("Put{}Policy".format(kind), **parameters)
+            for arn in entity.managed_policy_arns:
+                request("Attach{}Policy".format(kind),
+                        PolicyArn=arn, **{name_parameter: entity.name})
+
+    for policy in model.policies:
+        for kind, name_parameter, attribute in (
+                ("Group", "GroupName", "groups"),
+                ("User", "UserName", "users"),
+                ("Role", "RoleName", "roles")):
+            for name in getattr(policy, attribute):
+                parameters = {name_parameter: name,
+                              "PolicyName": policy.name}
+                if policy.document:
+                    parameters["PolicyDocument"] = policy_json(
+                        policy.document)
+                request("Put{}Policy".format(kind), **parameters)
+    for policy in model.managed_policies:
+        arn = iam_arn('policy', policy.name, '', account_id)
+        for kind, name_parameter, attribute in (
+                ("Group", "GroupName", "groups"),
+                ("User", "UserName", "users"),
+                ("Role", "RoleName", "roles")):
+            for name in getattr(policy, attribute):
+                request("Attach{}Policy".format(kind), PolicyArn=arn,
+                        **{name_parameter: name})
+
+    memberships = set()
+    for user in model.users:
+        memberships.update((group, user.name) for group in user.groups)
+    for group in model.group_users:
+        memberships.update((group.name, user) for user in group.users)
+    for group_name, user_name in sorted(memberships):
+        request("AddUserToGroup", GroupName=group_name, UserName=user_name)
+
+    for profile in model.instance_profiles:
+        request("CreateInstanceProfile",
+                InstanceProfileName=profile.name, Path=profile.path)
+        request("AddRoleToInstanceProfile",
+                InstanceProfileName=profile.name, RoleName=profile.role)
+
+    return requests
+
+
+_emitters = {
+    'cfdict': emit_cfdict,
+    'terraform': emit_terraform,
+    'iam': emit_iam_api,
+}
+
+
+def register_emitter(name, emitter):
+    """Register an emitter for an output format.
+
+    Args:
+        name (str): The name of the format
+        emitter (function): Called with a ModelIR, and any options, to emit
+            it in the format
+    """
+    _emitters[name] = emitter
+
+
+def emit(model, output_format, **options):
+    """Emit a compiled model in a registered output format.
+
+    Args:
+        model (ModelIR): The compiled model
+        output_format (str): The name of the format, such as cfdict,
+            terraform or iam
+        options: Options for the emitter, such as account_id for iam
+    Returns:
+        object: The model in the output format
+
+    Raises:
+        KeyError: If no emitter is registered for the format
+
+    """
+    return _emitters[output_format](model, **options)
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Direct conversion of Rack IAM objects into troposphere resources.
+
+Rather than transforming objects to dictionaries and then assigning those to
+troposphere objects, which checks every property again, the resources built
+here have their properties filled in directly. Policy documents are attached
+as troposphere helpers which only render when the template is serialized,
+through the cached cfdict transform. Troposphere intrinsics, such as Ref and
+Join, in principals or resources are passed through untouched.
+
+troposphere is an optional dependency, and is only needed once one of these
+functions is called.
+"""
+from rack_iam.transform.cfdict.encoder import sorted_set
+from rack_iam.transform.cfdict.group import group_users_logical_id
+from rack_iam.transform.cfdict.policy import transform_policy_document
+
+try:
+    from troposphere import AWSHelperFn, iam
+except ImportError:
+    AWSHelperFn = object
+    iam = None
+
+
+def _require_troposphere():
+    """Check that troposphere can be used.
+
+    Raises:
+        ImportError: If troposphere isn't installed
+
+    """
+    if iam is None:
+        raise ImportError(
+            "troposphere is required to create troposphere resources")
+
+
+def _plain(value):
+    """Convert sets and tuples within a value into lists.
+
+    Troposphere helpers and other objects are left for troposphere to encode.
+
+    Args:
+        value (object): The value to convert
+
+    Returns:
+        object: The converted value
+
+    """
+    if isinstance(value, dict):
+        return dict((name, _plain(item)) for name, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted_set(value)
+    return value
+
+
+class PolicyDocumentFn(AWSHelperFn):
+    """A troposphere helper rendering a PolicyDocument when serialized.
+
+    Troposphere doesn't type check helpers, and the document is only
+    rendered when the template is, so it always reflects the document's
+    latest state.
+    """
+
+    def __init__(self, document):
+        """Wrap a policy document.
+
+        Args:
+            document (PolicyDocument): The document to render
+        """
+        self.document = document
+        self.data = None
+
+    def to_dict(self):
+        """Render the document.
+
+        Returns:
+            dict: The policy document, for troposphere to encode
+
+        """
+        return _plain(transform_policy_document(self.document))
+
+
+def _resource(cls, title, properties):
+    """Create a troposphere object with its properties set directly.
+
+    Args:
+        cls (type): The troposphere class
+        title (str): The logical ID, or None for a property type
+        properties (dict): The properties, which aren't type checked again
+
+    Returns:
+        BaseAWSObject: The troposphere object
+
+    """
+    obj = cls(title, validation=False)
+    obj.properties.update(properties)
+    return obj
+
+
+def _inline_policies(policies):
+    """Create troposphere inline policies.
+
+    Args:
+        policies ([]InlinePolicy): The inline policies
+
+    Returns:
+        []troposphere.iam.Policy: The troposphere inline policies
+
+    """
+    result = []
+    for policy in policies:
+        properties = {"PolicyName": policy.name}
+        if policy.policy_document:
+            properties["PolicyDocument"] = PolicyDocumentFn(
+                policy.policy_document)
+        result.append(_resource(iam.Policy, None, properties))
+    return result
+
+
+def _principal_properties(obj, properties):
+    """Add the managed and inline policies of a principal to its properties.
+
+    Args:
+        obj (IamObject): The role, user or group
+        properties (dict): The properties to add to
+    Returns:
+        dict: The properties
+    """
+    if obj.managed_policy_arns:
+        properties["ManagedPolicyArns"] = _plain(obj.managed_policy_arns)
+    if obj.policies:
+        properties["Policies"] = _inline_policies(obj.policies)
+    return properties
+
+
+def role_resource(role_obj, title=None):
+    """Create a troposphere Role from a Role.
+
+    Args:
+        role_obj (Role): The Rack IAM Role
+        title (str): The logical ID. Defaults to the logical ID set on the
+            object, or else the role name.
+    Returns:
+        troposphere.iam.Role: The troposphere resource
+
+    """
+    _require_troposphere()
+    properties = {"Path": role_obj.path, "RoleName": role_obj.name}
+    if role_obj.assume_role_policy_document:
+        properties["AssumeRolePolicyDocument"] = PolicyDocumentFn(
+            role_obj.assume_role_policy_document)
+    title = title or role_obj.get_logical_id(role_obj.name)
+    return _resource(iam.Role, title,
+                     _principal_properties(role_obj, properties))
+
+
+def user_resource(user_obj, title=None):
+    """Create a troposphere User from a User.
+
+    Args:
+        user_obj (User): The Rack IAM User
+        title (str): The logical ID. Defaults to the logical ID set on the
+            object, or else the user name.
+    Returns:
+        troposphere.iam.User: The troposphere resource
+
+    """
+    _require_troposphere()
+    properties = {"Path": user_obj.path, "UserName": user_obj.username}
+    groups = user_obj.get_groups()
+    if groups:
+        properties["Groups"] = sorted_set(groups)
+    if user_obj.login_profile:
+        properties["LoginProfile"] = _resource(iam.LoginProfile, None, {
+            "Password": user_obj.login_profile[0],
+            "PasswordResetRequired": user_obj.login_profile[1]
+        })
+    title = title or user_obj.get_logical_id(user_obj.username)
+    return _resource(iam.User, title,
+                     _principal_properties(user_obj, properties))
+
+
+def group_resource(group_obj, title=None):
+    """Create a troposphere Group from a Group.
+
+    Args:
+        group_obj (Group): The Rack IAM Group
+        title (str): The logical ID. Defaults to the logical ID set on the
+            object, or else the group name.
+    Returns:
+        troposphere.iam.Group: The troposphere resource
+
+    """
+    _require_troposphere()
+    properties = {"Path": group_obj.path, "GroupName": group_obj.groupname}
+    title = title or group_obj.get_logical_id(group_obj.groupname)
+    return _resource(iam.Group, title,
+                     _principal_properties(group_obj, properties))
+
+
+def group_users_resource(group_obj, title=None):
+    """Create a troposphere UserToGroupAddition for a group's users.
+
+    Args:
+        group_obj (Group): The Rack IAM Group
+        title (str): The logical ID. Defaults to that used by
+            transform_group_users.
+    Returns:
+        troposphere.iam.UserToGroupAddition: The troposphere resource
+
+    """
+    _require_troposphere()
+    return _resource(
+        iam.UserToGroupAddition, title or group_users_logical_id(group_obj),
+        {"GroupName": group_obj.groupname,
+         "Users": sorted_set(group_obj.get_users())})
+
+
+def _policy_properties(policy_obj):
+    """Build the properties shared by policies and managed policies.
+
+    Args:
+        policy_obj (Policy): The policy or managed policy
+
+    Returns:
+        dict: The properties
+
+    """
+    properties = {}
+    if policy_obj.policy_document:
+        properties["PolicyDocument"] = PolicyDocumentFn(
+            policy_obj.policy_document)
+    for name, names in (("Groups", policy_obj.groups),
+                        ("Users", policy_obj.users),
+                        ("Roles", policy_obj.roles)):
+        if names:
+            properties[name] = _plain(names)
+    return properties
+
+
+def policy_resource(policy_obj, title=None):
+    """Create a troposphere PolicyType from a Policy.
+
+    Args:
+        policy_obj (Policy): The Rack IAM Policy
+        title (str): The logical ID. Defaults to the logical ID set on the
+            object, or else the policy name.
+    Returns:
+        troposphere.iam.PolicyType: The troposphere resource
+
+    """
+    _require_troposphere()
+    properties = _policy_properties(policy_obj)
+    properties["PolicyName"] = policy_obj.name
+    title = title or policy_obj.get_logical_id(policy_obj.name)
+    return _resource(iam.PolicyType, title, properties)
+
+
+def managed_policy_resource(policy_obj, title=None):
+    """Create a troposphere ManagedPolicy from a ManagedPolicy.
+
+    Args:
+        policy_obj (ManagedPolicy): The Rack IAM ManagedPolicy
+        title (str): The logical ID. Defaults to the logical ID set on the
+            object, or else the policy name.
+    Returns:
+        troposphere.iam.ManagedPolicy: The troposphere resource
+
+    """
+    _require_troposphere()
+    properties = _policy_properties(policy_obj)
+    properties["ManagedPolicyName"] = policy_obj.name
+    properties["Description"] = policy_obj.description
+    title = title or policy_obj.get_logical_id(policy_obj.name)
+    return _resource(iam.ManagedPolicy, title, properties)
+
+
+def instance_profile_resource(profile_obj, title=None):
+    """Create a troposphere InstanceProfile from an InstanceProfile.
+
+    Args:
+        profile_obj (InstanceProfile): The Rack IAM InstanceProfile
+        title (str): The logical ID. Defaults to the logical ID set on the
+            object, or else the profile name.
+    Returns:
+        troposphere.iam.InstanceProfile: The troposphere resource
+
+    """
+    _require_troposphere()
+    title = title or profile_obj.get_logical_id(profile_obj.name)
+    return _resource(iam.InstanceProfile, title, {
+        "InstanceProfileName": profile_obj.name,
+        "Path": profile_obj.path,
+        "Roles": [profile_obj.rolename]
+    })
+
+
+def add_to_template(template, roles=(), users=(), groups=(), policies=(),
+                    managed_policies=(), instance_profiles=(),
+                    group_users=()):
+    """Add troposphere resources for collections of objects to a template.
+
+    The arguments match those of transform_template, and each object's name
+    is used as its logical ID.
+
+    Args:
+        template (troposphere.Template): The template to add to
+        roles ([]Role): Roles
+        users ([]User): Users
+        groups ([]Group): Groups
+        policies ([]Policy): Policies
+        managed_policies ([]ManagedPolicy): Managed policies
+        instance_profiles ([]InstanceProfile): Instance profiles
+        group_users ([]Group): Groups whose users should be rendered as an
+            AWS::IAM::UserToGroupAddition
+    Returns:
+        []BaseAWSObject: The resources added
+
+    Raises:
+        ValueError: From troposphere, if two resources share a logical ID
+
+    """
+    resources = []
+    for objects, convert in ((roles, role_resource),
+                             (users, user_resource),
+                             (groups, group_resource),
+                             (group_users, group_users_resource),
+                             (policies, policy_resource),
+                             (managed_policies, managed_policy_resource),
+                             (instance_profiles, instance_profile_resource)):
+        for obj in objects:
+            resources.append(template.add_resource(convert(obj)))
+    return resources
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Rack IAM validation module.
+
+Checks a model against IAM naming rules and service quotas before it is
+deployed, so that a name that is too long or a trust policy that is too large
+is found in seconds rather than by a failed stack update.
+
+Name patterns are compiled once, and policy document sizes are cached against
+the version of each document, so a document shared by many principals is
+only measured once and re-measured only after it changes. For fleet wide runs
+the checks can be spread over a pool of processes.
+"""
+from collections import namedtuple
+import re
+
+from rack_iam.core.helpers import string_types
+from rack_iam.transform.cfdict.cache import TransformCache
+from rack_iam.transform.cfdict.encoder import encode_json
+from rack_iam.transform.cfdict.policy import transform_policy_document
+
+ValidationIssue = namedtuple('ValidationIssue', ['kind', 'name', 'rule',
+                                                 'message'])
+
+# Characters allowed in role, user, group and policy names. IAM only allows
+# ASCII, and \Z is used as $ would also match before a trailing newline.
+NAME_PATTERN = re.compile(r'[A-Za-z0-9_+=,.@-]+\Z')
+PATH_PATTERN = re.compile(r'(/|/[\x21-\x7E]+/)\Z')
+SID_PATTERN = re.compile(r'[A-Za-z0-9]*\Z')
+
+# The default IAM quotas. Several of these can be raised on request, in which
+# case the new values can be passed to Validator.
+DEFAULT_LIMITS = {
+    'role_name_length': 64,
+    'user_name_length': 64,
+    'group_name_length': 128,
+    'policy_name_length': 128,
+    'policy_description_length': 1000,
+    'path_length': 512,
+    'managed_policies_per_principal': 10,
+    'groups_per_user': 10,
+    'trust_policy_size': 2048,
+    'role_inline_policy_size': 10240,
+    'user_inline_policy_size': 2048,
+    'group_inline_policy_size': 5120,
+    'managed_policy_size': 6144,
+}
+
+
+def _document_size(document):
+    """Measure a policy document the way IAM does, ignoring whitespace.
+
+    Args:
+        document (PolicyDocument): The document to measure
+
+    Returns:
+        int: The number of characters in the document
+
+    """
+    return len(encode_json(transform_policy_document(document)))
+
+
+class Validator(object):
+    """Checks Rack IAM objects against IAM naming rules and quotas."""
+
+    def __init__(self, limits=None, cache_size=65536):
+        """Initialize the validator.
+
+        Args:
+            limits (dict): Quotas overriding those in DEFAULT_LIMITS
+            cache_size (int): The most policy document sizes to remember
+        """
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._sizes = TransformCache(cache_size)
+
+    def document_size(self, document):
+        """Get the size of a policy document, measuring it only if needed.
+
+        Args:
+            document (PolicyDocument): The document to measure
+
+        Returns:
+            int: The number of characters in the document
+
+        """
+        return self._sizes.lookup(document, _document_size)
+
+    def validate(self, roles=(), users=(), groups=(), managed_policies=(),
+                 policy_documents=()):
+        """Check a whole model in one pass.
+
+        Args:
+            roles ([]Role): The roles to check
+            users ([]User): The users to check
+            groups ([]Group): The groups to check
+            managed_policies ([]ManagedPolicy): The managed policies to check
+            policy_documents ([]PolicyDocument): Standalone policy documents
+                to check, such as bucket policies
+        Returns:
+            []ValidationIssue: Every problem found, empty if there are none
+
+        """
+        issues = []
+        for role_obj in roles:
+            self._check_role(role_obj, issues)
+        for user_obj in users:
+            self._check_user(user_obj, issues)
+        for group_obj in groups:
+            self._check_group(group_obj, issues)
+        for policy_obj in managed_policies:
+            self._check_managed_policy(policy_obj, issues)
+        for document in policy_documents:
+            self._check_document('PolicyDocument', document.policy_id,
+                                 document, issues)
+        return issues
+
+    def _check_name(self, kind, name, limit, issues):
+        """Check a name against the IAM naming rules.
+
+        Args:
+            kind (str): The type of object being checked
+            name (str): The name to check
+            limit (str): The key of the length quota in limits
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        if not isinstance(name, string_types):
+            # Troposphere helpers such as Ref are only known at deploy time
+            return
+        if len(name) > self.limits[limit]:
+            issues.append(ValidationIssue(
+                kind, name, limit, "Name is longer than {} characters".format(
+                    self.limits[limit])))
+        if not NAME_PATTERN.match(name):
+            issues.append(ValidationIssue(
+                kind, name, 'name_pattern',
+                "Name may only contain alphanumerics and +=,.@_-"))
+
+    def _check_path(self, kind, name, path, issues):
+        """Check an IAM path.
+
+        Args:
+            kind (str): The type of object being checked
+            name (str): The name of the object
+            path (str): The path to check
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        if not isinstance(path, string_types):
+            return
+        if len(path) > self.limits['path_length']:
+            issues.append(ValidationIssue(
+                kind, name, 'path_length',
+                "Path is longer than {} characters".format(
+                    self.limits['path_length'])))
+        if not PATH_PATTERN.match(path):
+            issues.append(ValidationIssue(
+                kind, name, 'path_pattern',
+                "Path must begin and end with /, for example /team/"))
+
+    def _check_count(self, kind, name, items, limit, issues):
+        """Check the number of items against a quota.
+
+        Args:
+            kind (str): The type of object being checked
+            name (str): The name of the object
+            items (object): The items to count
+            limit (str): The key of the quota in limits
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        if items and len(items) > self.limits[limit]:
+            issues.append(ValidationIssue(
+                kind, name, limit, "{} exceeds the limit of {}".format(
+                    len(items), self.limits[limit])))
+
+    def _check_document(self, kind, name, document, issues, limit=None):
+        """Check the statements and, optionally, the size of a document.
+
+        Args:
+            kind (str): The type of object owning the document
+            name (str): The name of the owning object
+            document (PolicyDocument): The document to check
+            issues ([]ValidationIssue): Where problems are recorded
+            limit (str): The key of the size quota in limits, if any
+        """
+        try:
+            statements = document.statements
+        except ValueError as error:
+            issues.append(ValidationIssue(kind, name, 'statement',
+                                          str(error)))
+            return
+        sids = set()
+        for statement in statements:
+            if statement.effect not in ('Allow', 'Deny'):
+                issues.append(ValidationIssue(
+                    kind, name, 'effect',
+                    "Effect must be Allow or Deny, not {!r}".format(
+                        statement.effect)))
+            sid = statement.sid
+            if isinstance(sid, string_types):
+                if not SID_PATTERN.match(sid):
+                    issues.append(ValidationIssue(
+                        kind, name, 'sid_pattern',
+                        "Sid {!r} may only contain alphanumerics".format(sid)))
+                if sid in sids:
+                    issues.append(ValidationIssue(
+                        kind, name, 'sid_unique',
+                        "Sid {!r} is used more than once".format(sid)))
+                sids.add(sid)
+        if limit is not None:
+            size = self.document_size(document)
+            if size > self.limits[limit]:
+                issues.append(ValidationIssue(
+                    kind, name, limit,
+                    "Policy is {} characters, the limit is {}".format(
+                        size, self.limits[limit])))
+
+    def _check_inline_policies(self, kind, name, policies, limit, issues):
+        """Check inline policies and their aggregate size.
+
+        Args:
+            kind (str): The type of object owning the policies
+            name (str): The name of the owning object
+            policies ([]InlinePolicy): The policies to check
+            limit (str): The key of the aggregate size quota in limits
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        total = 0
+        for policy in policies:
+            self._check_name('InlinePolicy', policy.name,
+                             'policy_name_length', issues)
+            if policy.policy_document:
+                self._check_document(kind, name, policy.policy_document,
+                                     issues)
+                total += self.document_size(policy.policy_document)
+        if total > self.limits[limit]:
+            issues.append(ValidationIssue(
+                kind, name, limit,
+                "Inline policies total {} characters, the limit is {}".format(
+                    total, self.limits[limit])))
+
+    def _check_role(self, role_obj, issues):
+        """Check a Role.
+
+        Args:
+            role_obj (Role): The role to check
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        name = role_obj.name
+        self._check_name('Role', name, 'role_name_length', issues)
+        self._check_path('Role', name, role_obj.path, issues)
+        self._check_count('Role', name, role_obj.managed_policy_arns,
+                          'managed_policies_per_principal', issues)
+        if role_obj.assume_role_policy_document:
+            self._check_document('Role', name,
+                                 role_obj.assume_role_policy_document,
+                                 issues, 'trust_policy_size')
+        self._check_inline_policies('Role', name, role_obj.policies,
+                                    'role_inline_policy_size', issues)
+
+    def _check_user(self, user_obj, issues):
+        """Check a User.
+
+        Args:
+            user_obj (User): The user to check
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        name = user_obj.username
+        self._check_name('User', name, 'user_name_length', issues)
+        self._check_path('User', name, user_obj.path, issues)
+        self._check_count('User', name, user_obj.managed_policy_arns,
+                          'managed_policies_per_principal', issues)
+        self._check_count('User', name, user_obj.get_groups(),
+                          'groups_per_user', issues)
+        self._check_inline_policies('User', name, user_obj.policies,
+                                    'user_inline_policy_size', issues)
+
+    def _check_group(self, group_obj, issues):
+        """Check a Group.
+
+        Args:
+            group_obj (Group): The group to check
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        name = group_obj.groupname
+        self._check_name('Group', name, 'group_name_length', issues)
+        self._check_path('Group', name, group_obj.path, issues)
+        self._check_count('Group', name, group_obj.managed_policy_arns,
+                          'managed_policies_per_principal', issues)
+        self._check_inline_policies('Group', name, group_obj.policies,
+                                    'group_inline_policy_size', issues)
+
+    def _check_managed_policy(self, policy_obj, issues):
+        """Check a ManagedPolicy.
+
+        Args:
+            policy_obj (ManagedPolicy): The managed policy to check
+            issues ([]ValidationIssue): Where problems are recorded
+        """
+        name = policy_obj.name
+        self._check_name('ManagedPolicy', name, 'policy_name_length', issues)
+        description = policy_obj.description
+        if (isinstance(description, string_types) and
+                len(description) > self.limits['policy_description_length']):
+            issues.append(ValidationIssue(
+                'ManagedPolicy', name, 'policy_description_length',
+                "Description is longer than {} characters".format(
+                    self.limits['policy_description_length'])))
+        if policy_obj.policy_document:
+            self._check_document('ManagedPolicy', name,
+                                 policy_obj.policy_document, issues,
+                                 'managed_policy_size')
+
+
+def _validate_chunk(args):
+    """Validate one chunk of a model, in a worker process.
+
+    Args:
+        args (tuple): The limits, and the keyword arguments for
+            Validator.validate
+
+    Returns:
+        []ValidationIssue: The problems found in the chunk
+
+    """
+    limits, collections = args
+    return Validator(limits).validate(**collections)
+
+
+def _chunks(items, size):
+    """Split a sequence into chunks.
+
+    Args:
+        items ([]object): The items to split
+        size (int): The most items in a chunk
+
+    Returns:
+        [][]object: The chunks
+
+    """
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def validate_model(roles=(), users=(), groups=(), managed_policies=(),
+                   policy_documents=(), limits=None, processes=None,
+                   chunk_size=1000):
+    """Check a whole model against IAM naming rules and quotas.
+
+    Args:
+        roles ([]Role): The roles to check
+        users ([]User): The users to check
+        groups ([]Group): The groups to check
+        managed_policies ([]ManagedPolicy): The managed policies to check
+        policy_documents ([]PolicyDocument): Standalone policy documents
+        limits (dict): Quotas overriding those in DEFAULT_LIMITS
+        processes (int): When given, the model is split into chunks which are
+            checked by a pool of this many processes
+        chunk_size (int): The most objects of one type sent to a process at
+            a time
+    Returns:
+        []ValidationIssue: Every problem found, empty if there are none
+
+    """
+    collections = {
+        'roles': list(roles),
+        'users': list(users),
+        'groups': list(groups),
+        'managed_policies': list(managed_policies),
+        'policy_documents': list(policy_documents),
+    }
+    if not processes:
+        return Validator(limits).validate(**collections)
+
+    import multiprocessing
+    work = [
+        (limits, {name: chunk})
+        for name in sorted(collections)
+        for chunk in _chunks(collections[name], chunk_size)
+    ]
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(_validate_chunk, work)
+    finally:
+        pool.close()
+        pool.join()
+    return [issue for result in results for issue in result]
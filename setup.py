@@ -42,6 +42,12 @@ setup(
     extras_require={
         'docs': [
             'sphinx'
+        ],
+        'fast': [
+            'orjson; python_version >= "3.6"'
+        ],
+        'troposphere': [
+            'troposphere'
         ]
     },
     include_package_data=True,
@@ -50,6 +56,7 @@ setup(
         'Programming Language :: Python',
         'Programming Language :: Python :: 2',
         'Programming Language :: Python :: 2.7',
+        'Programming Language :: Python :: 3',
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: Apache Software License',
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import Role, InlinePolicy, PolicyDocument, Statement
+from rack_iam.core.helpers import next_version
+from rack_iam.transform.cfdict import (transform_role,
+                                       transform_template,
+                                       transform_policy_document,
+                                       enable_policy_document_cache,
+                                       disable_policy_document_cache,
+                                       enable_resource_cache,
+                                       disable_resource_cache)
+
+
+class CFPolicyDocumentCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = enable_policy_document_cache(maxsize=2)
+        self.statement = Statement("Allow", ["sts:AssumeRole"])
+        self.statement.set_service_principal(["ec2.amazonaws.com"])
+        self.trust = PolicyDocument().add_statement(self.statement)
+
+    def tearDown(self):
+        disable_policy_document_cache()
+
+    def test_shared_document_rendered_once(self):
+        rendered = [
+            transform_role(Role("Role{}".format(index)).set_assume_policy(
+                self.trust))["Role{}".format(index)]["Properties"]
+            ["AssumeRolePolicyDocument"]
+            for index in range(10)
+        ]
+        self.assertEquals(self.cache.misses, 1)
+        self.assertEquals(self.cache.hits, 9)
+        for document in rendered:
+            self.assertEquals(document, rendered[0])
+
+    def test_result_mutation_isolated(self):
+        first = transform_policy_document(self.trust)
+        first["Statement"][0]["Effect"] = "Deny"
+        first["Statement"].append({})
+        second = transform_policy_document(self.trust)
+        self.assertEquals(self.cache.hits, 1)
+        self.assertEquals(second["Statement"][0]["Effect"], "Allow")
+        self.assertEquals(len(second["Statement"]), 1)
+
+    def test_statement_mutation_invalidates(self):
+        first = transform_policy_document(self.trust)
+        self.statement.set_statement_id("Trust")
+        second = transform_policy_document(self.trust)
+        self.assertFalse(first is second)
+        self.assertEquals(second["Statement"][0]["Sid"], "Trust")
+
+    def test_document_mutation_invalidates(self):
+        transform_policy_document(self.trust)
+        self.trust.add_statement(Statement("Deny", "s3:*", "*"))
+        self.assertEquals(
+            len(transform_policy_document(self.trust)["Statement"]), 2)
+        self.trust.set_policy_id("TrustPolicy")
+        self.assertEquals(
+            transform_policy_document(self.trust)["Id"], "TrustPolicy")
+        self.assertEquals(self.cache.hits, 0)
+
+    def test_eviction(self):
+        documents = [PolicyDocument() for _ in range(3)]
+        for document in documents:
+            transform_policy_document(document)
+        self.assertEquals(len(self.cache), 2)
+        transform_policy_document(documents[0])
+        self.assertEquals(self.cache.misses, 4)
+
+    def test_disabled(self):
+        disable_policy_document_cache()
+        self.assertFalse(transform_policy_document(self.trust) is
+                         transform_policy_document(self.trust))
+
+
+class CFResourceCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = enable_resource_cache()
+        self.statement = Statement("Allow", ["s3:GetObject"], "*")
+        self.roles = [
+            Role("Role{}".format(index)).add_policy(
+                InlinePolicy("S3").set_policy_document(
+                    PolicyDocument().add_statement(Statement(
+                        "Allow", ["ec2:DescribeInstances"], "*"))))
+            for index in range(5)
+        ]
+        self.roles[0].policies[0].policy_document.add_statement(
+            self.statement)
+
+    def tearDown(self):
+        disable_resource_cache()
+
+    def test_unchanged_reused(self):
+        first = transform_template(roles=self.roles)
+        second = transform_template(roles=self.roles)
+        self.assertEquals(self.cache.misses, 5)
+        self.assertEquals(self.cache.hits, 5)
+        self.assertEquals(first, second)
+
+    def test_result_mutation_isolated(self):
+        first = transform_template(roles=self.roles)
+        first["Role0"]["Properties"]["Policies"][0]["PolicyName"] = "Other"
+        del first["Role1"]["Properties"]["Path"]
+        second = transform_template(roles=self.roles)
+        self.assertEquals(self.cache.hits, 5)
+        self.assertEquals(
+            second["Role0"]["Properties"]["Policies"][0]["PolicyName"], "S3")
+        self.assertEquals(second["Role1"]["Properties"]["Path"], "/")
+
+    def test_changed_subtree_rendered(self):
+        first = transform_template(roles=self.roles)
+        # A change deep within the first role marks only that role as changed
+        self.statement.set_statement_id("Changed")
+        self.roles[1].set_managed_policy_arns(["arn1"])
+        second = transform_template(roles=self.roles)
+        self.assertEquals(self.cache.misses, 7)
+        self.assertEquals(self.cache.hits, 3)
+        self.assertNotEquals(first["Role0"], second["Role0"])
+        self.assertNotEquals(first["Role1"], second["Role1"])
+        self.assertEquals(first["Role2"], second["Role2"])
+        self.assertEquals(
+            second["Role0"]["Properties"]["Policies"][0]["PolicyDocument"]
+            ["Statement"][1]["Sid"], "Changed")
+
+    def test_versions_propagate(self):
+        document = self.roles[0].policies[0].policy_document
+        role_version = self.roles[0].get_version()
+        document_version = document.get_version()
+        self.statement.set_principal("AWS", "arn")
+        self.assertTrue(document.get_version() > document_version)
+        self.assertTrue(self.roles[0].get_version() > role_version)
+        self.assertEquals(self.roles[0].get_version(),
+                          self.statement.get_version())
+
+    def test_init_not_stamped(self):
+        before = next_version()
+        Statement("Allow", ["s3:GetObject"], "*")
+        # Only the version the statement is created with
+        self.assertEquals(next_version(), before + 2)
+
+    def test_parent_linked_once(self):
+        documents = [self.roles[index].policies[0].policy_document
+                     for index in range(2)]
+        for _ in range(10):
+            for document in documents:
+                document.statements = [self.statement]
+        self.assertEquals(len(self.statement._parents), 2)
+        version = documents[1].get_version()
+        self.statement.set_statement_id("Moved")
+        self.assertTrue(documents[1].get_version() > version)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import (Role, InstanceProfile, ManagedPolicy, Statement,
+                      StatementTable)
+from rack_iam.transform.cfdict import (transform, register_transform,
+                                       get_transform, transform_role,
+                                       transform_managed_policy)
+from rack_iam.transform.cfdict import dispatch
+
+
+class ServiceRole(Role):
+    __slots__ = ()
+
+
+class TaggedRole(Role):
+    __slots__ = ()
+
+
+class DispatchTest(unittest.TestCase):
+    def test_core_types(self):
+        profile = transform(InstanceProfile("Profile", "Web"))
+        self.assertEquals(profile["Profile"]["Type"],
+                          "AWS::IAM::InstanceProfile")
+        self.assertEquals(transform(Role("Web")), transform_role(Role("Web")))
+        self.assertTrue(get_transform(ManagedPolicy) is
+                        transform_managed_policy)
+        statement = Statement("Allow", "s3:*", "*")
+        self.assertEquals(transform(statement)["Action"], "s3:*")
+        table = StatementTable.from_statements([statement])
+        self.assertEquals(transform(table)[0]["Resource"], "*")
+
+    def test_subclasses(self):
+        self.assertTrue(get_transform(ServiceRole) is transform_role)
+        self.addCleanup(dispatch._dispatch.clear)
+        self.addCleanup(dispatch._registry.pop, TaggedRole, None)
+
+        @register_transform(TaggedRole)
+        def transform_tagged(role_obj):
+            resources = transform_role(role_obj)
+            resources[role_obj.name]["Properties"]["Tags"] = []
+            return resources
+
+        self.assertTrue(get_transform(TaggedRole) is transform_tagged)
+        self.assertEquals(
+            transform(TaggedRole("T"))["T"]["Properties"]["Tags"], [])
+        self.assertTrue(get_transform(ServiceRole) is transform_role)
+
+    def test_unknown(self):
+        self.assertRaises(TypeError, transform, object())
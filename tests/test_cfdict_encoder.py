@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import unittest
+from rack_iam import Policy, User
+from rack_iam.transform.cfdict import (encode_json, encode_json_bytes,
+                                       get_json_backend, set_json_backend,
+                                       transform_policy, transform_user)
+from rack_iam.transform.cfdict.encoder import BACKENDS
+
+
+class Ref(object):
+    def __init__(self, name):
+        self.name = name
+
+    def to_dict(self):
+        return {"Ref": self.name}
+
+
+class EncoderTest(unittest.TestCase):
+    def tearDown(self):
+        set_json_backend()
+
+    def test_sets_and_key_order(self):
+        policy = Policy("P", users=["zed", "amy", "kim"])
+        text = encode_json(transform_policy(policy))
+        self.assertTrue('"Users":["amy","kim","zed"]' in text)
+        self.assertEquals(text.index('"PolicyName"') <
+                          text.index('"Users"'), True)
+        self.assertEquals(json.loads(text)["P"]["Properties"]["Users"],
+                          ["amy", "kim", "zed"])
+
+    def test_mixed_set(self):
+        value = {"Groups": set(["b", Ref("A"), "a"])}
+        self.assertEquals(encode_json(value),
+                          '{"Groups":["a","b",{"Ref":"A"}]}')
+
+    def test_backends_identical(self):
+        user = User("alice", ["Ops", "Devs", u"équipe"], path="/eng/")
+        resource = transform_user(user)
+        outputs = set()
+        for backend in BACKENDS:
+            set_json_backend(backend)
+            self.assertEquals(get_json_backend(), backend)
+            outputs.add(encode_json_bytes(resource))
+            outputs.add(encode_json(resource, indent=2).encode('utf-8'))
+        self.assertEquals(len(outputs), 2)
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, set_json_backend, 'nope')
+        self.assertRaises(TypeError, encode_json, {"a": object()})
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import tempfile
+import unittest
+from rack_iam import (Group, InlinePolicy, ManagedPolicy, PolicyDocument,
+                      Role, Statement, User)
+from rack_iam.transform.cfdict import (encode_json, open_template,
+                                       read_resource, read_template,
+                                       read_template_objects,
+                                       read_template_resources,
+                                       transform_template)
+
+
+def _collections():
+    document = PolicyDocument()
+    document.add_statement(Statement("Allow", ["s3:GetObject"],
+                                     resource=["arn:aws:s3:::b/*"]))
+    policy = InlinePolicy("S3")
+    policy.set_policy_document(document)
+    role = Role("App", "/apps/").set_assume_policy(document)
+    role.add_policy(policy)
+    user = User("amy", ["Devs"]).set_login_profile("secret")
+    group = Group("Devs").add_users(["amy", "kim"])
+    managed = ManagedPolicy("Read", "Read access", roles=["App"])
+    managed.set_policy_document(document)
+    return {"roles": [role], "users": [user], "groups": [group],
+            "group_users": [group], "managed_policies": [managed]}
+
+
+class ReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.resources = transform_template(**_collections())
+        self.text = encode_json({
+            "Parameters": {"Type": {"Type": "String"}},
+            "Resources": dict(self.resources, Bucket={
+                "Type": "AWS::S3::Bucket",
+                "Properties": {"Tags": [{"Key": "Type", "Value": "}"}]}
+            }),
+            "Outputs": {"Name": {"Value": {"Ref": "App"}}}
+        }, indent=2)
+
+    def test_round_trip(self):
+        collections = read_template(self.text)
+        self.assertEqual(encode_json(transform_template(**collections)),
+                         encode_json(self.resources))
+        self.assertEqual(collections["group_users"][0].get_users(),
+                         set(["amy", "kim"]))
+
+    def test_round_trip_intrinsics(self):
+        document = {"Version": "2012-10-17", "Statement": [{
+            "Effect": "Allow", "Action": "s3:GetObject",
+            "Resource": {"Fn::GetAtt": ["Bucket", "Arn"]}}]}
+        resources = {
+            "AppRole": {"Type": "AWS::IAM::Role", "Properties": {
+                "RoleName": {"Fn::Sub": "${AWS::StackName}-app"},
+                "Path": "/", "AssumeRolePolicyDocument": document}},
+            "Deployer": {"Type": "AWS::IAM::User", "Properties": {
+                "UserName": {"Fn::Sub": "${Env}-deployer"},
+                "Path": "/", "Groups": ["Devs", {"Ref": "Admins"}]}},
+            "Admins": {"Type": "AWS::IAM::Group", "Properties": {
+                "GroupName": {"Fn::Sub": "${Env}-admins"}, "Path": "/"}},
+            "AdminMembers": {
+                "Type": "AWS::IAM::UserToGroupAddition", "Properties": {
+                    "GroupName": {"Ref": "Admins"},
+                    "Users": ["kim", {"Ref": "Deployer"}]}},
+            "ReadPolicy": {"Type": "AWS::IAM::Policy", "Properties": {
+                "PolicyName": "read", "PolicyDocument": document,
+                "Roles": [{"Ref": "AppRole"}],
+                "Groups": [{"Ref": "Admins"}],
+                "Users": [{"Ref": "Deployer"}]}}
+        }
+        text = encode_json({"Resources": resources})
+        collections = read_template(text)
+        self.assertEqual(encode_json(transform_template(**collections)),
+                         encode_json(resources))
+        role = collections["roles"][0]
+        self.assertEqual(role.get_logical_id(), "AppRole")
+        self.assertEqual(role.name, {"Fn::Sub": "${AWS::StackName}-app"})
+        self.assertIn({"Ref": "Admins"},
+                      list(collections["users"][0].get_groups()))
+
+    def test_resources_and_filter(self):
+        resources = dict(read_template_resources(self.text))
+        self.assertEqual(sorted(resources), [
+            "App", "Bucket", "Devs", "DevsUserAssociation", "Read", "amy"])
+        self.assertEqual(resources["Bucket"]["Properties"]["Tags"][0],
+                         {"Key": "Type", "Value": "}"})
+        roles = list(read_template_objects(self.text.encode('utf-8'),
+                                           types=["AWS::IAM::Role"]))
+        self.assertEqual([(name, type(obj)) for name, obj in roles],
+                         [("App", Role)])
+        self.assertEqual(roles[0][1].path, "/apps/")
+        self.assertTrue(roles[0][1].assume_role_policy_document.get_raw())
+
+    def test_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            list(read_template_objects(self.text, ["AWS::S3::Bucket"]))
+        with self.assertRaises(ValueError):
+            read_resource("Bucket", {"Type": "AWS::S3::Bucket"})
+
+    def test_open_template(self):
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "template.json")
+            with open(path, "wb") as template_file:
+                template_file.write(self.text.encode('utf-8'))
+            for use_mmap in (True, False):
+                with open_template(path, use_mmap) as buffer:
+                    names = [obj.username for _, obj in read_template_objects(
+                        buffer, ["AWS::IAM::User"])]
+                self.assertEqual(names, ["amy"])
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import json
+import unittest
+from rack_iam import Role, Group, InlinePolicy, PolicyDocument, Statement
+from rack_iam.transform.cfdict import (iter_template_resources,
+                                       iter_template_json,
+                                       iter_template_yaml,
+                                       write_template_json)
+
+
+def build_resources():
+    test_role = Role("TestRole").add_policy(
+        InlinePolicy("root").set_policy_document(
+            PolicyDocument().add_statement(
+                Statement("Allow", ["s3:GetObject", "s3:PutObject"], "*"))))
+    test_group = Group("TestGroup", users=["user2", "user1"])
+    return iter_template_resources(roles=[test_role],
+                                   group_users=[test_group])
+
+
+class CFStreamJson(unittest.TestCase):
+    def test_chunk_per_resource(self):
+        chunks = list(iter_template_json(build_resources()))
+        # Header, one chunk for each of the two resources, then the footer
+        self.assertEquals(len(chunks), 4)
+
+    def test_round_trip(self):
+        for indent in (None, 2):
+            template = json.loads(
+                ''.join(iter_template_json(build_resources(), indent=indent)))
+            self.assertEquals(template["AWSTemplateFormatVersion"],
+                              "2010-09-09")
+            resources = template["Resources"]
+            self.assertEquals(
+                resources["TestRole"]["Properties"]["Policies"][0]
+                ["PolicyDocument"]["Statement"][0]["Action"],
+                ["s3:GetObject", "s3:PutObject"])
+            # Sets are emitted as sorted lists
+            self.assertEquals(
+                resources["TestGroupUserAssociation"]["Properties"]["Users"],
+                ["user1", "user2"])
+
+    def test_encoded_chunks(self):
+        chunks = list(iter_template_json(build_resources(), encoding='utf-8'))
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+
+    def test_write(self):
+        output = io.StringIO() if bytes is not str else io.BytesIO()
+        write_template_json(output, build_resources())
+        self.assertTrue("TestRole" in json.loads(output.getvalue())
+                        ["Resources"])
+
+    def test_empty(self):
+        self.assertEquals(
+            json.loads(''.join(iter_template_json([], indent=4))),
+            {"AWSTemplateFormatVersion": "2010-09-09", "Resources": {}})
+
+
+class CFStreamYaml(unittest.TestCase):
+    def test_structure(self):
+        text = ''.join(iter_template_yaml(build_resources()))
+        lines = text.splitlines()
+        self.assertEquals(lines[0], 'AWSTemplateFormatVersion: "2010-09-09"')
+        self.assertEquals(lines[1], 'Resources:')
+        self.assertTrue('  TestRole:' in lines)
+        self.assertTrue('      Policies:' in lines)
+        self.assertTrue('        - PolicyName: "root"' in lines)
+        self.assertTrue('- "s3:GetObject"' in text)
+        self.assertTrue('        - "user1"' in lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
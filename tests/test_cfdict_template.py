@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import Role, User, Group, InstanceProfile
+from rack_iam import Policy, ManagedPolicy, PolicyDocument, Statement
+from rack_iam.transform.cfdict import (transform_template,
+                                       iter_template_resources,
+                                       transform_role)
+
+
+class CFBasicTemplate(unittest.TestCase):
+    def setUp(self):
+        adoc = PolicyDocument().add_statement(
+            Statement("Allow", ["sts:AssumeRole"]).set_service_principal(
+                ["ec2.amazonaws.com"]))
+        self.test_role = Role("TestRole").set_assume_policy(adoc)
+        test_group = Group("TestGroup", users=["TestUser"])
+
+        self.test_dict = transform_template(
+            roles=[self.test_role],
+            users=[User("TestUser")],
+            groups=[test_group],
+            group_users=[test_group],
+            policies=[Policy("TestPolicy", roles=["TestRole"])],
+            managed_policies=[ManagedPolicy("TestManaged", "Managed")],
+            instance_profiles=[InstanceProfile("TestProfile", "TestRole")]
+        )
+
+    def test_resource_types(self):
+        types = dict(
+            (name, resource["Type"])
+            for name, resource in self.test_dict.items())
+        self.assertEquals(types, {
+            "TestRole": "AWS::IAM::Role",
+            "TestUser": "AWS::IAM::User",
+            "TestGroup": "AWS::IAM::Group",
+            "TestGroupUserAssociation": "AWS::IAM::UserToGroupAddition",
+            "TestPolicy": "AWS::IAM::Policy",
+            "TestManaged": "AWS::IAM::ManagedPolicy",
+            "TestProfile": "AWS::IAM::InstanceProfile",
+        })
+
+    def test_matches_single_transform(self):
+        self.assertEquals(self.test_dict["TestRole"],
+                          transform_role(self.test_role)["TestRole"])
+
+    def test_instance_profile(self):
+        properties = self.test_dict["TestProfile"]["Properties"]
+        self.assertEquals(properties["Roles"], ["TestRole"])
+        self.assertEquals(properties["InstanceProfileName"], "TestProfile")
+
+    def test_iter_matches_dict(self):
+        self.assertEquals(
+            dict(iter_template_resources(roles=[self.test_role])),
+            transform_template(roles=[self.test_role]))
+
+
+class CFTemplateCollision(unittest.TestCase):
+    def test_duplicate_logical_id(self):
+        with self.assertRaises(ValueError):
+            transform_template(roles=[Role("Shared")], users=[User("Shared")])
+
+    def test_iter_duplicate_logical_id(self):
+        resources = iter_template_resources(
+            roles=[Role("Shared")], groups=[Group("Shared")])
+        self.assertEquals(next(resources)[0], "Shared")
+        with self.assertRaises(ValueError):
+            next(resources)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -46,10 +46,10 @@ class GuardTest(unittest.TestCase):
         test_policy.add_roles(['role2'])
 
         for prop_name in ['group', 'role', 'user']:
-            self.assertTrue(test_policy.__dict__['{}s'.format(prop_name)] &
+            self.assertTrue(getattr(test_policy, '{}s'.format(prop_name)) &
                             {'{}1'.format(prop_name), '{}2'.format(prop_name)})
             self.assertEquals(
-                len(test_policy.__dict__['{}s'.format(prop_name)]), 2)
+                len(getattr(test_policy, '{}s'.format(prop_name))), 2)
 
     # Verify that PolicyDocument can add multiple statements
     def test_multiple_statements(self):
@@ -110,6 +110,23 @@ class GuardTest(unittest.TestCase):
         self.assertIsInstance(test_group, Group)
         self.assertIsInstance(test_role, Role)
 
+    # Core objects use __slots__ to keep per-object memory down, which must
+    # not get in the way of setting attributes through the chaining setters
+    def test_slots(self):
+        test_objects = [
+            Statement('Allow', 's3:*', '*').set_statement_id('Sid1'),
+            PolicyDocument().set_policy_id('Policy1'),
+            InlinePolicy('MyPolicy').set_policy_document(PolicyDocument()),
+            Policy('MyPolicy').add_users(['user1']),
+            ManagedPolicy('MyPolicy', 'desc').add_roles(['role1']),
+            Role('TestRole').set_managed_policy_arns(['arn1']),
+            InstanceProfile('TestInstanceProfile', 'MyRole'),
+            User('TestUser').set_login_profile('mypass'),
+            Group('TestGroup').add_users(['user1']),
+        ]
+        for test_object in test_objects:
+            self.assertFalse(hasattr(test_object, '__dict__'))
+
     # Validate that statement ID works
     def test_sid(self):
         test_statement = Statement('Allow', 's3:*', sid='Statement123456')
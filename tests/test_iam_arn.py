@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+import unittest
+from rack_iam import (Arn, Role, generate_arn, generate_arns,
+                      generate_account_arns)
+
+
+class ArnTest(unittest.TestCase):
+    def test_parse(self):
+        arn = Arn.parse("arn:aws:iam::123456789012:role/app/Web")
+        self.assertEquals(arn.partition, "aws")
+        self.assertEquals(arn.service, "iam")
+        self.assertEquals(arn.region, "")
+        self.assertEquals(arn.account_id, "123456789012")
+        self.assertEquals(arn.resource_type, "role")
+        self.assertEquals(arn.resource_name, "app/Web")
+        self.assertTrue(
+            Arn.parse("arn:aws:iam::123456789012:role/app/Web") is arn)
+        self.assertRaises(ValueError, Arn.parse, "arn:aws:iam")
+        self.assertRaises(ValueError, Arn.parse, "urn:a:b:c:d:e")
+
+    def test_resource_with_colons(self):
+        arn = Arn.parse("arn:aws:logs:us-east-1:1:log-group:a:b")
+        self.assertEquals(arn.resource, "log-group:a:b")
+        self.assertEquals(arn.resource_type, "log-group")
+
+    def test_value_semantics(self):
+        arn = Arn('aws', 'iam', '', '123', 'root')
+        self.assertEquals(str(arn), "arn:aws:iam::123:root")
+        self.assertEquals(arn, "arn:aws:iam::123:root")
+        self.assertEquals(arn, Arn.parse("arn:aws:iam::123:root"))
+        self.assertTrue("arn:aws:iam::123:root" in set([arn]))
+        self.assertEquals(pickle.loads(pickle.dumps(arn)), arn)
+        self.assertRaises(AttributeError, setattr, arn, 'region', 'x')
+
+    def test_bulk(self):
+        self.assertEquals(
+            generate_arns('s3', ['a', 'b'], ['1', '2']),
+            ['arn:aws:s3::1:a', 'arn:aws:s3::1:b',
+             'arn:aws:s3::2:a', 'arn:aws:s3::2:b'])
+        self.assertEquals(generate_account_arns(['1', '2']),
+                          ['arn:aws:iam::1:root', 'arn:aws:iam::2:root'])
+
+    def test_get_arn_cached(self):
+        role = Role("Web")
+        arn = role.get_arn(account_id="123")
+        self.assertEquals(arn, "arn:aws:iam::123:role/Web")
+        self.assertTrue(role.get_arn(account_id="123") is arn)
+        role.name = "Api"
+        self.assertEquals(role.get_arn(account_id="123"),
+                          "arn:aws:iam::123:role/Api")
+        self.assertTrue(generate_arn('aws', 'iam', '', '123', 'role/Web') is
+                        generate_arn('aws', 'iam', '', '123', 'role/Web'))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import Role, User, Group, InlinePolicy
+from rack_iam import PolicyDocument, Statement
+from rack_iam.transform.cfdict import transform_role
+
+
+class DeriveTest(unittest.TestCase):
+    def setUp(self):
+        self.blueprint = Role("Blueprint").set_assume_policy(
+            PolicyDocument().add_statement(
+                Statement("Allow", ["sts:AssumeRole"]).set_service_principal(
+                    ["ec2.amazonaws.com"])))
+        self.blueprint.add_policy(
+            InlinePolicy("S3").set_policy_document(
+                PolicyDocument().add_statement(
+                    Statement("Allow", ["s3:GetObject"], "*"))))
+        self.blueprint.set_managed_policy_arns(["arn1"])
+
+    def test_shares_children(self):
+        derived = self.blueprint.derive(name="Derived")
+        self.assertTrue(self.blueprint.is_frozen())
+        self.assertFalse(derived.is_frozen())
+        self.assertEquals(derived.name, "Derived")
+        self.assertTrue(derived.policies is self.blueprint.policies)
+        self.assertTrue(derived.assume_role_policy_document is
+                        self.blueprint.assume_role_policy_document)
+
+    def test_copy_on_write(self):
+        derived = self.blueprint.derive(name="Derived")
+        derived.add_policy(InlinePolicy("Extra"))
+        derived.set_managed_policy_arns(["arn1", "arn2"])
+        derived.edit_assume_policy().add_statement(
+            Statement("Allow", ["sts:AssumeRole"]).set_account_principal(
+                "123456789012"))
+        derived.edit_policy("S3").edit_policy_document().add_statement(
+            Statement("Allow", ["s3:PutObject"], "*"))
+
+        self.assertEquals(len(self.blueprint.policies), 1)
+        self.assertEquals(len(derived.policies), 2)
+        self.assertEquals(list(self.blueprint.managed_policy_arns), ["arn1"])
+        self.assertEquals(
+            len(self.blueprint.assume_role_policy_document.statements), 1)
+        self.assertEquals(
+            len(derived.assume_role_policy_document.statements), 2)
+        self.assertEquals(
+            len(self.blueprint.policies[0].policy_document.statements), 1)
+        self.assertEquals(
+            len(derived.policies[0].policy_document.statements), 2)
+        # Unmodified statements are still shared with the blueprint
+        self.assertTrue(
+            derived.policies[0].policy_document.statements[0] is
+            self.blueprint.policies[0].policy_document.statements[0])
+
+        properties = transform_role(derived)["Derived"]["Properties"]
+        self.assertEquals(properties["RoleName"], "Derived")
+        self.assertEquals(len(properties["Policies"]), 2)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(KeyError):
+            self.blueprint.derive().edit_policy("Missing")
+
+    def test_user_group(self):
+        user = User("Blueprint", groups=["group1"])
+        derived_user = user.derive(username="Derived").add_to_group("group2")
+        self.assertEquals(user.groups, frozenset(["group1"]))
+        self.assertEquals(derived_user.groups, set(["group1", "group2"]))
+
+        group = Group("Blueprint", users=["user1"])
+        derived_group = group.derive(groupname="Derived").add_users(["user2"])
+        self.assertEquals(len(group.users), 1)
+        self.assertEquals(len(derived_group.users), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from array import array
+import io
+import unittest
+from rack_iam import (PolicyDocument, Statement, build_users, build_roles,
+                      build_groups)
+
+
+class BulkFactoryTest(unittest.TestCase):
+    def setUp(self):
+        self.trust = PolicyDocument().add_statement(
+            Statement("Allow", "sts:AssumeRole").set_service_principal(
+                ["ec2.amazonaws.com"]))
+        self.logs = PolicyDocument().add_statement(
+            Statement("Allow", "logs:*", "*"))
+
+    def test_users_from_csv(self):
+        data = io.StringIO(
+            u"username,path,groups,policies,password\n"
+            u"alice,/eng/,Devs;Ops,logs,secret\n"
+            u",/eng/,,,\n"
+            u"bob,,,missing,\n"
+            u"carol,,Devs,logs,\n")
+        result = build_users(data, documents={'logs': self.logs},
+                             account_id='123')
+        self.assertEquals([user.username for user in result.objects],
+                          ['alice', 'carol'])
+        self.assertEquals([error.row for error in result.errors], [1, 2])
+        alice, carol = result.objects
+        self.assertEquals(alice.groups, set(['Devs', 'Ops']))
+        self.assertEquals(alice.login_profile, ('secret', True))
+        self.assertEquals(carol.path, '/')
+        self.assertTrue(alice.policies[0] is carol.policies[0])
+        self.assertEquals(result.arns, ['arn:aws:iam::123:user/alice',
+                                        'arn:aws:iam::123:user/carol'])
+
+    def test_roles_from_tuples(self):
+        result = build_roles(
+            [('Web', 'ec2'), ('Api', 'ec2'), ('Bad', 'nope')],
+            columns=['name', 'assume_role_policy'],
+            documents={'ec2': self.trust})
+        web, api = result.objects
+        self.assertTrue(web.assume_role_policy_document is self.trust)
+        self.assertTrue(self.trust.is_frozen())
+        self.assertEquals(len(result.errors), 1)
+        # Shared documents are copied on modification
+        web.edit_assume_policy().add_statement(Statement("Deny", "*"))
+        self.assertEquals(len(api.assume_role_policy_document.statements), 1)
+        self.assertEquals(web.get_arn(account_id='1'),
+                          'arn:aws:iam::1:role/Web')
+
+    def test_groups_from_columns(self):
+        result = build_groups({
+            'groupname': ['G1', 'G2'],
+            'managed_policy_arns': [['arn:a'], 'arn:b;arn:c'],
+            'path': ['/a/', None],
+            'id': array('l', [1, 2]),
+        })
+        self.assertEquals(result.errors, [])
+        self.assertEquals([group.managed_policy_arns
+                           for group in result.objects],
+                          [['arn:a'], ['arn:b', 'arn:c']])
+        self.assertEquals(result.objects[1].path, '/')
+        self.assertEquals(result.arns, None)
+        self.assertRaises(ValueError, build_groups, [('G',)])
+
+    def test_mismatched_lengths(self):
+        result = build_roles(
+            [('Web', '/web/'), ('Api',), ('Db', '/db/', 'extra')],
+            columns=['name', 'path'])
+        self.assertEquals([role.name for role in result.objects], ['Web'])
+        self.assertEquals([error.row for error in result.errors], [1, 2])
+        self.assertTrue("1 values for 2 columns" in
+                        str(result.errors[0].error))
+        with self.assertRaises(ValueError) as context:
+            build_groups({'groupname': ['G1', 'G2'], 'path': ['/a/']})
+        self.assertEquals(str(context.exception),
+                          "Column 'path' has 1 values, but 'groupname' has 2")
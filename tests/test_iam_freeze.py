@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+import unittest
+from rack_iam import Role, User, Group, IamModel, InlinePolicy, Policy
+from rack_iam import PolicyDocument, Statement, FrozenObjectError
+from rack_iam.transform.cfdict import transform_role
+
+
+def build_document():
+    return PolicyDocument().add_statement(
+        Statement("Allow", ["s3:GetObject"], "*").set_principal(
+            "AWS", ["arn1", "arn2"]))
+
+
+class FreezeTest(unittest.TestCase):
+    def test_structural_equality(self):
+        first = build_document().freeze()
+        second = build_document().freeze()
+        self.assertEquals(first, second)
+        self.assertEquals(hash(first), hash(second))
+        self.assertEquals(len(set([first, second])), 1)
+
+        different = PolicyDocument().add_statement(
+            Statement("Deny", ["s3:GetObject"], "*")).freeze()
+        self.assertNotEqual(first, different)
+
+    def test_unfrozen_identity(self):
+        first = build_document()
+        second = build_document()
+        self.assertNotEqual(first, second)
+        self.assertEquals(first, first)
+        self.assertEquals(len(set([first, second])), 2)
+
+    def test_children_frozen(self):
+        document = build_document()
+        test_role = Role("TestRole").add_policy(
+            InlinePolicy("TestPolicy").set_policy_document(document))
+        test_role.freeze()
+        self.assertTrue(document.is_frozen())
+        self.assertTrue(document.statements[0].is_frozen())
+
+        with self.assertRaises(FrozenObjectError):
+            test_role.add_policy(InlinePolicy("Other"))
+        with self.assertRaises(FrozenObjectError):
+            test_role.path = "/other/"
+        with self.assertRaises(FrozenObjectError):
+            document.add_statement(Statement("Allow", "*", "*"))
+        with self.assertRaises(FrozenObjectError):
+            document.statements[0].principal["AWS"] = "arn3"
+
+    def test_frozen_setters(self):
+        with self.assertRaises(FrozenObjectError):
+            User("TestUser").freeze().add_to_group("group1")
+        with self.assertRaises(FrozenObjectError):
+            Group("TestGroup").freeze().add_users(["user1"])
+        with self.assertRaises(FrozenObjectError):
+            Policy("TestPolicy").freeze().add_roles(["role1"])
+        user = User("TestUser").freeze()
+        group = Group("TestGroup").freeze()
+        model = IamModel([user, group])
+        with self.assertRaises(FrozenObjectError):
+            user.add_to_group("group1")
+        with self.assertRaises(FrozenObjectError):
+            group.add_users(["user1"])
+        self.assertEquals(model.membership.groups_of("TestUser"), set())
+        self.assertEquals(model.membership.users_of("TestGroup"), set())
+
+    def test_frozen_transform(self):
+        test_role = Role("TestRole").set_assume_policy(build_document())
+        test_role.set_managed_policy_arns(["arn1"])
+        expected = transform_role(test_role)
+        test_role.freeze()
+        frozen = transform_role(test_role)
+        self.assertEquals(
+            list(frozen["TestRole"]["Properties"]["ManagedPolicyArns"]),
+            expected["TestRole"]["Properties"]["ManagedPolicyArns"])
+
+    def test_pickle(self):
+        document = build_document().freeze()
+        copied = pickle.loads(pickle.dumps(document, 2))
+        self.assertTrue(copied.is_frozen())
+        self.assertEquals(copied, document)
+        with self.assertRaises(FrozenObjectError):
+            copied.policy_id = "Other"
+
+        unfrozen = pickle.loads(pickle.dumps(build_document()))
+        unfrozen.set_policy_id("Other")
+        self.assertEquals(unfrozen.policy_id, "Other")
+
+
+if __name__ == '__main__':
+    unittest.main()
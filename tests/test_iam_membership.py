@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import User, Group, MembershipIndex
+from rack_iam.transform.cfdict.user import transform_user_resource
+from rack_iam.transform.cfdict.group import transform_group_users_resource
+
+
+class MembershipIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = MembershipIndex()
+        self.user = self.index.register_user(User("alice", ["Devs"]))
+        self.group = self.index.register_group(Group("Admins", ["bob"]))
+
+    def test_registration_merges(self):
+        self.assertTrue(self.index.is_member("alice", "Devs"))
+        self.assertTrue(self.index.is_member("bob", "Admins"))
+        self.assertEquals(self.index.users_of("Devs"), set(["alice"]))
+
+    def test_both_sides_in_sync(self):
+        self.user.add_to_group("Admins")
+        self.assertEquals(self.group.users, set(["alice", "bob"]))
+        self.group.add_users(["carol"])
+        self.assertEquals(self.index.groups_of("carol"), set(["Admins"]))
+        self.index.remove("alice", "Admins")
+        self.assertEquals(self.user.groups, set(["Devs"]))
+        self.assertEquals(self.group.users, set(["bob", "carol"]))
+
+    def test_move_users(self):
+        self.index.move_users(["alice"], "Devs", "Admins")
+        self.assertEquals(self.user.get_groups(), set(["Admins"]))
+        self.assertEquals(self.group.get_users(),
+                          set(["alice", "bob"]))
+        self.assertEquals(self.index.users_of("Devs"), set())
+
+    def test_transforms_follow_index(self):
+        before = transform_user_resource(self.user)
+        self.index.add("alice", "Admins")
+        after = transform_user_resource(self.user)
+        self.assertEquals(before["Properties"]["Groups"], set(["Devs"]))
+        self.assertEquals(after["Properties"]["Groups"],
+                          set(["Devs", "Admins"]))
+        self.assertEquals(
+            transform_group_users_resource(self.group)["Properties"]["Users"],
+            set(["alice", "bob"]))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import (IamModel, Role, User, Group, Policy, ManagedPolicy,
+                      InlinePolicy, PolicyDocument, Statement)
+from rack_iam.transform.cfdict import transform_model
+
+READ_ONLY = "arn:aws:iam::aws:policy/ReadOnlyAccess"
+
+
+class IamModelTest(unittest.TestCase):
+    def setUp(self):
+        self.role = Role("Web").set_managed_policy_arns([READ_ONLY])
+        self.user = User("alice", ["Devs"])
+        self.group = Group("Devs")
+        self.policy = Policy("S3Access", roles=["Web"], users=["alice"])
+        self.managed = ManagedPolicy("Deploy", "Deploys", groups=["Devs"])
+        self.model = IamModel([self.role, self.user, self.group,
+                               self.policy, self.managed])
+
+    def test_lookups(self):
+        self.assertTrue(self.model.get('role', 'Web') is self.role)
+        self.assertEquals(self.model.principals_with_managed_policy(
+            READ_ONLY), [self.role])
+        self.assertEquals(self.model.policies_attached_to('role', 'Web'),
+                          [self.policy])
+        self.assertEquals(self.model.policies_attached_to('group', 'Devs'),
+                          [self.managed])
+        self.assertEquals(self.model.get('user', 'nobody'), None)
+        self.assertRaises(ValueError, self.model.add, Role("Web"))
+
+    def test_follows_modification(self):
+        self.user.set_managed_policy_arns([READ_ONLY])
+        self.assertEquals(
+            len(self.model.principals_with_managed_policy(READ_ONLY)), 2)
+        self.role.add_policy(InlinePolicy("Logs").set_policy_document(
+            PolicyDocument().add_statement(Statement("Allow", "logs:*"))))
+        self.assertEquals(self.model.principals_with_inline_policy("Logs"),
+                          [self.role])
+        self.policy.add_roles(["Api"])
+        self.assertEquals(self.model.policies_attached_to('role', 'Api'),
+                          [self.policy])
+        self.role.name = "Frontend"
+        self.assertEquals(self.model.get('role', 'Web'), None)
+        self.assertTrue(self.model.get('role', 'Frontend') is self.role)
+
+    def test_frozen_entities(self):
+        blueprint = User("bob", groups=["admins"]).freeze()
+        admins = Group("admins", users=["carol"]).freeze()
+        model = IamModel([blueprint, admins])
+        self.assertTrue(model.get('user', 'bob') is blueprint)
+        self.assertEquals(admins.get_users(), set(["bob", "carol"]))
+        self.assertEquals(blueprint.groups, frozenset(["admins"]))
+        version = admins.get_version()
+        model.membership.add("dave", "admins")
+        self.assertTrue(admins.get_version() > version)
+
+    def test_rename_to_duplicate(self):
+        api = Role("Api")
+        self.model.add(api)
+        api.name = "Web"
+        self.assertRaises(ValueError, self.model.get, 'role', 'Web')
+        api.name = "Api"
+        self.assertTrue(self.model.get('role', 'Api') is api)
+        self.assertTrue(self.model.get('role', 'Web') is self.role)
+
+    def test_remove(self):
+        self.model.remove(self.role)
+        self.assertEquals(
+            self.model.principals_with_managed_policy(READ_ONLY), [])
+        self.assertFalse(self.role in self.model)
+        self.role.set_managed_policy_arns([])
+
+    def test_remove_membership(self):
+        self.model.remove(self.user)
+        self.assertTrue(self.user._membership is None)
+        self.assertFalse(self.model.membership.is_member("alice", "Devs"))
+        self.assertEquals(self.group.get_users(), set())
+        # The removed user keeps its groups, but is no longer synchronized
+        self.assertEquals(self.user.get_groups(), set(["Devs"]))
+        self.model.membership.add("alice", "Ops")
+        self.assertEquals(self.user.get_groups(), set(["Devs"]))
+        self.model.remove(self.group)
+        self.assertTrue(self.group._membership is None)
+        self.assertEquals(self.model.membership.users_of("Devs"), set())
+
+    def test_add_after_rename(self):
+        self.role.name = "Frontend"
+        self.model.add(Role("Web"))
+        self.assertEquals(self.model.get('role', 'Web').name, "Web")
+        self.assertRaises(ValueError, self.model.add, Role("Frontend"))
+
+    def test_transform(self):
+        resources = transform_model(self.model)
+        self.assertEquals(
+            sorted(resources),
+            ["Deploy", "Devs", "DevsUserAssociation", "S3Access", "Web",
+             "alice"])
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import Statement, PolicyDocument
+
+
+class NormalizeTest(unittest.TestCase):
+    def test_statement(self):
+        statement = Statement(
+            "Allow", ["S3:PutObject", "s3:GetObject", "s3:PutObject"],
+            ["arn:aws:s3:::b/*", "arn:aws:s3:::a/*"]).set_principal(
+                "AWS", ["arn:aws:iam::2:root", "arn:aws:iam::1:root"])
+        statement.set_condition("StringEquals", {"aws:SourceVpc": ["v"]})
+        statement.normalize()
+        self.assertEquals(statement.action, ["s3:GetObject", "s3:PutObject"])
+        self.assertEquals(statement.resource,
+                          ["arn:aws:s3:::a/*", "arn:aws:s3:::b/*"])
+        self.assertEquals(statement.principal,
+                          {"AWS": ["arn:aws:iam::1:root",
+                                   "arn:aws:iam::2:root"]})
+        self.assertEquals(statement.condition,
+                          {"StringEquals": {"aws:SourceVpc": "v"}})
+
+    def test_shapes(self):
+        self.assertEquals(
+            Statement("Allow", ["iam:PassRole"]).normalize().action,
+            "iam:PassRole")
+        self.assertEquals(
+            Statement("Allow", ["s3:GetObject", "*"]).normalize().action, "*")
+        self.assertEquals(
+            Statement("Allow", "s3:*", "*").normalize().resource, "*")
+
+    def test_condition_wildcard_literal(self):
+        statement = Statement("Allow", "s3:*", ["*", "arn:aws:s3:::a"])
+        statement.set_principal("AWS", ["*", "arn:aws:iam::1:root"])
+        statement.set_condition("StringEquals",
+                                {"aws:PrincipalTag/team": ["bob", "*"]})
+        statement.normalize()
+        self.assertEquals(statement.resource, "*")
+        self.assertEquals(statement.principal, {"AWS": "*"})
+        self.assertEquals(statement.condition, {
+            "StringEquals": {"aws:PrincipalTag/team": ["*", "bob"]}})
+
+    def test_idempotent(self):
+        statement = Statement("Allow", ["s3:b", "s3:a"]).normalize()
+        version = statement.get_version()
+        action = statement.action
+        statement.normalize()
+        self.assertTrue(statement.action is action)
+        self.assertEquals(statement.get_version(), version)
+        # A frozen, canonical statement can be normalized
+        statement.freeze().normalize()
+
+    def test_document(self):
+        shared = Statement("Allow", ["s3:B", "s3:A"]).freeze()
+        document = PolicyDocument().add_statements([
+            shared,
+            Statement("Allow", ["S3:A", "s3:B"]),
+            Statement("Deny", "iam:*", "*"),
+        ])
+        document.normalize()
+        self.assertEquals(len(document.statements), 2)
+        self.assertEquals(document.statements[0].action, ["s3:A", "s3:B"])
+        self.assertEquals(shared.action, ("s3:B", "s3:A"))
+        version = document.get_version()
+        document.normalize()
+        self.assertEquals(document.get_version(), version)
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import Role, User, Group, PathIndex, FrozenObjectError
+
+
+class PathIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.web = Role("Web", path="/team/web/")
+        self.api = Role("Api", path="/team/api/")
+        self.user = User("alice", path="/team/")
+        self.other = Group("Ops", path="/teams/")
+        self.index = PathIndex([self.web, self.api, self.user, self.other])
+
+    def test_queries(self):
+        self.assertEquals(len(self.index), 4)
+        self.assertEquals(self.index.count("/team/"), 3)
+        self.assertEquals(self.index.count("/team/web/"), 1)
+        self.assertEquals(self.index.count("/missing/"), 0)
+        self.assertEquals(
+            sorted(role.name for role in self.index.find("/team/web")),
+            ["Web"])
+        self.assertEquals(len(self.index.find("/")), 4)
+        self.assertEquals(self.index.children("/team/"),
+                          {"/team/web/": 1, "/team/api/": 1})
+
+    def test_remove_prunes(self):
+        self.index.remove(self.web)
+        self.assertEquals(self.index.children("/team/"), {"/team/api/": 1})
+        self.assertEquals(self.index.count("/"), 3)
+
+    def test_repath(self):
+        moved = self.index.repath("/team/", "/org/team/")
+        self.assertEquals(len(moved), 3)
+        self.assertEquals(self.web.path, "/org/team/web/")
+        self.assertEquals(self.user.path, "/org/team/")
+        self.assertEquals(self.other.path, "/teams/")
+        self.assertEquals(self.index.count("/team/"), 0)
+        self.assertEquals(self.index.count("/org/"), 3)
+
+    def test_repath_frozen(self):
+        self.api.freeze()
+        self.assertRaises(FrozenObjectError, self.index.repath, "/team/",
+                          "/org/")
+        self.assertEquals(self.web.path, "/team/web/")
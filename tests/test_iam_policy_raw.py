@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import unittest
+from rack_iam import PolicyDocument, Statement
+from rack_iam.transform.cfdict import transform_policy_document
+
+RAW_DOCUMENT = {
+    "Version": "2012-10-17",
+    "Id": "Imported",
+    "Statement": [
+        {
+            "Sid": "Read",
+            "Effect": "Allow",
+            "Action": ["s3:GetObject"],
+            "Resource": "*"
+        },
+        {
+            "Effect": "Allow",
+            "Action": "sts:AssumeRole",
+            "Principal": {"Service": "ec2.amazonaws.com"},
+            "Condition": {"Bool": {"aws:SecureTransport": "true"}}
+        }
+    ]
+}
+
+
+class RawPolicyDocumentTest(unittest.TestCase):
+    def test_pass_through(self):
+        document = PolicyDocument.from_dict(RAW_DOCUMENT)
+        self.assertEquals(document.policy_id, "Imported")
+        rendered = transform_policy_document(document)
+        self.assertEquals(rendered, RAW_DOCUMENT)
+        rendered["Statement"][0]["Action"].append("s3:PutObject")
+        rendered["Id"] = "Changed"
+        self.assertEquals(RAW_DOCUMENT["Statement"][0]["Action"],
+                          ["s3:GetObject"])
+        self.assertEquals(document.get_raw()["Id"], "Imported")
+
+    def test_decode_on_access(self):
+        document = PolicyDocument.from_json(json.dumps(RAW_DOCUMENT))
+        self.assertEquals(len(document.statements), 2)
+        statement = document.get_statement("Read")
+        self.assertIsInstance(statement, Statement)
+        self.assertEquals(statement.action, ["s3:GetObject"])
+        self.assertEquals(document.statements[1].principal,
+                          {"Service": "ec2.amazonaws.com"})
+        self.assertTrue(document.get_raw() is None)
+        self.assertEquals(transform_policy_document(document), RAW_DOCUMENT)
+
+    def test_modified(self):
+        document = PolicyDocument.from_dict(RAW_DOCUMENT)
+        document.set_policy_id("Changed")
+        rendered = transform_policy_document(document)
+        self.assertEquals(rendered["Id"], "Changed")
+        self.assertEquals(rendered["Statement"], RAW_DOCUMENT["Statement"])
+
+        document = PolicyDocument.from_dict(RAW_DOCUMENT)
+        document.add_statement(Statement("Deny", "iam:*", "*"))
+        self.assertEquals(
+            len(transform_policy_document(document)["Statement"]), 3)
+
+    def test_single_statement(self):
+        document = PolicyDocument.from_dict({
+            "Statement": {"Effect": "Allow", "Action": "*", "Resource": "*"}
+        })
+        self.assertEquals(len(document.statements), 1)
+
+    def test_unsupported(self):
+        document = PolicyDocument.from_dict({
+            "Statement": [{"Effect": "Allow", "NotAction": "iam:*"}]
+        })
+        with self.assertRaises(ValueError):
+            document.statements
+
+
+if __name__ == '__main__':
+    unittest.main()
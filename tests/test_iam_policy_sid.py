@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import PolicyDocument, Statement
+from rack_iam.transform.cfdict import transform_policy_document
+
+
+class PolicyDocumentSidTest(unittest.TestCase):
+    def setUp(self):
+        self.document = PolicyDocument().add_statements([
+            Statement("Allow", "s3:*", "*", sid="S3"),
+            Statement("Allow", "ec2:*", "*"),
+            Statement("Allow", "es:*", "*", sid="Es"),
+            Statement("Allow", "iam:*", "*", sid="Iam"),
+        ])
+
+    def sids(self):
+        return [statement.sid for statement in self.document.statements]
+
+    def test_get(self):
+        self.assertEquals(self.document.get_statement("Es").action, "es:*")
+        with self.assertRaises(KeyError):
+            self.document.get_statement("Missing")
+
+    def test_patch_without_rebuild(self):
+        self.document.get_statement("Es")
+        index = self.document._sid_index
+        for sid in ["S3", "Es", "Iam"] * 3:
+            self.document.get_statement(sid).add_action("s3:GetObject")
+        self.assertTrue(self.document._sid_index is index)
+        self.document.get_statement("Iam").sid = "Admin"
+        self.assertEquals(self.document.get_statement("Admin").action,
+                          ["iam:*", "s3:GetObject"])
+        self.assertRaises(KeyError, self.document.get_statement, "Iam")
+
+    def test_replace(self):
+        self.document.replace_statement(
+            "Es", Statement("Deny", "es:*", "*", sid="NoEs"))
+        self.assertEquals(self.sids(), ["S3", None, "NoEs", "Iam"])
+        self.assertEquals(self.document.get_statement("NoEs").effect, "Deny")
+        with self.assertRaises(KeyError):
+            self.document.get_statement("Es")
+        with self.assertRaises(ValueError):
+            self.document.replace_statement(
+                "NoEs", Statement("Deny", "es:*", "*", sid="Iam"))
+
+    def test_remove(self):
+        self.document.remove_statement("S3")
+        self.assertEquals(self.sids(), [None, "Es", "Iam"])
+        self.assertEquals(self.document.get_statement("Iam").action, "iam:*")
+        self.assertEquals(
+            [statement["Action"] for statement in
+             transform_policy_document(self.document)["Statement"]],
+            ["ec2:*", "es:*", "iam:*"])
+
+    def test_unique(self):
+        with self.assertRaises(ValueError):
+            self.document.add_statement(Statement("Allow", "*", "*", sid="S3"))
+        with self.assertRaises(ValueError):
+            PolicyDocument().add_statements([
+                Statement("Allow", "*", "*", sid="Same"),
+                Statement("Allow", "*", "*", sid="Same"),
+            ])
+        self.assertEquals(len(self.document.statements), 4)
+
+    def test_direct_changes(self):
+        # Changes made outside of the document's methods are picked up
+        self.document.statements[0].set_statement_id("Storage")
+        self.assertEquals(self.document.get_statement("Storage").action,
+                          "s3:*")
+        self.document.add_statement(Statement("Allow", "*", "*", sid="S3"))
+        self.document.statements = self.document.statements[:2]
+        with self.assertRaises(KeyError):
+            self.document.get_statement("Iam")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import (FrozenObjectError, PolicyDocument, Statement,
+                      StatementPool)
+
+
+class StatementPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = StatementPool()
+
+    def test_identical_statements_shared(self):
+        first = Statement("Allow", ["s3:GetObject"], "*").intern(self.pool)
+        second = Statement("Allow", ["s3:GetObject"], "*").intern(self.pool)
+        self.assertTrue(first is second)
+        self.assertEquals(len(self.pool), 1)
+        self.assertEquals(self.pool.hits, 1)
+        self.assertEquals(self.pool.misses, 1)
+
+    def test_distinct_statements(self):
+        first = Statement("Allow", ["s3:GetObject"], "*")
+        second = Statement("Allow", "s3:GetObject", "*")
+        third = Statement("Allow", ["s3:GetObject"], "*").set_principal(
+            "Service", ["ec2.amazonaws.com"])
+        self.assertTrue(first.intern(self.pool) is first)
+        self.assertTrue(second.intern(self.pool) is second)
+        self.assertTrue(third.intern(self.pool) is third)
+        self.assertEquals(len(self.pool), 3)
+
+    def test_values_shared(self):
+        first = Statement("Allow", ["s3:GetObject", "s3:PutObject"], "*")
+        second = Statement("Deny", ["s3:GetObject", "s3:PutObject"], "*")
+        first.intern(self.pool)
+        second.intern(self.pool)
+        self.assertTrue(first.action is second.action)
+
+        arns = self.pool.intern_arns(["arn1", "arn2"])
+        self.assertTrue(self.pool.intern_arns(["arn1", "arn2"]) is arns)
+
+    def test_pooled_statements_frozen(self):
+        pooled = Statement("Allow", ["s3:A"], "*").intern(self.pool)
+        self.assertRaises(FrozenObjectError, setattr, pooled, "effect", "Deny")
+        changed = pooled.derive(effect="Deny", sid="Mutated")
+        self.assertTrue(
+            Statement("Allow", ["s3:A"], "*").intern(self.pool) is pooled)
+        self.assertEquals(pooled.effect, "Allow")
+        self.assertTrue(changed.intern(self.pool) is not pooled)
+
+    def test_maxsize(self):
+        pool = StatementPool(maxsize=2)
+        for action in ["s3:A", "s3:B", "s3:C"]:
+            Statement("Allow", action).intern(pool)
+        self.assertEquals(len(pool), 1)
+
+    def test_intern_document(self):
+        document = PolicyDocument().add_statements([
+            Statement("Allow", "s3:*", "*"),
+            Statement("Allow", "s3:*", "*"),
+        ])
+        self.pool.intern_document(document)
+        self.assertTrue(document.statements[0] is document.statements[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
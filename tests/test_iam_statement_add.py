@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+import unittest
+from rack_iam import Statement, FrozenObjectError
+from rack_iam.core.pool import StatementPool
+from rack_iam.core.table import StatementTable
+from rack_iam.transform.cfdict import transform_statement
+
+
+class StatementAddTest(unittest.TestCase):
+    def test_add_action_and_resource(self):
+        statement = Statement("Allow", "s3:GetObject")
+        statement.add_action(["s3:PutObject", "s3:GetObject"])
+        statement.add_action("s3:PutObject").add_resource("arn:aws:s3:::a")
+        self.assertEquals(statement.action, ["s3:GetObject", "s3:PutObject"])
+        self.assertEquals(statement.resource, ["arn:aws:s3:::a"])
+
+    def test_add_principal(self):
+        statement = Statement("Allow", "sts:AssumeRole")
+        for account in ["3", "1", "2", "1", "3"]:
+            statement.add_principal("AWS", account)
+        statement.add_principal("Service", ["ec2.amazonaws.com"])
+        self.assertEquals(statement.principal,
+                          {"AWS": ["3", "1", "2"],
+                           "Service": ["ec2.amazonaws.com"]})
+        self.assertEquals(transform_statement(statement)["Principal"],
+                          statement.principal)
+        everyone = Statement("Allow", "s3:*")
+        everyone.principal = "*"
+        self.assertRaises(ValueError, everyone.add_principal, "AWS", "1")
+
+    def test_add_condition(self):
+        statement = Statement("Allow", "s3:*").set_condition(
+            "StringEquals", {"aws:SourceVpc": "vpc-1"})
+        statement.add_condition("StringEquals", "aws:SourceVpc",
+                                ["vpc-2", "vpc-1"])
+        statement.add_condition("Bool", "aws:SecureTransport", "true")
+        self.assertEquals(statement.condition, {
+            "StringEquals": {"aws:SourceVpc": ["vpc-1", "vpc-2"]},
+            "Bool": {"aws:SecureTransport": ["true"]},
+        })
+
+    def test_index_follows_outside_changes(self):
+        statement = Statement("Allow", ["s3:A"]).add_action("s3:B")
+        statement.action = ["s3:B"]
+        statement.add_action(["s3:A", "s3:B"])
+        self.assertEquals(statement.action, ["s3:B", "s3:A"])
+        copy = pickle.loads(pickle.dumps(statement))
+        self.assertEquals(copy.add_action("s3:A").action, ["s3:B", "s3:A"])
+
+    def test_frozen(self):
+        statement = Statement("Allow", ["s3:A"]).freeze()
+        self.assertRaises(FrozenObjectError, statement.add_action, "s3:B")
+        derived = statement.derive().add_action("s3:B")
+        self.assertEquals(derived.action, ["s3:A", "s3:B"])
+        self.assertEquals(statement.action, ("s3:A",))
+
+    def test_shared_values_copied(self):
+        table = StatementTable.from_columns(["Allow", "Allow"],
+                                            [["s3:A"], ["s3:A"]])
+        table[0].add_action("s3:B")
+        self.assertEquals(table[1].action, ["s3:A"])
+
+        pool = StatementPool()
+        pooled = pool.intern(Statement("Allow", ["s3:A"], "*"))
+        other = pool.intern(Statement("Allow", ["s3:A"], "arn:aws:s3:::b"))
+        first = pooled.derive().add_action("iam:*")
+        self.assertEquals(first.action, ["s3:A", "iam:*"])
+        self.assertEquals(other.action, ("s3:A",))
+        self.assertRaises(FrozenObjectError, pooled.add_action, "iam:*")
+
+        principal = {"AWS": ["1"]}
+        condition = {"Bool": {"aws:SecureTransport": ["true"]}}
+        first.principal = principal
+        first.condition = condition
+        first.add_principal("AWS", "2")
+        first.add_condition("Bool", "aws:SecureTransport", "false")
+        self.assertEquals(principal, {"AWS": ["1"]})
+        self.assertEquals(condition,
+                          {"Bool": {"aws:SecureTransport": ["true"]}})
+        self.assertEquals(first.principal, {"AWS": ["1", "2"]})
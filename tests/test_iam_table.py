@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import PolicyDocument, Statement, StatementTable
+from rack_iam.transform.cfdict import (transform_policy_document,
+                                       transform_statement)
+
+
+class StatementTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = StatementTable.from_columns(
+            effect=["Allow", "Allow", "Deny", "Allow"],
+            action=[["s3:GetObject", "s3:PutObject"], "s3:GetObject",
+                    "ec2:*", ["*"]],
+            resource=["*", "arn:aws:s3:::bucket/*", "*", "*"],
+            sid=["Read", None, "NoEc2", "All"])
+
+    def test_structure(self):
+        self.assertEquals(len(self.table), 4)
+        self.assertEquals(self.table.column("effect"),
+                          ["Allow", "Allow", "Deny", "Allow"])
+        statement = self.table[0]
+        self.assertIsInstance(statement, Statement)
+        self.assertEquals(statement.action, ["s3:GetObject", "s3:PutObject"])
+        self.assertEquals(statement.sid, "Read")
+        # Matches the special casing of Statement itself
+        self.assertEquals(self.table[3].action, "*")
+
+    def test_mismatched_columns(self):
+        with self.assertRaises(ValueError):
+            StatementTable.from_columns(["Allow"], ["s3:*", "ec2:*"])
+
+    def test_select(self):
+        self.assertEquals(self.table.select(action="s3:GetObject"), [0, 1])
+        self.assertEquals(
+            self.table.select(action="s3:GetObject", resource="*"), [0])
+        self.assertEquals(self.table.select(effect="Deny"), [2])
+        self.assertEquals(self.table.select(), [0, 1, 2, 3])
+
+        allowed = self.table.filter(effect="Allow")
+        self.assertEquals(len(allowed), 3)
+        self.assertEquals(allowed.column("sid"), ["Read", None, "All"])
+
+    def test_principal(self):
+        table = StatementTable.from_statements([
+            Statement("Allow", ["sts:AssumeRole"]).set_service_principal(
+                ["ec2.amazonaws.com"]),
+            Statement("Allow", ["sts:AssumeRole"]).set_account_principal(
+                "123456789012"),
+        ])
+        self.assertEquals(table.select(principal="ec2.amazonaws.com"), [0])
+
+    def test_document_backing(self):
+        document = PolicyDocument.from_table(self.table, policy_id="Big")
+        rendered = transform_policy_document(document)
+        self.assertEquals(rendered["Id"], "Big")
+        self.assertEquals(
+            rendered["Statement"],
+            [transform_statement(statement) for statement in self.table])
+        # Rendering uses the table without creating Statement objects
+        self.assertTrue(document.get_statement_table() is self.table)
+
+        document.add_statement(Statement("Allow", "iam:*", "*"))
+        self.assertTrue(document.get_statement_table() is None)
+        self.assertEquals(len(document.statements), 5)
+        self.assertEquals(
+            transform_policy_document(document)["Statement"][:4],
+            rendered["Statement"])
+
+
+if __name__ == '__main__':
+    unittest.main()
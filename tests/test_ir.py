@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import unittest
+from rack_iam import (Role, User, Group, Policy, ManagedPolicy,
+                      InlinePolicy, InstanceProfile, PolicyDocument,
+                      Statement)
+from rack_iam.transform.cfdict import encode_json, transform_template
+from rack_iam.transform.ir import compile_template, emit, register_emitter
+
+
+class IntermediateRepresentationTest(unittest.TestCase):
+    def setUp(self):
+        self.trust = PolicyDocument().add_statement(
+            Statement("Allow", "sts:AssumeRole").set_service_principal(
+                ["ec2.amazonaws.com"]))
+        logs = InlinePolicy("Logs").set_policy_document(
+            PolicyDocument().add_statement(
+                Statement("Allow", ["logs:*"], "*")))
+        self.web = Role("Web").set_assume_policy(self.trust).add_policy(logs)
+        self.api = Role("Api").set_assume_policy(self.trust)
+        self.user = User("alice", ["Devs"]).set_login_profile("pw")
+        self.group = Group("Devs", ["alice"]).add_policy(logs)
+        self.policy = Policy("S3", roles=["Web"], users=["alice"])
+        self.managed = ManagedPolicy("Deploy", "Deploys", groups=["Devs"])
+        self.managed.set_policy_document(PolicyDocument().add_statement(
+            Statement("Allow", "cloudformation:*", "*")))
+        self.profile = InstanceProfile("WebProfile", "Web")
+        self.collections = {
+            'roles': [self.web, self.api],
+            'users': [self.user],
+            'groups': [self.group],
+            'policies': [self.policy],
+            'managed_policies': [self.managed],
+            'instance_profiles': [self.profile],
+            'group_users': [self.group],
+        }
+        self.model = compile_template(**self.collections)
+
+    def test_cfdict_matches_transforms(self):
+        self.assertEquals(
+            encode_json(emit(self.model, 'cfdict')),
+            encode_json(transform_template(**self.collections)))
+
+    def test_cfdict_logical_ids(self):
+        self.web.set_logical_id("WebRole")
+        self.group.set_logical_id("DevMembers",
+                                  "AWS::IAM::UserToGroupAddition")
+        resources = emit(compile_template(**self.collections), 'cfdict')
+        self.assertEquals(
+            encode_json(resources),
+            encode_json(transform_template(**self.collections)))
+        self.assertEquals(resources["WebRole"]["Properties"]["RoleName"],
+                          "Web")
+        self.assertTrue("DevMembers" in resources)
+
+    def test_shared_and_immutable(self):
+        web, api = self.model.roles
+        self.assertTrue(web.trust is api.trust)
+        self.assertTrue(self.model.groups[0] is self.model.group_users[0])
+        self.web.name = "Renamed"
+        self.assertEquals(web.name, "Web")
+        self.assertRaises(AttributeError, setattr, web, 'name', 'x')
+
+    def test_terraform(self):
+        resources = emit(self.model, 'terraform')["resource"]
+        self.assertEquals(sorted(resources["aws_iam_role"]), ["Api", "Web"])
+        trust = json.loads(resources["aws_iam_role"]["Web"]
+                           ["assume_role_policy"])
+        self.assertEquals(trust["Statement"][0]["Action"], "sts:AssumeRole")
+        self.assertEquals(resources["aws_iam_role_policy"]["Web_S3"]["role"],
+                          "Web")
+        self.assertEquals(
+            resources["aws_iam_policy_attachment"]["Deploy"]["groups"],
+            ["Devs"])
+        self.assertEquals(
+            resources["aws_iam_instance_profile"]["WebProfile"]["role"],
+            "Web")
+
+    def test_terraform_collisions(self):
+        inline = InlinePolicy("S3").set_policy_document(self.trust)
+        self.web.add_policy(inline)
+        self.collections['users'] = [User("john.doe"), User("john_doe")]
+        resources = emit(compile_template(**self.collections),
+                         'terraform')["resource"]
+        self.assertEquals(len(resources["aws_iam_user"]), 2)
+        role_policies = resources["aws_iam_role_policy"]
+        self.assertEquals(
+            len([name for name in role_policies if name.startswith("Web_S3")]),
+            2)
+        self.collections['users'] = [User("alice"), User("alice")]
+        self.assertRaises(ValueError, emit,
+                          compile_template(**self.collections), 'terraform')
+
+    def test_iam_api(self):
+        requests = emit(self.model, 'iam', account_id='123')
+        actions = [request["Action"] for request in requests]
+        self.assertEquals(actions[:4], ["CreateGroup", "CreateUser",
+                                        "CreateLoginProfile", "CreateRole"])
+        self.assertTrue(
+            {"Action": "AttachGroupPolicy",
+             "Parameters": {"GroupName": "Devs",
+                            "PolicyArn": "arn:aws:iam::123:policy/Deploy"}}
+            in requests)
+        self.assertEquals(actions.count("AddUserToGroup"), 1)
+        self.assertEquals(actions[-2:], ["CreateInstanceProfile",
+                                         "AddRoleToInstanceProfile"])
+
+    def test_register_emitter(self):
+        register_emitter('names', lambda model: [
+            role.name for role in model.roles])
+        self.assertEquals(emit(self.model, 'names'), ["Web", "Api"])
+        self.assertRaises(KeyError, emit, self.model, 'missing')
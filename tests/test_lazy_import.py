@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import subprocess
+import sys
+import unittest
+
+
+def imported_modules(statement):
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        '{}; import sys; print(" ".join(sys.modules))'.format(statement)])
+    return set(output.decode('utf-8').split())
+
+
+@unittest.skipIf(sys.version_info < (3, 7),
+                 "Module level __getattr__ requires Python 3.7")
+class LazyImportTest(unittest.TestCase):
+    def test_package_import(self):
+        modules = imported_modules('import rack_iam')
+        self.assertFalse('rack_iam.core.policy' in modules)
+        self.assertFalse('rack_iam.core.statement' in modules)
+
+    def test_attribute_import(self):
+        modules = imported_modules('from rack_iam import InstanceProfile')
+        self.assertTrue('rack_iam.core.role' in modules)
+        self.assertFalse('rack_iam.core.policy' in modules)
+
+    def test_transform_import(self):
+        modules = imported_modules(
+            'from rack_iam.transform.cfdict import transform_statement')
+        self.assertTrue('rack_iam.transform.cfdict.statement' in modules)
+        self.assertFalse('rack_iam.transform.cfdict.stream' in modules)
+        self.assertFalse('rack_iam.transform.cfdict.role' in modules)
+
+
+class AttributeTest(unittest.TestCase):
+    def test_all_exported(self):
+        import rack_iam
+        import rack_iam.transform.cfdict as cfdict
+        for module in (rack_iam, cfdict):
+            for name in module.__all__:
+                self.assertTrue(getattr(module, name) is not None)
+                self.assertTrue(name in dir(module))
+
+    def test_missing(self):
+        import rack_iam
+        with self.assertRaises(AttributeError):
+            rack_iam.Missing
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import unittest
+
+from rack_iam import (Group, InlinePolicy, PolicyDocument, Role, Statement,
+                      User)
+from rack_iam.transform.cfdict import encode_json, transform_template
+from rack_iam.transform.troposphere_adapter import (add_to_template, iam,
+                                                    role_resource)
+
+try:
+    from troposphere import Join, Ref, Template
+except ImportError:
+    Template = None
+
+
+def _document(*statements):
+    document = PolicyDocument()
+    for statement in statements:
+        document.add_statement(statement)
+    return document
+
+
+@unittest.skipIf(iam is None, "troposphere isn't installed")
+class TestTroposphereAdapter(unittest.TestCase):
+
+    def setUp(self):
+        self.role = Role("MyRole")
+        self.role.set_assume_policy(_document(
+            Statement("Allow", ["sts:AssumeRole"])))
+        policy = InlinePolicy("S3")
+        policy.set_policy_document(_document(
+            Statement("Allow", ["s3:*"], resource=["arn:aws:s3:::b/*"])))
+        self.role.add_policy(policy)
+
+    def test_matches_cfdict(self):
+        template = Template()
+        add_to_template(template, roles=[self.role], users=[User("bob")],
+                        groups=[Group("devs")])
+        expected = transform_template(
+            roles=[self.role], users=[User("bob")], groups=[Group("devs")])
+        self.assertEqual(json.loads(template.to_json())["Resources"],
+                         json.loads(encode_json(expected)))
+
+    def test_intrinsics_pass_through(self):
+        statement = Statement("Allow", ["s3:GetObject"],
+                              resource=[Ref("Bucket")])
+        statement.set_account_principal(
+            Join(":", ["arn", "aws", "iam", "", Ref("Account"), "root"]))
+        self.role.set_assume_policy(_document(statement))
+        rendered = role_resource(self.role, "Title").to_dict()
+        document = rendered["Properties"]["AssumeRolePolicyDocument"]
+        self.assertEqual(document["Statement"][0]["Resource"],
+                         [{"Ref": "Bucket"}])
+        self.assertEqual(
+            document["Statement"][0]["Principal"]["AWS"]["Fn::Join"][1][4],
+            {"Ref": "Account"})
+
+    def test_document_rendered_lazily(self):
+        resource = role_resource(self.role)
+        self.role.assume_role_policy_document.add_statement(
+            Statement("Deny", ["sts:AssumeRole"]))
+        document = resource.to_dict()["Properties"][
+            "AssumeRolePolicyDocument"]
+        self.assertEqual(len(document["Statement"]), 2)
+        self.assertEqual(resource.title, "MyRole")
+
+
+@unittest.skipIf(iam is not None, "troposphere is installed")
+class TestWithoutTroposphere(unittest.TestCase):
+
+    def test_requires_troposphere(self):
+        with self.assertRaises(ImportError):
+            role_resource(Role("MyRole"))
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017 Rackspace US, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from rack_iam import (Role, User, Group, IamModel, ManagedPolicy,
+                      InlinePolicy, PolicyDocument, Statement, Validator,
+                      validate_model)
+
+
+def _rules(issues):
+    return sorted(issue.rule for issue in issues)
+
+
+class ValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.validator = Validator()
+
+    def test_valid_model(self):
+        role = Role("AppRole", path="/app/").set_assume_policy(
+            PolicyDocument().add_statement(
+                Statement("Allow", ["sts:AssumeRole"]).set_principal(
+                    "Service", ["ec2.amazonaws.com"])))
+        self.assertEquals(self.validator.validate(roles=[role]), [])
+
+    def test_names_and_paths(self):
+        role = Role("x" * 65, path="team")
+        user = User("bad name")
+        issues = self.validator.validate(roles=[role], users=[user])
+        self.assertEquals(_rules(issues),
+                          ['name_pattern', 'path_pattern', 'role_name_length'])
+
+    def test_trailing_newline_and_unicode(self):
+        issues = self.validator.validate(
+            roles=[Role("MyRole\n", path="/a/\n")],
+            users=[User(u"r\u00f4le")])
+        self.assertEquals(_rules(issues),
+                          ['name_pattern', 'name_pattern', 'path_pattern'])
+
+    def test_managed_policy_count(self):
+        group = Group("Admins").set_managed_policy_arns(
+            ["arn:aws:iam::aws:policy/P{}".format(i) for i in range(11)])
+        issues = self.validator.validate(groups=[group])
+        self.assertEquals(_rules(issues), ['managed_policies_per_principal'])
+
+    def test_groups_from_membership(self):
+        user = User("amy").freeze()
+        model = IamModel([user])
+        model.membership.add_groups(
+            "amy", ["Group{}".format(i) for i in range(11)])
+        issues = self.validator.validate(users=[user])
+        self.assertEquals(_rules(issues), ['groups_per_user'])
+
+    def test_trust_policy_size(self):
+        document = PolicyDocument()
+        for i in range(25):
+            document.add_statement(
+                Statement("Allow", ["sts:AssumeRole"]).set_principal(
+                    "AWS", ["arn:aws:iam::{:012d}:root".format(i)]))
+        role = Role("Big").set_assume_policy(document)
+        self.assertEquals(_rules(self.validator.validate(roles=[role])),
+                          ['trust_policy_size'])
+        limits = {'trust_policy_size': 4096}
+        self.assertEquals(Validator(limits).validate(roles=[role]), [])
+
+    def test_aggregate_inline_size(self):
+        document = PolicyDocument().add_statement(
+            Statement("Allow", ["s3:GetObject"],
+                      ["arn:aws:s3:::bucket/" + "k" * 500]))
+        user = User("Dev")
+        for i in range(5):
+            user.add_policy(InlinePolicy("P{}".format(i)).set_policy_document(
+                document))
+        issues = self.validator.validate(users=[user])
+        self.assertEquals(_rules(issues), ['user_inline_policy_size'])
+        # The shared document is measured once
+        self.assertEquals(self.validator._sizes.misses, 1)
+
+    def test_statements(self):
+        document = PolicyDocument()
+        document.statements = [Statement("Permit", ["s3:*"], sid="a-b"),
+                               Statement("Allow", ["s3:*"], sid="a-b")]
+        issues = self.validator.validate(policy_documents=[document])
+        self.assertEquals(_rules(issues),
+                          ['effect', 'sid_pattern', 'sid_pattern',
+                           'sid_unique'])
+
+    def test_managed_policy(self):
+        policy = ManagedPolicy("Ok", "d" * 1001)
+        self.assertEquals(_rules(self.validator.validate(
+            managed_policies=[policy])), ['policy_description_length'])
+
+    def test_process_pool(self):
+        roles = [Role("Role{}".format(i)) for i in range(5)]
+        roles.append(Role("bad role"))
+        issues = validate_model(roles=roles, processes=2, chunk_size=2)
+        self.assertEquals([(i.name, i.rule) for i in issues],
+                          [('bad role', 'name_pattern')])